@@ -1,5 +1,6 @@
 # coding: utf-8
-import sys, io, json
+import os, sys, io, json
+from concurrent.futures import ProcessPoolExecutor
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
 from tusas.core.laminate_optimizer import LaminateOptimizer
@@ -10,17 +11,31 @@ configs = [
     ({0:6, 90:4, 45:4, -45:4}, "18ply"),
 ]
 
-for ply_counts, label in configs:
-    opt = LaminateOptimizer(ply_counts)
-    seq, score, details, _ = opt.run_hybrid_optimization()
+
+def _run_one_config(config):
+    """Tek config icin optimizasyon + analiz (ProcessPoolExecutor icin modul seviyesinde)."""
+    ply_counts, label = config
+    # Havuz işçisinde çalışır: GA iç içe süreç havuzu açmasın
+    opt = LaminateOptimizer(ply_counts, ga_backend="thread")
+    seq, score, _details, _ = opt.run_hybrid_optimization()
+    _, details, gs = opt.evaluate_all(seq)
     rules = details.get("rules", {})
     # Write to json for reliable reading
-    out = {"label": label, "total": score, "seq": seq}
+    out = {"label": label, "total": score, "seq": list(seq)}
     for r in ["R1","R2","R3","R4","R5","R6","R7","R8"]:
         d = rules.get(r, {})
         out[r] = {"score": d.get("score",0), "weight": d.get("weight",0), "loss": round(d.get("weight",0)-d.get("score",0), 2)}
-    gs = opt._grouping_stats(seq)
     out["grouping"] = gs
-    with open(f"analysis_{label}.json", "w") as f:
-        json.dump(out, f, indent=2)
-    print(f"Saved analysis_{label}.json")
+    return out
+
+
+if __name__ == "__main__":
+    # Config'ler birbirinden bagimsiz: her biri ayri surecte calisir
+    with ProcessPoolExecutor(max_workers=min(len(configs), os.cpu_count() or 1)) as ex:
+        outputs = list(ex.map(_run_one_config, configs))
+
+    for out in outputs:
+        label = out["label"]
+        with open(f"analysis_{label}.json", "w") as f:
+            json.dump(out, f, indent=2)
+        print(f"Saved analysis_{label}.json")
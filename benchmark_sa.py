@@ -3,11 +3,18 @@ Simulated Annealing vs Hill Climbing Benchmark
 ===============================================
 Aynı ply konfigürasyonunu hem SA hem Hill Climbing ile çalıştırarak
 sonuçları karşılaştırır.
+
+NumPy gerektirir: fitness yolu (calculate_fitness -> _compute_fitness) kuralları
+NumPy int8 dizileri üzerinde hesaplar. PyPy ile çalıştırılacaksa PyPy ortamına da
+NumPy kurulmalıdır:
+    pypy3 -m pip install numpy
+    pypy3 benchmark_sa.py
 """
 
 import sys
 import io
 import time
+from contextlib import redirect_stdout
 
 # Windows UTF-8 desteği
 if sys.platform == "win32" and hasattr(sys.stdout, "buffer"):
@@ -29,26 +36,34 @@ def run_benchmark(ply_counts: dict, label: str):
     optimizer = LaminateOptimizer(ply_counts)
 
     print("\n--- Ortak Fazlar (Phase 1 + Phase 2) ---")
-    skeleton = optimizer._build_smart_skeleton()
+    skeleton = optimizer._build_smart_skeleton(use_cache=True)
     n_runs = 4 if optimizer.total_plies <= 40 else 5
     ga_best_seq, ga_best_score = optimizer._multi_start_ga(skeleton, n_runs=n_runs)
     print(f"GA sonucu: {ga_best_score:.2f}/100\n")
 
     # ---- Test 1: Hill Climbing (Local Search) ----
     print("--- TEST 1: Hill Climbing (Local Search) ---")
-    t1 = time.time()
-    hc_seq, hc_score = optimizer._local_search(ga_best_seq[:], max_iter=30)
-    hc_time = time.time() - t1
-    _, hc_details = optimizer.calculate_fitness(hc_seq)
-    hc_grouping_stats = optimizer._grouping_stats(hc_seq)
+    # Her test kendi önbelleğiyle başlasın (HC/SA süre karşılaştırması adil kalsın)
+    optimizer.clear_fitness_cache()
+    # Optimizer logları ölçülen pencerenin dışında yazdırılır (stdout gürültüsü ölçüme girmesin)
+    log = io.StringIO()
+    with redirect_stdout(log):
+        t1 = time.perf_counter_ns()
+        hc_seq, hc_score = optimizer._local_search(ga_best_seq[:], max_iter=30)
+        hc_time = (time.perf_counter_ns() - t1) / 1e9
+    print(log.getvalue(), end="")
+    _, hc_details, hc_grouping_stats = optimizer.evaluate_all(hc_seq)
 
     # ---- Test 2: Simulated Annealing ----
     print("\n--- TEST 2: Simulated Annealing ---")
-    t2 = time.time()
-    sa_seq, sa_score = optimizer._simulated_annealing(ga_best_seq[:])
-    sa_time = time.time() - t2
-    _, sa_details = optimizer.calculate_fitness(sa_seq)
-    sa_grouping_stats = optimizer._grouping_stats(sa_seq)
+    optimizer.clear_fitness_cache()
+    log = io.StringIO()
+    with redirect_stdout(log):
+        t2 = time.perf_counter_ns()
+        sa_seq, sa_score = optimizer._simulated_annealing(ga_best_seq[:])
+        sa_time = (time.perf_counter_ns() - t2) / 1e9
+    print(log.getvalue(), end="")
+    _, sa_details, sa_grouping_stats = optimizer.evaluate_all(sa_seq)
 
     # ---- Sonuçlar ----
     print("\n" + "=" * 70)
@@ -89,13 +104,12 @@ def run_benchmark(ply_counts: dict, label: str):
 
 if __name__ == "__main__":
     configs = [
-        ({"0": 12, "90": 8, "45": 8, "-45": 8}, "36 ply (küçük)"),
-        ({"0": 18, "90": 12, "45": 14, "-45": 14}, "58 ply (orta)"),
+        ({0: 12, 90: 8, 45: 8, -45: 8}, "36 ply (küçük)"),
+        ({0: 18, 90: 12, 45: 14, -45: 14}, "58 ply (orta)"),
     ]
 
     results = []
-    for config, label in configs:
-        ply_counts = {int(k): int(v) for k, v in config.items()}
+    for ply_counts, label in configs:
         r = run_benchmark(ply_counts, label)
         results.append(r)
 
@@ -0,0 +1,20 @@
+# Gunicorn ayarlari: gunicorn -c gunicorn_conf.py tusas.wsgi:application
+#
+# SSE akislari (/optimize_multi_zone_stream) baglanti basina bir thread'i uzun sure tutar;
+# sync worker'da tek bir akis tum sunucuyu bloklar. gthread worker ile ayni
+# surecte birden fazla akis + normal istek paralel servis edilir. Optimizasyonun
+# kendisi process havuzunda kostugu icin thread'ler yalnizca kuyruk bekler.
+# gevent monkey-patch ProcessPoolExecutor/multiprocessing.Manager ile uyumsuz
+# oldugundan varsayilan degil; GUNICORN_WORKER_CLASS=gevent ile denenebilir.
+import os
+
+bind = "0.0.0.0:" + os.environ.get("PORT", "8000")
+
+# Tek worker: SSE oturum durumu ve paylasilan optimizer onbellekleri surec ici
+workers = int(os.environ.get("GUNICORN_WORKERS", "1"))
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.environ.get("GUNICORN_THREADS", "16"))
+worker_connections = 1000  # yalnizca gevent/eventlet worker'larinda kullanilir
+
+timeout = 300
+keepalive = 5
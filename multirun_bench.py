@@ -1,6 +1,8 @@
 # coding: utf-8
 """Multi-run benchmark: her config 5 kez calistirilir, istatistik raporlanir."""
-import sys, io, json
+import os, sys, io, json
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
 from tusas.core.laminate_optimizer import LaminateOptimizer
@@ -10,26 +12,43 @@ configs = [
     ({0:18, 90:12, 45:14, -45:14}, "58ply"),
 ]
 
-results = {}
 N_RUNS = 3
 
-for ply_counts, label in configs:
-    scores = []
-    for run in range(N_RUNS):
-        opt = LaminateOptimizer(ply_counts)
-        seq, score, details, _ = opt.run_hybrid_optimization()
-        rules = details.get("rules", {})
-        r5 = rules.get("R5", {}).get("score", 0)
-        r7 = rules.get("R7", {}).get("score", 0)
-        r8 = rules.get("R8", {}).get("score", 0)
-        scores.append({"total": score, "R5": r5, "R7": r7, "R8": r8})
-        print(f"  {label} run {run+1}: {score:.2f} (R5={r5:.2f}, R7={r7:.2f}, R8={r8:.2f})")
-
-    avg_total = sum(s["total"] for s in scores) / len(scores)
-    best_total = max(s["total"] for s in scores)
-    results[label] = {"avg": round(avg_total, 2), "best": round(best_total, 2), "runs": scores}
-    print(f"\n  {label}: avg={avg_total:.2f}, best={best_total:.2f}\n")
-
-with open("multirun_results.json", "w") as f:
-    json.dump(results, f, indent=2)
-print("Saved multirun_results.json")
+
+def _run_one(task):
+    """Tek (config, run) kosusu (ProcessPoolExecutor icin modul seviyesinde)."""
+    ply_counts, label, run = task
+    # Her kosu kendi tohumlu RNG'si ile: kosular bagimsiz ve tekrarlanabilir.
+    # Havuz iscisinde calisir: GA ic ice surec havuzu acmasin (zamanlamalar bozulmasin)
+    opt = LaminateOptimizer(ply_counts, rng=np.random.default_rng(run), ga_backend="thread")
+    seq, score, details, _ = opt.run_hybrid_optimization()
+    rules = details.get("rules", {})
+    r5 = rules.get("R5", {}).get("score", 0)
+    r7 = rules.get("R7", {}).get("score", 0)
+    r8 = rules.get("R8", {}).get("score", 0)
+    return label, run, {"total": score, "R5": r5, "R7": r7, "R8": r8}
+
+
+if __name__ == "__main__":
+    # Config x run ekseninin tamami bagimsiz: len(configs) * N_RUNS gorev
+    tasks = [(ply_counts, label, run) for ply_counts, label in configs for run in range(N_RUNS)]
+    with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as ex:
+        outputs = list(ex.map(_run_one, tasks))
+
+    results = {}
+    for _ply_counts, label in configs:
+        scores = []
+        for out_label, run, s in outputs:
+            if out_label != label:
+                continue
+            scores.append(s)
+            print(f"  {label} run {run+1}: {s['total']:.2f} (R5={s['R5']:.2f}, R7={s['R7']:.2f}, R8={s['R8']:.2f})")
+
+        avg_total = sum(s["total"] for s in scores) / len(scores)
+        best_total = max(s["total"] for s in scores)
+        results[label] = {"avg": round(avg_total, 2), "best": round(best_total, 2), "runs": scores}
+        print(f"\n  {label}: avg={avg_total:.2f}, best={best_total:.2f}\n")
+
+    with open("multirun_results.json", "w") as f:
+        json.dump(results, f, indent=2)
+    print("Saved multirun_results.json")
@@ -0,0 +1,181 @@
+"""
+API regresyon testleri (Flask test client). Multi-zone GA'sı çalıştırılmaz; havuz /
+Manager yolları monkeypatch ile taklit edilir.
+"""
+import json
+
+import numpy as np
+import pytest
+
+from tusas.api import routes
+from tusas.api._parse import parse_ply_counts
+from tusas.app_factory import create_app
+from tusas.core.laminate_optimizer import LaminateOptimizer
+
+SEED = 3
+
+ZONES = [{"0": 12, "90": 8, "45": 8, "-45": 8}, {"0": 8, "90": 8, "45": 7, "-45": 7}]
+
+
+@pytest.fixture(scope="module")
+def client():
+    return create_app().test_client()
+
+
+def _sse_events(response):
+    """SSE gövdesindeki data olayları (keep-alive yorumları hariç)."""
+    body = response.get_data(as_text=True)
+    return [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+
+
+def test_stream_falls_back_to_thread_when_manager_unavailable(client, monkeypatch):
+    def broken_manager():
+        raise OSError("manager başlatılamadı")
+
+    def no_pool(*_args):
+        raise AssertionError("Manager yokken havuza gönderilmemeli")
+
+    calls = []
+
+    def fake_run(*args):
+        calls.append(args)
+        progress_queue, cancel_event = args[-2], args[-1]
+        assert not cancel_event.is_set()
+        progress_queue.put({"type": "progress", "data": {"stage": "test"}})
+        return {"success": True, "zones": []}, 0.0
+
+    monkeypatch.setattr(routes, "_get_manager", broken_manager)
+    monkeypatch.setattr(routes, "_submit_multi_zone", no_pool)
+    monkeypatch.setattr(routes, "_run_multi_zone", fake_run)
+
+    response = client.post("/optimize_multi_zone_stream", json={"zones": ZONES})
+
+    assert response.status_code == 200
+    events = _sse_events(response)
+    assert [e["type"] for e in events] == ["progress", "result"]
+    assert events[-1]["data"]["success"] is True
+    assert len(calls) == 1
+
+
+# ---------- /evaluate_batch ----------
+
+def _sequences():
+    """Farklı açı sayılarına sahip iki geçerli simetrik dizilim."""
+    opt_a = LaminateOptimizer({0: 12, 90: 8, 45: 8, -45: 8}, rng=np.random.default_rng(SEED))
+    opt_b = LaminateOptimizer({0: 8, 90: 8, 45: 8, -45: 8}, rng=np.random.default_rng(SEED))
+    return [opt_a._create_symmetric_individual(), opt_b._create_symmetric_individual()]
+
+
+def test_evaluate_batch_matches_evaluate(client):
+    sequences = _sequences()
+    response = client.post("/evaluate_batch", json={"sequences": sequences})
+
+    assert response.status_code == 200
+    results = response.get_json()["results"]
+    assert len(results) == len(sequences)
+    for sequence, result in zip(sequences, results):
+        single = client.post("/evaluate", json={"sequence": sequence}).get_json()
+        assert result == single
+
+
+def test_evaluate_batch_shared_vs_per_sequence_ply_counts(client, monkeypatch):
+    sequences = _sequences()
+    requested = []
+    shared_optimizer = routes._shared_optimizer
+
+    def spy(ply_counts, *args, **kwargs):
+        requested.append(dict(ply_counts))
+        return shared_optimizer(ply_counts, *args, **kwargs)
+
+    monkeypatch.setattr(routes, "_shared_optimizer", spy)
+
+    ply_counts = {"0": 12, "90": 8, "45": 8, "-45": 8}
+    response = client.post("/evaluate_batch", json={"sequences": sequences, "ply_counts": ply_counts})
+    assert response.status_code == 200
+    # ply_counts verilince optimizer bir kez alınır
+    assert requested == [ply_counts]
+
+    requested.clear()
+    response = client.post("/evaluate_batch", json={"sequences": sequences})
+    assert response.status_code == 200
+    # Verilmezse her dizilimin kendi açı sayıları
+    assert requested == [routes._count_angles(seq) for seq in sequences]
+
+
+def test_evaluate_batch_size_limit(client):
+    sequence = _sequences()[0]
+
+    response = client.post("/evaluate_batch", json={"sequences": [sequence] * (routes.EVALUATE_BATCH_MAX + 1)})
+    assert response.status_code == 400
+    assert str(routes.EVALUATE_BATCH_MAX) in response.get_json()["error"]
+
+    response = client.post("/evaluate_batch", json={"sequences": [sequence] * routes.EVALUATE_BATCH_MAX})
+    assert response.status_code == 200
+    assert len(response.get_json()["results"]) == routes.EVALUATE_BATCH_MAX
+
+
+@pytest.mark.parametrize("sequences, error", [
+    (None, "sequences required"),
+    ([], "sequences required"),
+    ({"0": [45, -45]}, "sequences required"),
+    ([[45, -45, -45, 45], []], "Sequence 1 bos"),
+    ([[45, -45, -45, 45], [45, -45, -45, 45], [45, "x", 45]], "Invalid sequence format (index 2)"),
+])
+def test_evaluate_batch_errors(client, sequences, error):
+    response = client.post("/evaluate_batch", json={"sequences": sequences})
+
+    assert response.status_code == 400
+    assert response.get_json()["error"] == error
+
+
+# ---------- istek ayrıştırma ----------
+
+@pytest.mark.parametrize("raw, expected", [
+    ({0: 5, 90: 3}, {0: 5, 90: 3}),
+    ({0: 5, "90": 3}, {0: 5, 90: 3}),
+    ({"0": "5", "45": True, "-45": -1, "90": 2}, {0: 5, 90: 2}),
+    ({}, {}),
+])
+def test_parse_ply_counts_normalizes_keys(raw, expected):
+    parsed = parse_ply_counts(raw)
+
+    assert parsed == expected
+    assert all(type(k) is int for k in parsed)
+
+
+# ---------- standart dışı açılar ----------
+
+NON_STANDARD_SEQ = [45, -45, 0, 0, 135, 90, 90, 135, 0, 0, -45, 45]
+
+
+def test_evaluate_accepts_non_standard_angles(client):
+    response = client.post("/evaluate", json={"sequence": NON_STANDARD_SEQ})
+
+    assert response.status_code == 200
+    assert response.get_json()["fitness_score"] == pytest.approx(86.79)
+
+
+def test_dropoff_accepts_non_standard_angles(client):
+    response = client.post("/dropoff", json={"master_sequence": NON_STANDARD_SEQ, "target_ply": 10})
+
+    assert response.status_code == 200
+    assert len(response.get_json()["sequence"]) == 10
+
+
+# ---------- süreç havuzu boyutu ----------
+
+@pytest.mark.parametrize("env, cpus, expected", [
+    ({"TUSAS_POOL_WORKERS": "3"}, 16, 3),
+    ({"TUSAS_POOL_WORKERS": "0"}, 16, 1),
+    ({}, 16, routes.POOL_MAX_WORKERS_DEFAULT),
+    ({"GUNICORN_WORKERS": "8"}, 16, 2),
+    ({}, 1, 1),
+])
+def test_pool_workers(monkeypatch, env, cpus, expected):
+    for key in ("TUSAS_POOL_WORKERS", "GUNICORN_WORKERS"):
+        monkeypatch.delenv(key, raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    monkeypatch.setattr(routes.os, "cpu_count", lambda: cpus)
+
+    assert routes._pool_workers() == expected
@@ -0,0 +1,117 @@
+"""
+Drop-off regresyon testleri (eski debug_optimizer.py / debug_optimizer_v2.py /
+debug_multizone.py senaryoları). Tek süreçte çalışır; master skeleton modül
+başına bir kez üretilir.
+"""
+import numpy as np
+import pytest
+
+from tusas.core.laminate_optimizer import DEC, LaminateOptimizer, encode_sequence
+from tusas.core.dropoff_optimizer import DropOffOptimizer
+from tusas.core.symmetry import check_symmetry_compatibility, normalize_ply_counts_for_symmetry
+
+SEED = 3
+MASTER_COUNTS = {0: 8, 45: 8, -45: 8, 90: 8}       # 32 ply
+ZONE2_COUNTS = {0: 12, 90: 8, 45: 8, -45: 8}       # 36 ply
+TARGET_8778 = {0: 8, 45: 7, -45: 7, 90: 8}         # 30 ply
+
+
+def _counts(seq) -> dict:
+    """Açı sayıları (tek np.bincount geçişi); yalnızca sıfır olmayanlar, Counter gibi."""
+    counts = np.bincount(encode_sequence(seq), minlength=len(DEC))
+    return {DEC[code]: c for code, c in enumerate(counts.tolist()) if c}
+
+
+@pytest.fixture(scope="module")
+def opt_master():
+    return LaminateOptimizer(MASTER_COUNTS, rng=np.random.default_rng(SEED))
+
+
+@pytest.fixture(scope="module")
+def master_seq(opt_master):
+    return opt_master._build_smart_skeleton(use_cache=True)
+
+
+def test_master_skeleton_is_valid(opt_master, master_seq):
+    assert len(master_seq) == sum(MASTER_COUNTS.values())
+    assert _counts(master_seq) == MASTER_COUNTS
+    assert opt_master._is_symmetric(master_seq)
+
+
+def test_8778_requires_symmetry_adjustment():
+    """45/-45 tek sayıda: kullanıcı seçimi istenir; normalize edilmiş sayılar uyumludur."""
+    compat = check_symmetry_compatibility(TARGET_8778)
+    assert compat["requires_user_choice"]
+    assert [issue["type"] for issue in compat["issues"]] == ["odd_45_balance"]
+
+    adjusted = normalize_ply_counts_for_symmetry(TARGET_8778)["adjusted_counts"]
+    assert adjusted == {0: 8, 45: 6, -45: 6, 90: 8}
+    assert not check_symmetry_compatibility(adjusted)["requires_user_choice"]
+
+    opt = LaminateOptimizer(adjusted, rng=np.random.default_rng(SEED))
+    assert _counts(opt._create_symmetric_individual()) == adjusted
+
+
+def test_dropoff_8888_to_8778(opt_master, master_seq):
+    drop_opt = DropOffOptimizer(master_seq, opt_master, rng=np.random.default_rng(SEED))
+    new_seq, score, _dropped = drop_opt.optimize_drop_with_angle_targets(TARGET_8778)
+
+    # Eski hata: master dizilimi olduğu gibi geri dönüyordu
+    assert new_seq != master_seq
+    assert len(new_seq) == sum(TARGET_8778.values())
+    assert _counts(new_seq) == TARGET_8778
+    assert score > 0
+
+
+def test_multizone_36_to_30():
+    z2_opt = LaminateOptimizer(ZONE2_COUNTS, rng=np.random.default_rng(SEED))
+    z2_seq = z2_opt._create_symmetric_individual()
+    assert _counts(z2_seq) == ZONE2_COUNTS
+
+    drop_opt = DropOffOptimizer(z2_seq, z2_opt, rng=np.random.default_rng(SEED))
+    new_seq, _score, _dropped = drop_opt.optimize_drop_with_angle_targets(TARGET_8778)
+
+    assert len(new_seq) == sum(TARGET_8778.values())
+    assert _counts(new_seq) == TARGET_8778
+
+
+def test_optimize_drop_multi_matches_chained_calls(opt_master, master_seq):
+    targets = [28, 24, 20]
+
+    drop_opt = DropOffOptimizer(master_seq, opt_master, rng=np.random.default_rng(SEED))
+    snapshots = drop_opt.optimize_drop_multi(targets)
+    assert drop_opt.master_sequence == master_seq
+
+    # Zincirdeki örnekler tek Generator'ı paylaşır: çekiliş akışı optimize_drop_multi ile aynı
+    rng = np.random.default_rng(SEED)
+    chained = []
+    current = master_seq
+    for target in targets:
+        step = DropOffOptimizer(current, opt_master, rng=rng).optimize_drop(target)
+        chained.append(step)
+        current = step[0]
+
+    assert snapshots == chained
+
+
+def test_optimize_drop_returns_fitness_of_result(opt_master, master_seq):
+    drop_opt = DropOffOptimizer(master_seq, opt_master, rng=np.random.default_rng(SEED))
+    new_seq, score, dropped = drop_opt.optimize_drop(28)
+
+    assert len(dropped) == len(master_seq) - 28
+    assert len(new_seq) == 28
+    # Eski hata: seçim anahtarının 0° bonus alanı (0/1) skor diye dönüyordu
+    assert score == opt_master.calculate_fitness(new_seq)[0]
+
+
+def test_dropoff_non_standard_angles(opt_master):
+    """±135° gibi int8'e sığmayan açılar (master histogramı negatif açılara genişler)."""
+    master = [45, -45, 0, -135, 90, 0, 0, 90, -135, 0, -45, 45]
+    drop_opt = DropOffOptimizer(master, opt_master, rng=np.random.default_rng(SEED))
+
+    assert drop_opt._master_angle_counts([-135, 0, 135]).tolist() == [2, 4, 0]
+
+    new_seq, _score, dropped = drop_opt.optimize_drop(10)
+    assert len(new_seq) == 10
+    assert len(dropped) == 2
+    assert set(new_seq) <= set(master)
@@ -0,0 +1,76 @@
+"""
+calculate_fitness_batch regresyon testleri: satır önbelleği ve tekil fitness ile tutarlılık.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from tusas.core.laminate_optimizer import LaminateOptimizer
+
+SEED = 3
+PLY_COUNTS = {0: 12, 90: 8, 45: 8, -45: 8}   # 36 ply
+
+
+def _individuals(opt, count):
+    """Birbirinden farklı `count` simetrik birey."""
+    seen = {}
+    while len(seen) < count:
+        seq = opt._create_symmetric_individual()
+        seen.setdefault(tuple(seq), seq)
+    return list(seen.values())
+
+
+def test_batch_matches_scalar_fitness():
+    opt = LaminateOptimizer(PLY_COUNTS, rng=np.random.default_rng(SEED))
+    pop = _individuals(opt, 12)
+    fits = opt.calculate_fitness_batch(np.array(pop + pop[:3]))
+
+    assert fits.shape == (15,)
+    # Batch yuvarlaması kural başına ±0.01 sapabilir (8 kural)
+    for fit, seq in zip(fits.tolist(), pop + pop[:3]):
+        assert abs(fit - opt.calculate_fitness(seq)[0]) <= 0.08 + 1e-9
+
+
+def test_batch_cache_overflow_keeps_earlier_hits():
+    """Önbellek dolunca temizlenir; temizlikten önce isabet eden satırlar yine skorlanır."""
+    opt = LaminateOptimizer(PLY_COUNTS, rng=np.random.default_rng(SEED))
+    opt.FITNESS_CACHE_LIMIT = 4
+    pop = _individuals(opt, 6)
+
+    first = opt.calculate_fitness_batch(np.array(pop[:3]))
+    # 1 eski (isabet) + 3 yeni satır: 3 + 3 > 4 olduğundan önbellek temizlenir
+    second = opt.calculate_fitness_batch(np.array([pop[0]] + pop[3:]))
+
+    assert second[0] == first[0]
+    assert len(opt._batch_fitness_cache) <= opt.FITNESS_CACHE_LIMIT
+
+    uncached = LaminateOptimizer(PLY_COUNTS, rng=np.random.default_rng(SEED))
+    assert second.tolist() == uncached.calculate_fitness_batch(np.array([pop[0]] + pop[3:])).tolist()
+
+
+def test_batch_cache_concurrent_use():
+    """Paylaşılan örnek (API): eşzamanlı batch çağrıları önbellek temizliğiyle bozulmaz."""
+    opt = LaminateOptimizer(PLY_COUNTS, rng=np.random.default_rng(SEED))
+    opt.FITNESS_CACHE_LIMIT = 8
+    pop = np.array(_individuals(opt, 24))
+    expected = LaminateOptimizer(PLY_COUNTS, rng=np.random.default_rng(SEED)).calculate_fitness_batch(pop)
+
+    def score(offset):
+        rows = np.roll(np.arange(len(pop)), offset)[:10]
+        return rows, opt.calculate_fitness_batch(pop[rows])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for rows, fits in executor.map(score, range(200)):
+            assert fits.tolist() == expected[rows].tolist()
+
+
+def test_fitness_rounding_matches_legacy_dict_path():
+    """R5 np.float64 olarak np.round ile yuvarlanır (eski yol); Python round 0.01 sapıyordu."""
+    hard_off = {"external_0": False, "adjacent_0_90": False, "external_45": False}
+    opt = LaminateOptimizer(PLY_COUNTS, hard_rules=hard_off, rng=np.random.default_rng(SEED))
+    total, details = opt.calculate_fitness([0, 45, -45, 90, -45, -45])
+
+    assert details["rules"]["R5"]["score"] == 13.48
+    assert details["rules"]["R5"]["penalty"] == 0.52
+    assert details["total_score"] == 65.63
+    assert opt.calculate_fitness_fast([0, 45, -45, 90, -45, -45])[0] == total
@@ -0,0 +1,55 @@
+"""
+Multi-start GA backend seçimi: süreç havuzu yalnızca açıkça istenince açılır.
+GA koşuları taklit edilir (_run_single_ga); yalnızca havuz seçimi test edilir.
+"""
+import numpy as np
+import pytest
+
+from tusas.core import laminate_optimizer
+from tusas.core.laminate_optimizer import LaminateOptimizer
+
+SEED = 3
+PLY_COUNTS = {0: 12, 90: 8, 45: 8, -45: 8}   # 36 ply
+
+
+@pytest.fixture
+def optimizer(monkeypatch):
+    opt = LaminateOptimizer(PLY_COUNTS, rng=np.random.default_rng(SEED))
+    monkeypatch.setattr(opt, "_run_single_ga", lambda args: (args[0], 0.0, args[1]))
+    return opt
+
+
+@pytest.fixture
+def no_process_pool(monkeypatch):
+    def forbidden(*_args, **_kwargs):
+        raise AssertionError("Varsayılan backend süreç havuzu açmamalı")
+
+    monkeypatch.setattr(laminate_optimizer, "ProcessPoolExecutor", forbidden)
+
+
+@pytest.mark.usefixtures("no_process_pool")
+def test_multi_start_ga_defaults_to_threads(optimizer, capsys):
+    skeleton = optimizer._create_symmetric_individual()
+    best_seq, _score = optimizer._multi_start_ga(skeleton, n_runs=3)
+
+    assert best_seq == skeleton
+    assert "threads" in capsys.readouterr().out
+
+
+@pytest.mark.usefixtures("no_process_pool")
+def test_multi_start_ga_uses_instance_backend(monkeypatch, capsys):
+    opt = LaminateOptimizer(PLY_COUNTS, rng=np.random.default_rng(SEED), ga_backend="process")
+    created = []
+
+    class FakePool:
+        def __init__(self, max_workers):
+            created.append(max_workers)
+            raise OSError("süreç başlatılamadı")
+
+    monkeypatch.setattr(laminate_optimizer, "ProcessPoolExecutor", FakePool)
+    monkeypatch.setattr(opt, "_run_single_ga", lambda args: (args[0], 0.0, args[1]))
+    opt._multi_start_ga(opt._create_symmetric_individual(), n_runs=3)
+
+    # "process" açıkça seçildi: havuz denendi, başlatılamayınca thread'lere düşüldü
+    assert len(created) == 1
+    assert "threads" in capsys.readouterr().out
@@ -1,4 +1,3 @@
-from .app_factory import create_app
-
-__all__ = ["create_app"]
+from .app_factory import create_app, serve
 
+__all__ = ["create_app", "serve"]
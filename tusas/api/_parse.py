@@ -0,0 +1,42 @@
+"""
+İstek gövdesi ayrıştırma yardımcıları (routes.py).
+
+Uzun dizilimler tek np.asarray çağrısıyla dönüştürülür; hata davranışı
+[int(x) for x in seq] ile aynıdır (geçersiz değerde ValueError/TypeError).
+"""
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+def parse_int_seq(x: Any) -> List[int]:
+    """Açı dizilimini Python int listesine çevir (int32 üzerinden, C döngüsünde)."""
+    try:
+        arr = np.asarray(x, dtype=np.int32)
+    except OverflowError as e:
+        raise ValueError(str(e))
+    if arr.ndim != 1:
+        raise ValueError("sequence tek boyutlu bir liste olmalı")
+    return arr.tolist()
+
+
+def parse_int_map(d: Dict[Any, Any]) -> Dict[int, int]:
+    """{açı: adet} sözlüğünü int'e çevir; geçersiz değerde ValueError/TypeError."""
+    return {int(k): int(v) for k, v in d.items()}
+
+
+def parse_ply_counts(d: Dict[Any, Any]) -> Dict[int, int]:
+    """Negatif olmayan tamsayı adetleri tut, diğerlerini sessizce at (eski isdigit filtresi)."""
+    if all(type(k) is int and type(v) is int and v >= 0 for k, v in d.items()):
+        # Zaten normalize (int anahtar / int adet): yeniden ayrıştırma gerekmez
+        return dict(d)
+    counts = {}
+    for k, v in d.items():
+        if isinstance(v, bool):
+            continue
+        if isinstance(v, int):
+            if v >= 0:
+                counts[int(k)] = v
+        elif isinstance(v, str) and v.isdigit():
+            counts[int(k)] = int(v)
+    return counts
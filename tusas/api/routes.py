@@ -1,30 +1,265 @@
-import time
+from time import perf_counter_ns
 from collections import Counter
+from functools import lru_cache
+from typing import Optional
+from types import SimpleNamespace
 
 import os
 import json
 import threading
 import queue
+import tempfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
 from flask import Blueprint, jsonify, request, send_from_directory, Response, stream_with_context
 
+from ._parse import parse_int_map, parse_int_seq, parse_ply_counts
 from ..core.dropoff_optimizer import DropOffOptimizer
 from ..core.laminate_optimizer import LaminateOptimizer
-from ..core.multi_zone_optimizer import MultiZoneOptimizer
+from ..core.multi_zone_optimizer import MultiZoneOptimizer, OptimizationCancelled, check_zone_connectivity
 from ..core.symmetry import check_symmetry_compatibility, normalize_ply_counts_for_symmetry
 from ..state import get_zone_manager, set_zone_manager
 from ..zones.manager import ZoneManager
 from ..zones.models import Zone
 
-# ML Surrogate (opsiyonel)
+# orjson (opsiyonel): yoksa Flask jsonify kullanılır
 try:
-    from ..ml.train_surrogate import train_surrogate, get_model_status, load_surrogate
-    _ml_available = True
+    import orjson
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_SORT_KEYS
 except ImportError:
-    _ml_available = False
+    orjson = None
+
+# ML Surrogate (opsiyonel): sklearn/joblib import grafiği ağır olduğundan blueprint
+# yüklenirken değil, /ml/* uç noktalarına ilk istek geldiğinde import edilir.
+_ml_available = None  # type: Optional[bool]
+train_surrogate = get_model_status = load_surrogate = None
+
+
+def _ensure_ml_loaded() -> bool:
+    """ML fonksiyonlarını bir kez import edip modül globallerine yaz; kullanılabilir mi döndür."""
+    global _ml_available, train_surrogate, get_model_status, load_surrogate
+    if _ml_available is None:
+        try:
+            from ..ml.train_surrogate import train_surrogate, get_model_status, load_surrogate
+            _ml_available = True
+        except ImportError:
+            _ml_available = False
+    return _ml_available
 
 
 bp = Blueprint("tusas_api", __name__)
 
+# Proje kök dizini (index.html); import sırasında bir kez hesaplanır
+_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
+
+# SSE akışı: kuyruk kapasitesi ve keep-alive aralığı (saniye)
+SSE_QUEUE_MAXSIZE = 256
+SSE_HEARTBEAT_SECONDS = 15.0
+
+# PDF rapor: bu boyuta kadar bellekte, üstü geçici dosyada; yanıt parça boyutu
+PDF_SPOOL_MAX_BYTES = 1024 * 1024
+PDF_CHUNK_SIZE = 64 * 1024
+
+# /evaluate_batch: istek başına en fazla dizilim sayısı
+EVALUATE_BATCH_MAX = 1000
+
+
+def _ojson(obj, status=200):
+    """JSON yanıtı (orjson: int anahtarlar ve NumPy tipleri doğrudan; jsonify gibi sıralı anahtar)."""
+    if orjson is None:
+        response = jsonify(obj)
+        response.status_code = status
+        return response
+    return Response(orjson.dumps(obj, option=_ORJSON_OPTS), status=status, mimetype="application/json")
+
+
+def _dumps(obj) -> str:
+    if orjson is None:
+        return json.dumps(obj)
+    return orjson.dumps(obj, option=_ORJSON_OPTS).decode()
+
+
+# _count_angles bincount indeks sırası
+_STANDARD_ANGLES = np.array([-45, 0, 45, 90], dtype=np.int16)
+
+
+# Paylaşılan optimizer'lar: anahtar istemciden gelen ply_counts olduğundan LRU küçük ve her
+# örneğin önbellek sınırı düşük tutulur (36 ply'da dolu bir 20000'lik fitness önbelleği ~20 MB)
+SHARED_OPTIMIZER_MAXSIZE = 8
+SHARED_OPTIMIZER_CACHE_LIMIT = 2000
+
+
+@lru_cache(maxsize=SHARED_OPTIMIZER_MAXSIZE)
+def _get_optimizer(ply_key, use_surrogate: bool = False) -> LaminateOptimizer:
+    """Süreç genelinde paylaşılan LaminateOptimizer (ply_key: sıralı (açı, adet) tuple'ı).
+
+    Yalnızca skorlama / drop-off için kullanılır: bu yollar optimizer'ın sadece
+    fitness önbelleklerini değiştirir. Önbellek erişimleri tek get / hesapla / tek yazma
+    düzenindedir ve sonuç yerel değişkenden döner; başka bir thread'in eşzamanlı
+    temizliği yalnızca önbellek kaçırmasına yol açar (kilitsiz thread güvenli).
+    GA çalıştıran uç noktalar (/optimize, /auto_optimize) kendi örneğini oluşturur.
+    """
+    optimizer = LaminateOptimizer(dict(ply_key), use_surrogate=use_surrogate)
+    optimizer.FITNESS_CACHE_LIMIT = SHARED_OPTIMIZER_CACHE_LIMIT
+    return optimizer
+
+
+def _shared_optimizer(ply_counts, use_surrogate: bool = False) -> LaminateOptimizer:
+    try:
+        key = tuple(sorted((int(k), int(v)) for k, v in ply_counts.items()))
+    except (ValueError, TypeError):
+        # Normalize edilemeyen girdi: eski davranış (istek başına yeni örnek)
+        return LaminateOptimizer(ply_counts, use_surrogate=use_surrogate)
+    return _get_optimizer(key, use_surrogate)
+
+
+# SSE akışlarını yürüten thread'ler: istek başına yeni thread açılmaz, eşzamanlı akış sayısı sınırlı
+_SSE_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="opt")
+
+# Multi-zone GA'sı CPU-bound: Flask worker thread'ini bloklamamak için süreç havuzunda çalışır.
+# Havuz ve Manager ilk kullanımda oluşturulur (import sırasında süreç başlatılmaz).
+# Havuz boyutu: TUSAS_POOL_WORKERS; verilmezse CPU'lar gunicorn worker'larına bölünür ve eşzamanlı
+# akış sınırıyla (_SSE_EXECUTOR) kırpılır. Havuz işçileri GA'yı thread backend'iyle çalıştırır.
+POOL_MAX_WORKERS_DEFAULT = 4
+_POOL = None
+_MANAGER = None
+_POOL_LOCK = threading.Lock()
+
+
+def _pool_workers() -> int:
+    configured = os.environ.get("TUSAS_POOL_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    server_workers = max(1, int(os.environ.get("GUNICORN_WORKERS", "1")))
+    return max(1, min(POOL_MAX_WORKERS_DEFAULT, (os.cpu_count() or 1) // server_workers))
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ProcessPoolExecutor(max_workers=_pool_workers())
+        return _POOL
+
+
+def _reset_pool() -> None:
+    """Bozulan (BrokenProcessPool) havuzu bırak; sonraki istek yenisini oluşturur."""
+    global _POOL
+    with _POOL_LOCK:
+        _POOL = None
+
+
+def _get_manager():
+    global _MANAGER
+    with _POOL_LOCK:
+        if _MANAGER is None:
+            _MANAGER = multiprocessing.Manager()
+        return _MANAGER
+
+
+def _manager_object(factory: str):
+    """Manager üzerinde Event / Queue oluştur; Manager kullanılamazsa None döner
+    (çağıran _submit_multi_zone gibi thread içi yola düşer)."""
+    try:
+        return getattr(_get_manager(), factory)()
+    except (OSError, RuntimeError, EOFError) as e:
+        print(f"Multiprocessing manager kullanilamadi ({e}), istek thread icinde calistiriliyor")
+        return None
+
+
+def _run_multi_zone(zones, bounds, panel_scale_mm, rule_weights, hard_rules,
+                    use_surrogate, progress_queue=None, cancel_event=None):
+    """MultiZoneOptimizer'ı çalıştır; (sonuç, süre) döndürür. Süreç havuzunda çalıştırılabilir.
+
+    progress_queue verilirse ilerleme olayları {"type": "progress", ...} olarak oraya yazılır.
+    cancel_event set edilirse optimize_all OptimizationCancelled ile yarıda kesilir.
+    """
+    progress_callback = None
+    if progress_queue is not None:
+        def progress_callback(data):
+            progress_queue.put({"type": "progress", "data": data})
+
+    t0 = perf_counter_ns()
+    optimizer = MultiZoneOptimizer(
+        zones,
+        bounds=bounds,
+        panel_scale_mm=panel_scale_mm,
+        rule_weights=rule_weights,
+        hard_rules=hard_rules,
+        use_surrogate=use_surrogate,
+    )
+    result = optimizer.optimize_all(progress_callback=progress_callback, cancel_event=cancel_event)
+    return result, (perf_counter_ns() - t0) / 1e9
+
+
+def _submit_multi_zone(*args):
+    """_run_multi_zone'u havuza gönder; havuz kullanılamazsa None döner (çağıran aynı süreçte çalıştırır)."""
+    try:
+        return _get_pool().submit(_run_multi_zone, *args)
+    except (BrokenProcessPool, OSError, RuntimeError) as e:
+        print(f"Process pool kullanilamadi ({e}), istek thread icinde calistiriliyor")
+        _reset_pool()
+        return None
+
+
+def _validate_zones(zones):
+    """Multi-zone girişini doğrula; ilk hatanın mesajı veya None.
+
+    Değerler zone başına tek np.fromiter ile dönüştürülür, toplamlar tek NumPy
+    geçişinde kontrol edilir; mesaj önceliği zone sırasına göredir.
+    """
+    if not zones or len(zones) < 2:
+        return "En az 2 zone gerekli"
+
+    totals = []
+    parse_error = None
+    for i, zone in enumerate(zones):
+        if not isinstance(zone, dict):
+            parse_error = f"Zone {i + 1} geçersiz format"
+            break
+        try:
+            totals.append(np.fromiter((int(v) for v in zone.values()), dtype=np.int64, count=len(zone)).sum())
+        except (ValueError, TypeError, OverflowError):
+            parse_error = f"Zone {i + 1} geçersiz değerler içeriyor"
+            break
+
+    empty = np.flatnonzero(np.asarray(totals, dtype=np.int64) <= 0)
+    if empty.size:
+        return f"Zone {int(empty[0]) + 1} boş olamaz"
+    return parse_error
+
+
+def _disconnected_zones_response(zones, bounds):
+    """Bounds'a göre bağlantısız zone varsa 400 yanıtı, yoksa None."""
+    try:
+        result = check_zone_connectivity(zones, bounds)
+    except (KeyError, TypeError, ValueError):
+        # Hatalı bounds: eski akıştaki gibi optimizer'a bırak
+        return None
+    if result is None:
+        return None
+    return _ojson({
+        "error": result["error"],
+        "disconnected_zones": result["disconnected_zones"],
+        "root_index": result["root_index"],
+        "neighbor_graph": result["neighbor_graph"],
+    }), 400
+
+
+def _count_angles(seq):
+    """Açı histogramı: dict(Counter(seq)) ile aynı içerik, NumPy bincount ile.
+
+    Standart açılar (-45/0/45/90) (x + 45) // 45 ile 0..3 indekslerine eşlenir;
+    tamsayı olmayan ya da standart dışı değer varsa Counter'a düşülür.
+    """
+    arr = np.asarray(seq)
+    if arr.ndim != 1 or arr.dtype.kind not in "iu" or not np.isin(arr, _STANDARD_ANGLES).all():
+        return dict(Counter(seq))
+    counts = np.bincount((arr + 45) // 45, minlength=4)
+    return {int(angle): int(c) for angle, c in zip(_STANDARD_ANGLES, counts) if c}
+
 
 def _normalize_multi_zone_symmetry(zones):
     normalized_zones = []
@@ -51,15 +286,14 @@ def _normalize_multi_zone_symmetry(zones):
 @bp.route("/")
 def index():
     # Always serve from project root (avoid cwd/encoding issues on Windows paths)
-    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir))
-    return send_from_directory(root_dir, "index.html")
+    return send_from_directory(_ROOT_DIR, "index.html")
 
 
 @bp.post("/optimize")
 def optimize():
     payload = request.get_json(force=True, silent=True) or {}
     ply_counts = payload.get("ply_counts", {})
-    ply_counts = {int(k): int(v) for k, v in ply_counts.items() if str(v).isdigit()} or {0: 18, 90: 18, 45: 18, -45: 18}
+    ply_counts = parse_ply_counts(ply_counts) or {0: 18, 90: 18, 45: 18, -45: 18}
 
     population_size = int(payload.get("population_size", 120))
     generations = int(payload.get("generations", 600))
@@ -69,7 +303,7 @@ def optimize():
     symmetry_check = check_symmetry_compatibility(ply_counts)
     user_choice = payload.get("symmetry_user_choice")
     if symmetry_check["requires_user_choice"] and not user_choice:
-        return jsonify(
+        return _ojson(
             {
                 "requires_symmetry_choice": True,
                 "symmetry_info": symmetry_check,
@@ -91,9 +325,9 @@ def optimize():
 
     use_surrogate = bool(payload.get("use_surrogate", False))
     optimizer = LaminateOptimizer(ply_counts, use_surrogate=use_surrogate)
-    start_time = time.time()
+    t0 = perf_counter_ns()
     master_seq, master_score, details, history = optimizer.run_hybrid_optimization()
-    ga_elapsed = time.time() - start_time
+    ga_elapsed = (perf_counter_ns() - t0) / 1e9
 
     drop_targets = []
     temp = len(master_seq)
@@ -103,14 +337,10 @@ def optimize():
             drop_targets.append(temp)
 
     drop_opt = DropOffOptimizer(master_seq, optimizer)
-    drop_results_list = []
-    current_seq = master_seq
-    for target in drop_targets:
-        drop_opt.master_sequence = current_seq
-        drop_opt.total_plies = len(current_seq)
-        new_seq, sc, dropped_indices = drop_opt.optimize_drop(target)
-        drop_results_list.append({"target": target, "seq": new_seq, "score": sc, "dropped": dropped_indices})
-        current_seq = new_seq
+    drop_results_list = [
+        {"target": target, "seq": new_seq, "score": sc, "dropped": dropped_indices}
+        for target, (new_seq, sc, dropped_indices) in zip(drop_targets, drop_opt.optimize_drop_multi(drop_targets))
+    ]
 
     response = {
         "master_sequence": master_seq,
@@ -126,7 +356,7 @@ def optimize():
             "generations": generations,
         },
     }
-    return jsonify(response)
+    return _ojson(response)
 
 
 @bp.post("/optimize_multi_zone")
@@ -146,19 +376,9 @@ def optimize_multi_zone():
     payload = request.get_json(force=True, silent=True) or {}
     zones = payload.get("zones", [])
 
-    if not zones or len(zones) < 2:
-        return jsonify({"error": "En az 2 zone gerekli"}), 400
-
-    # Zone formatını doğrula
-    for i, zone in enumerate(zones):
-        if not isinstance(zone, dict):
-            return jsonify({"error": f"Zone {i + 1} geçersiz format"}), 400
-        try:
-            total = sum(int(v) for v in zone.values())
-            if total <= 0:
-                return jsonify({"error": f"Zone {i + 1} boş olamaz"}), 400
-        except (ValueError, TypeError):
-            return jsonify({"error": f"Zone {i + 1} geçersiz değerler içeriyor"}), 400
+    zones_error = _validate_zones(zones)
+    if zones_error is not None:
+        return _ojson({"error": zones_error}), 400
 
     zones, symmetry_adjustments = _normalize_multi_zone_symmetry(zones)
 
@@ -170,28 +390,28 @@ def optimize_multi_zone():
     hard_rules = payload.get("hard_rules", None)
     use_surrogate = bool(payload.get("use_surrogate", False))
 
-    start_time = time.time()
+    # Bağlantısız zone'lar: GA başlatmadan (süreç havuzuna gitmeden) reddet
+    disconnected_error = _disconnected_zones_response(zones, bounds)
+    if disconnected_error is not None:
+        return disconnected_error
+
+    run_args = (zones, bounds, panel_scale_mm, rule_weights, hard_rules, use_surrogate)
 
     try:
-        optimizer = MultiZoneOptimizer(
-            zones,
-            bounds=bounds,
-            panel_scale_mm=panel_scale_mm,
-            rule_weights=rule_weights,
-            hard_rules=hard_rules,
-            use_surrogate=use_surrogate,
-        )
-        result = optimizer.optimize_all()
+        future = _submit_multi_zone(*run_args)
+        try:
+            result, elapsed = future.result() if future is not None else _run_multi_zone(*run_args)
+        except BrokenProcessPool:
+            _reset_pool()
+            result, elapsed = _run_multi_zone(*run_args)
     except Exception as e:
         # Hata mesajını UTF-8 güvenli şekilde al (Windows charmap hatası önlenir)
         err_msg = str(e).encode("utf-8", errors="replace").decode("utf-8")
-        return jsonify({"error": f"Optimizasyon hatası: {err_msg}"}), 500
-
-    elapsed = time.time() - start_time
+        return _ojson({"error": f"Optimizasyon hatası: {err_msg}"}), 500
 
     # Bağlantısız zone hatası kontrolü
     if not result.get("success") and result.get("disconnected_zones"):
-        return jsonify({
+        return _ojson({
             "error": result["error"],
             "disconnected_zones": result["disconnected_zones"],
             "root_index": result.get("root_index", 0),
@@ -218,7 +438,7 @@ def optimize_multi_zone():
     weight_info = result.get("weight", {})
     ramp_checks = result.get("ramp_checks", [])
 
-    return jsonify({
+    return _ojson({
         "success": result.get("success", False),
         "error": result.get("error", None),
         "feasibility_errors": result.get("feasibility_errors", []),
@@ -242,23 +462,17 @@ def optimize_multi_zone():
 def optimize_multi_zone_stream():
     """
     SSE ile gercek zamanli ilerleme bildiren optimizasyon endpoint'i.
+
+    progress olaylarının "data" alanı yalnızca bir önceki progress olayına göre
+    değişen anahtarları içerir (delta); istemci bunları son duruma birleştirir.
+    result / error olayları her zaman tam gönderilir.
     """
     payload = request.get_json(force=True, silent=True) or {}
     zones = payload.get("zones", [])
 
-    if not zones or len(zones) < 2:
-        return jsonify({"error": "En az 2 zone gerekli"}), 400
-
-    # Zone formatını doğrula
-    for i, zone in enumerate(zones):
-        if not isinstance(zone, dict):
-            return jsonify({"error": f"Zone {i + 1} geçersiz format"}), 400
-        try:
-            total = sum(int(v) for v in zone.values())
-            if total <= 0:
-                return jsonify({"error": f"Zone {i + 1} boş olamaz"}), 400
-        except (ValueError, TypeError):
-            return jsonify({"error": f"Zone {i + 1} geçersiz değerler içeriyor"}), 400
+    zones_error = _validate_zones(zones)
+    if zones_error is not None:
+        return _ojson({"error": zones_error}), 400
 
     zones, symmetry_adjustments = _normalize_multi_zone_symmetry(zones)
 
@@ -268,27 +482,66 @@ def optimize_multi_zone_stream():
     hard_rules = payload.get("hard_rules", None)
     use_surrogate_stream = bool(payload.get("use_surrogate", False))
 
-    # Thread-safe queue
-    q = queue.Queue()
+    disconnected_error = _disconnected_zones_response(zones, bounds)
+    if disconnected_error is not None:
+        return disconnected_error
 
-    def worker():
+    # Sınırlı kuyruk: yavaş istemcide bellek büyümesin, eski progress olayları düşürülür
+    q = queue.Queue(maxsize=SSE_QUEUE_MAXSIZE)
+
+    def put_event(item):
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                # Kuyruk FIFO; en eski öğe her zaman bir progress olayıdır (result/error/sentinel en sonda)
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    run_args = (zones, bounds, panel_scale_mm, rule_weights, hard_rules, use_surrogate_stream)
+
+    # Havuz yoksa aynı süreçte çalışırken ilerleme doğrudan sınırlı kuyruğa yazılır
+    local_progress = SimpleNamespace(put=put_event)
+    # İstemci ayrılınca set edilir; alt süreçteki optimize_all ilerleme noktalarında kontrol eder.
+    # Manager başlatılamazsa yerel Event ile aynı süreçte çalışılır
+    cancel_event = _manager_object("Event")
+    use_pool = cancel_event is not None
+    if cancel_event is None:
+        cancel_event = threading.Event()
+
+    def run_in_pool():
+        # Alt süreç ilerlemeyi Manager kuyruğuna yazar; bu thread onu sınırlı kuyruğa aktarır
+        progress_q = _manager_object("Queue") if use_pool else None
+        future = _submit_multi_zone(*run_args, progress_q, cancel_event) if progress_q is not None else None
+        if future is None:
+            return _run_multi_zone(*run_args, local_progress, cancel_event)
+        while True:
+            try:
+                put_event(progress_q.get(timeout=0.25))
+            except queue.Empty:
+                if future.done():
+                    break
+                if cancel_event.is_set():
+                    # Henüz başlamadıysa havuzdan geri çek; başladıysa alt süreç kendisi durur
+                    future.cancel()
+        while True:
+            try:
+                put_event(progress_q.get_nowait())
+            except queue.Empty:
+                break
         try:
-            optimizer = MultiZoneOptimizer(
-                zones,
-                bounds=bounds,
-                panel_scale_mm=panel_scale_mm,
-                rule_weights=rule_weights,
-                hard_rules=hard_rules,
-                use_surrogate=use_surrogate_stream,
-            )
-            
-            def progress_callback(data):
-                q.put({"type": "progress", "data": data})
+            return future.result()
+        except BrokenProcessPool:
+            _reset_pool()
+            return _run_multi_zone(*run_args, local_progress, cancel_event)
 
+    def worker():
+        try:
             # Optimizasyonu calistir
-            start_time = time.time()
-            result = optimizer.optimize_all(progress_callback=progress_callback)
-            elapsed = time.time() - start_time
+            result, elapsed = run_in_pool()
 
             # Sonuclari hazirla (mevcut mantikla ayni)
             zone_results = []
@@ -325,28 +578,76 @@ def optimize_multi_zone_stream():
                     "root_updated": result.get("root_updated", False)
                 }
             }
-            q.put({"type": "result", "data": final_data})
+            put_event({"type": "result", "data": final_data})
 
+        except OptimizationCancelled:
+            print("SSE istemcisi ayrildi, multi-zone optimizasyonu iptal edildi")
         except Exception as e:
             err_msg = str(e)
-            q.put({"type": "error", "message": err_msg})
+            put_event({"type": "error", "message": err_msg})
         finally:
-            q.put(None) # Sentinel
+            put_event(None) # Sentinel
 
-    # Thread baslat
-    t = threading.Thread(target=worker)
-    t.start()
+    # Paylaşılan thread havuzunda başlat
+    worker_future = _SSE_EXECUTOR.submit(worker)
 
     def generate():
-        while True:
-            item = q.get()
-            if item is None:
-                break
-            
-            # SSE format: data: <json_string>\n\n
-            yield f"data: {json.dumps(item)}\n\n"
+        try:
+            yield from stream_events()
+        finally:
+            # Normal bitiş veya istemci kopması (GeneratorExit): çalışan optimizasyon durdurulur
+            cancel_event.set()
 
-    return Response(stream_with_context(generate()), mimetype='text/event-stream')
+    def stream_events():
+        last_progress = {}
+        while True:
+            try:
+                item = q.get(timeout=SSE_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                if worker_future.done() and q.empty():
+                    # Worker sentinel bırakmadan çıktıysa akış askıda kalmasın
+                    exc = worker_future.exception()
+                    if exc is not None:
+                        yield f"data: {_dumps({'type': 'error', 'message': str(exc)})}\n\n"
+                    return
+                # Keep-alive yorumu: reverse proxy boştaki bağlantıyı kapatmasın
+                yield ": hb\n\n"
+                continue
+
+            # Birikmiş olayları topla; aynı stage'e ait ardışık progress'lerden yalnızca sonuncusu gider
+            batch = [item]
+            while item is not None:
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+                prev = batch[-1]
+                if (item is not None and prev is not None
+                        and item["type"] == "progress" and prev["type"] == "progress"
+                        and item["data"].get("stage") == prev["data"].get("stage")):
+                    batch[-1] = item
+                else:
+                    batch.append(item)
+
+            for event in batch:
+                if event is None:
+                    return
+                if event["type"] == "progress":
+                    # Delta: yalnızca değişen anahtarlar (birleştirme/düşürme sonrası, gönderim anında)
+                    data = event["data"]
+                    delta = {k: v for k, v in data.items() if k not in last_progress or last_progress[k] != v}
+                    if not delta:
+                        continue
+                    last_progress.update(data)
+                    event = {"type": "progress", "data": delta}
+                # SSE format: data: <json_string>\n\n
+                yield f"data: {_dumps(event)}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @bp.post("/evaluate")
@@ -356,21 +657,21 @@ def evaluate():
     ply_counts = payload.get("ply_counts", {})
 
     if not sequence:
-        return jsonify({"error": "Sequence required"}), 400
-
-    if not ply_counts:
-        ply_counts = dict(Counter(sequence))
+        return _ojson({"error": "Sequence required"}), 400
 
     try:
-        sequence = [int(x) for x in sequence]
+        sequence = parse_int_seq(sequence)
     except (ValueError, TypeError):
-        return jsonify({"error": "Invalid sequence format"}), 400
+        return _ojson({"error": "Invalid sequence format"}), 400
 
-    optimizer = LaminateOptimizer(ply_counts)
+    if not ply_counts:
+        ply_counts = _count_angles(sequence)
+
+    optimizer = _shared_optimizer(ply_counts)
     fitness_score, details = optimizer.calculate_fitness(sequence)
     fitness_score = float(fitness_score)
 
-    return jsonify(
+    return _ojson(
         {
             "sequence": sequence,
             "fitness_score": fitness_score,
@@ -381,6 +682,51 @@ def evaluate():
     )
 
 
+@bp.post("/evaluate_batch")
+def evaluate_batch():
+    """
+    Birden fazla dizilimi tek istekte skorla.
+
+    Request body: {"sequences": [[...], [...]], "ply_counts": {...}}  (ply_counts opsiyonel)
+    Her eleman /evaluate yanıtıyla aynı alanları taşır; ply_counts verilirse optimizer
+    bir kez kurulur, verilmezse her dizilimin açı sayıları kullanılır.
+    """
+    payload = request.get_json(force=True, silent=True) or {}
+    sequences = payload.get("sequences", [])
+    ply_counts = payload.get("ply_counts", {})
+
+    if not sequences or not isinstance(sequences, list):
+        return _ojson({"error": "sequences required"}), 400
+    if len(sequences) > EVALUATE_BATCH_MAX:
+        return _ojson({"error": f"En fazla {EVALUATE_BATCH_MAX} dizilim gönderilebilir"}), 400
+
+    parsed = []
+    for i, sequence in enumerate(sequences):
+        if not sequence:
+            return _ojson({"error": f"Sequence {i} bos"}), 400
+        try:
+            parsed.append(parse_int_seq(sequence))
+        except (ValueError, TypeError):
+            return _ojson({"error": f"Invalid sequence format (index {i})"}), 400
+
+    shared = _shared_optimizer(ply_counts) if ply_counts else None
+
+    results = []
+    for sequence in parsed:
+        optimizer = shared or _shared_optimizer(_count_angles(sequence))
+        fitness_score, details = optimizer.calculate_fitness(sequence)
+        fitness_score = float(fitness_score)
+        results.append({
+            "sequence": sequence,
+            "fitness_score": fitness_score,
+            "max_score": details.get("max_score", 100),
+            "penalties": details.get("rules", {}),
+            "valid": bool(fitness_score > 0),
+        })
+
+    return _ojson({"results": results})
+
+
 @bp.post("/dropoff")
 def dropoff():
     payload = request.get_json(force=True, silent=True) or {}
@@ -389,34 +735,34 @@ def dropoff():
     ply_counts = payload.get("ply_counts", {})
 
     if not master_sequence:
-        return jsonify({"error": "master_sequence required"}), 400
+        return _ojson({"error": "master_sequence required"}), 400
     if target_ply is None:
-        return jsonify({"error": "target_ply required"}), 400
+        return _ojson({"error": "target_ply required"}), 400
 
     try:
-        master_sequence = [int(x) for x in master_sequence]
+        master_sequence = parse_int_seq(master_sequence)
         target_ply = int(target_ply)
     except (ValueError, TypeError):
-        return jsonify({"error": "Invalid format"}), 400
+        return _ojson({"error": "Invalid format"}), 400
 
     if not ply_counts:
-        ply_counts = dict(Counter(master_sequence))
+        ply_counts = _count_angles(master_sequence)
     else:
-        ply_counts = {int(k): int(v) for k, v in ply_counts.items() if str(v).isdigit()}
+        ply_counts = parse_ply_counts(ply_counts)
 
     current_ply = len(master_sequence)
     if target_ply >= current_ply:
-        return jsonify({"error": "target_ply ({}) must be less than current ply count ({})".format(target_ply, current_ply)}), 400
+        return _ojson({"error": "target_ply ({}) must be less than current ply count ({})".format(target_ply, current_ply)}), 400
     if target_ply <= 0:
-        return jsonify({"error": "target_ply must be greater than 0"}), 400
+        return _ojson({"error": "target_ply must be greater than 0"}), 400
 
-    optimizer = LaminateOptimizer(ply_counts)
+    optimizer = _shared_optimizer(ply_counts)
     drop_opt = DropOffOptimizer(master_sequence, optimizer)
     new_seq, score, dropped_indices = drop_opt.optimize_drop(target_ply)
 
     fitness_score, details = optimizer.calculate_fitness(new_seq)
 
-    return jsonify(
+    return _ojson(
         {
             "sequence": new_seq,
             "fitness_score": fitness_score,
@@ -438,41 +784,41 @@ def dropoff_angle_targets():
     ply_counts = payload.get("ply_counts", {})
 
     if not master_sequence:
-        return jsonify({"error": "master_sequence required"}), 400
+        return _ojson({"error": "master_sequence required"}), 400
     if not target_ply_counts:
-        return jsonify({"error": "target_ply_counts required"}), 400
+        return _ojson({"error": "target_ply_counts required"}), 400
 
     try:
-        master_sequence = [int(x) for x in master_sequence]
-        target_ply_counts = {int(k): int(v) for k, v in target_ply_counts.items()}
+        master_sequence = parse_int_seq(master_sequence)
+        target_ply_counts = parse_int_map(target_ply_counts)
     except (ValueError, TypeError):
-        return jsonify({"error": "Invalid format"}), 400
+        return _ojson({"error": "Invalid format"}), 400
 
     if not ply_counts:
-        ply_counts = dict(Counter(master_sequence))
+        ply_counts = _count_angles(master_sequence)
     else:
-        ply_counts = {int(k): int(v) for k, v in ply_counts.items() if str(v).isdigit()}
+        ply_counts = parse_ply_counts(ply_counts)
 
-    current_ply_counts = dict(Counter(master_sequence))
+    current_ply_counts = _count_angles(master_sequence)
 
     for angle, target_count in target_ply_counts.items():
         current = current_ply_counts.get(angle, 0)
         if target_count > current:
-            return jsonify({"error": "Angle {}°: hedef {} ama mevcut sadece {} katman var".format(angle, target_count, current)}), 400
+            return _ojson({"error": "Angle {}°: hedef {} ama mevcut sadece {} katman var".format(angle, target_count, current)}), 400
 
-    optimizer = LaminateOptimizer(ply_counts)
+    optimizer = _shared_optimizer(ply_counts)
     drop_opt = DropOffOptimizer(master_sequence, optimizer)
 
     try:
         new_seq, score, dropped_by_angle = drop_opt.optimize_drop_with_angle_targets(target_ply_counts)
     except ValueError as e:
-        return jsonify({"error": str(e)}), 400
+        return _ojson({"error": str(e)}), 400
 
     fitness_score, details = optimizer.calculate_fitness(new_seq)
-    new_ply_counts = dict(Counter(new_seq))
+    new_ply_counts = _count_angles(new_seq)
     total_removed = len(master_sequence) - len(new_seq)
 
-    return jsonify(
+    return _ojson(
         {
             "sequence": new_seq,
             "fitness_score": fitness_score,
@@ -493,7 +839,7 @@ def dropoff_angle_targets():
 def auto_optimize():
     payload = request.get_json(force=True, silent=True) or {}
     ply_counts = payload.get("ply_counts", {})
-    ply_counts = {int(k): int(v) for k, v in ply_counts.items() if str(v).isdigit()} or {0: 18, 90: 18, 45: 18, -45: 18}
+    ply_counts = parse_ply_counts(ply_counts) or {0: 18, 90: 18, 45: 18, -45: 18}
 
     runs = int(payload.get("runs", 10))
     population_size = int(payload.get("population_size", 180))
@@ -507,16 +853,15 @@ def auto_optimize():
         generations = max(800, min(1500, int(total_plies * 10.0)))
 
     optimizer = LaminateOptimizer(ply_counts)
-    start_time = time.time()
+    t0 = perf_counter_ns()
     result = optimizer.auto_optimize(
         runs=runs, population_size=population_size, generations=generations, stagnation_window=stagnation_window
     )
-    elapsed = time.time() - start_time
+    elapsed = (perf_counter_ns() - t0) / 1e9
 
-    optimizer2 = LaminateOptimizer(ply_counts)
-    _, fitness_details = optimizer2.calculate_fitness(result["best_sequence"])
+    fitness_details = result["best_details"]
 
-    return jsonify(
+    return _ojson(
         {
             "master_sequence": result["best_sequence"],
             "fitness_score": fitness_details.get("total_score", result["best_fitness"]),
@@ -548,27 +893,27 @@ def init_root_zone():
     ply_counts = payload.get("ply_counts", {})
 
     if not master_sequence:
-        return jsonify({"error": "master_sequence required"}), 400
+        return _ojson({"error": "master_sequence required"}), 400
 
     try:
-        master_sequence = [int(x) for x in master_sequence]
+        master_sequence = parse_int_seq(master_sequence)
     except (ValueError, TypeError):
-        return jsonify({"error": "Invalid sequence format"}), 400
+        return _ojson({"error": "Invalid sequence format"}), 400
 
     if not ply_counts:
-        ply_counts = dict(Counter(master_sequence))
+        ply_counts = _count_angles(master_sequence)
 
     zone_manager = ZoneManager()
-    optimizer = LaminateOptimizer(ply_counts)
+    optimizer = _shared_optimizer(ply_counts)
     zone_manager.add_root_zone(master_sequence, optimizer)
     set_zone_manager(session_id, zone_manager)
 
     root_zone = zone_manager.get_zone(0)
-    return jsonify(
+    return _ojson(
         {
             "success": True,
             "zone": root_zone.to_dict() if root_zone else None,
-            "all_zones": zone_manager.get_all_zones(),
+            "all_zones": zone_manager.get_all_zones_cached(),
             "transitions": zone_manager.get_transitions(),
         }
     )
@@ -579,9 +924,9 @@ def list_zones():
     session_id = request.args.get("session_id", "default")
     zm = get_zone_manager(session_id)
     if not zm:
-        return jsonify({"zones": [], "transitions": [], "message": "No zones found. Initialize root zone first."})
+        return _ojson({"zones": [], "transitions": [], "message": "No zones found. Initialize root zone first."})
 
-    return jsonify({"zones": zm.get_all_zones(), "transitions": zm.get_transitions()})
+    return _ojson({"zones": zm.get_all_zones_cached(), "transitions": zm.get_transitions()})
 
 
 @bp.get("/zones/<int:zone_id>")
@@ -589,11 +934,11 @@ def get_zone(zone_id: int):
     session_id = request.args.get("session_id", "default")
     zm = get_zone_manager(session_id)
     if not zm:
-        return jsonify({"error": "Session not found"}), 404
+        return _ojson({"error": "Session not found"}), 404
     zone = zm.get_zone(zone_id)
     if not zone:
-        return jsonify({"error": "Zone {} not found".format(zone_id)}), 404
-    return jsonify({"zone": zone.to_dict(), "transitions": zm.get_transitions()})
+        return _ojson({"error": "Zone {} not found".format(zone_id)}), 404
+    return _ojson({"zone": zone.to_dict(), "transitions": zm.get_transitions()})
 
 
 @bp.post("/zones/create_from_dropoff")
@@ -605,29 +950,29 @@ def create_zone_from_dropoff():
     ply_counts = payload.get("ply_counts", {})
 
     if source_zone_id is None:
-        return jsonify({"error": "source_zone_id required"}), 400
+        return _ojson({"error": "source_zone_id required"}), 400
     if target_ply is None:
-        return jsonify({"error": "target_ply required"}), 400
+        return _ojson({"error": "target_ply required"}), 400
 
     zm = get_zone_manager(session_id)
     if not zm:
-        return jsonify({"error": "Session not found. Create root zone first."}), 400
+        return _ojson({"error": "Session not found. Create root zone first."}), 400
 
     source_zone = zm.get_zone(source_zone_id)
     if not source_zone:
-        return jsonify({"error": "Source zone {} not found".format(source_zone_id)}), 404
+        return _ojson({"error": "Source zone {} not found".format(source_zone_id)}), 404
 
     if not ply_counts:
-        ply_counts = dict(Counter(source_zone.sequence))
+        ply_counts = source_zone.ply_counts()
 
-    optimizer = LaminateOptimizer(ply_counts)
+    optimizer = _shared_optimizer(ply_counts)
     drop_optimizer = DropOffOptimizer(source_zone.sequence, optimizer)
 
     try:
         new_zone = zm.create_zone_from_dropoff(source_zone_id, int(target_ply), optimizer, drop_optimizer)
-        return jsonify({"success": True, "zone": new_zone.to_dict(), "transitions": zm.get_transitions()})
+        return _ojson({"success": True, "zone": new_zone.to_dict(), "transitions": zm.get_transitions()})
     except Exception as e:
-        return jsonify({"error": str(e)}), 400
+        return _ojson({"error": str(e)}), 400
 
 
 @bp.post("/zones/create_from_angle_dropoff")
@@ -639,36 +984,36 @@ def create_zone_from_angle_dropoff():
     ply_counts = payload.get("ply_counts", {})
 
     if source_zone_id is None:
-        return jsonify({"error": "source_zone_id required"}), 400
+        return _ojson({"error": "source_zone_id required"}), 400
     if not target_ply_counts:
-        return jsonify({"error": "target_ply_counts required"}), 400
+        return _ojson({"error": "target_ply_counts required"}), 400
 
     zm = get_zone_manager(session_id)
     if not zm:
-        return jsonify({"error": "Session not found. Create root zone first."}), 400
+        return _ojson({"error": "Session not found. Create root zone first."}), 400
 
     source_zone = zm.get_zone(source_zone_id)
     if not source_zone:
-        return jsonify({"error": "Source zone {} not found".format(source_zone_id)}), 404
+        return _ojson({"error": "Source zone {} not found".format(source_zone_id)}), 404
 
     if not ply_counts:
-        ply_counts = dict(Counter(source_zone.sequence))
+        ply_counts = source_zone.ply_counts()
 
     try:
-        target_ply_counts = {int(k): int(v) for k, v in target_ply_counts.items()}
+        target_ply_counts = parse_int_map(target_ply_counts)
     except (ValueError, TypeError):
-        return jsonify({"error": "Invalid target_ply_counts format"}), 400
+        return _ojson({"error": "Invalid target_ply_counts format"}), 400
 
-    optimizer = LaminateOptimizer(ply_counts)
+    optimizer = _shared_optimizer(ply_counts)
     drop_optimizer = DropOffOptimizer(source_zone.sequence, optimizer)
 
     try:
         new_zone = zm.create_zone_from_angle_dropoff(source_zone_id, target_ply_counts, optimizer, drop_optimizer)
-        return jsonify(
-            {"success": True, "zone": new_zone.to_dict(), "zones": zm.get_all_zones(), "transitions": zm.get_transitions()}
+        return _ojson(
+            {"success": True, "zone": new_zone.to_dict(), "zones": zm.get_all_zones_cached(), "transitions": zm.get_transitions()}
         )
     except Exception as e:
-        return jsonify({"error": str(e)}), 400
+        return _ojson({"error": str(e)}), 400
 
 
 @bp.post("/zones/create_from_merge")
@@ -680,31 +1025,31 @@ def create_zone_from_merge():
     ply_counts = payload.get("ply_counts", {})
 
     if not source_zone_ids:
-        return jsonify({"error": "source_zone_ids required"}), 400
+        return _ojson({"error": "source_zone_ids required"}), 400
 
     zm = get_zone_manager(session_id)
     if not zm:
-        return jsonify({"error": "Session not found. Create root zone first."}), 400
+        return _ojson({"error": "Session not found. Create root zone first."}), 400
 
     for zid in source_zone_ids:
         if not zm.get_zone(zid):
-            return jsonify({"error": "Source zone {} not found".format(zid)}), 404
+            return _ojson({"error": "Source zone {} not found".format(zid)}), 404
 
     if not ply_counts and source_zone_ids:
         first_zone = zm.get_zone(source_zone_ids[0])
         if first_zone:
-            ply_counts = dict(Counter(first_zone.sequence))
+            ply_counts = first_zone.ply_counts()
 
-    optimizer = LaminateOptimizer(ply_counts)
+    optimizer = _shared_optimizer(ply_counts)
 
     try:
         if target_ply is None:
             max_ply = max([zm.get_zone(zid).ply_count for zid in source_zone_ids])
             target_ply = max_ply
         new_zone = zm.create_zone_from_merge(source_zone_ids, int(target_ply), optimizer)
-        return jsonify({"success": True, "zone": new_zone.to_dict(), "zones": zm.get_all_zones(), "transitions": zm.get_transitions()})
+        return _ojson({"success": True, "zone": new_zone.to_dict(), "zones": zm.get_all_zones_cached(), "transitions": zm.get_transitions()})
     except Exception as e:
-        return jsonify({"error": str(e)}), 400
+        return _ojson({"error": str(e)}), 400
 
 
 @bp.post("/zones/add_from_dropoff")
@@ -718,24 +1063,24 @@ def add_zone_from_dropoff():
     dropped_indices = payload.get("dropped_indices", [])
 
     if not sequence:
-        return jsonify({"error": "sequence required"}), 400
+        return _ojson({"error": "sequence required"}), 400
     if ply_count is None:
         ply_count = len(sequence)
     if source_zone_id is None:
-        return jsonify({"error": "source_zone_id required"}), 400
+        return _ojson({"error": "source_zone_id required"}), 400
 
     zm = get_zone_manager(session_id)
     if not zm:
-        return jsonify({"error": "Session not found. Create root zone first."}), 400
+        return _ojson({"error": "Session not found. Create root zone first."}), 400
 
     source_zone = zm.get_zone(source_zone_id)
     if not source_zone:
-        return jsonify({"error": "Source zone {} not found".format(source_zone_id)}), 404
+        return _ojson({"error": "Source zone {} not found".format(source_zone_id)}), 404
 
     try:
-        sequence = [int(x) for x in sequence]
+        sequence = parse_int_seq(sequence)
     except (ValueError, TypeError):
-        return jsonify({"error": "Invalid sequence format"}), 400
+        return _ojson({"error": "Invalid sequence format"}), 400
 
     zone_id = zm.next_zone_id
     zm.next_zone_id += 1
@@ -745,18 +1090,18 @@ def add_zone_from_dropoff():
     new_zone.source_zones = [source_zone_id]
     new_zone.transition_type = "drop_off"
 
-    zm.zones[zone_id] = new_zone
-    zm.transitions.append(
+    zm.add_zone(
+        new_zone,
         {
             "from": source_zone_id,
             "to": zone_id,
             "type": "drop_off",
             "target_ply": int(ply_count),
             "dropped_indices": dropped_indices,
-        }
+        },
     )
 
-    return jsonify({"success": True, "zone": new_zone.to_dict(), "zones": zm.get_all_zones(), "transitions": zm.get_transitions()})
+    return _ojson({"success": True, "zone": new_zone.to_dict(), "zones": zm.get_all_zones_cached(), "transitions": zm.get_transitions()})
 
 
 # -----------------------------------------------------------------------------
@@ -767,31 +1112,31 @@ def add_zone_from_dropoff():
 @bp.post("/ml/train")
 def ml_train():
     """Surrogate model egit. Uzun surebilir (1-5 dakika)."""
-    if not _ml_available:
-        return jsonify({"error": "ML modulu yuklu degil. scikit-learn ve joblib kurun."}), 500
+    if not _ensure_ml_loaded():
+        return _ojson({"error": "ML modulu yuklu degil. scikit-learn ve joblib kurun."}), 500
 
     payload = request.get_json(force=True, silent=True) or {}
     n_samples = int(payload.get("n_samples", 50000))
 
     try:
         result = train_surrogate(n_samples=n_samples)
-        return jsonify({"success": True, **result})
+        return _ojson({"success": True, **result})
     except Exception as e:
-        return jsonify({"error": f"Egitim hatasi: {str(e)}"}), 500
+        return _ojson({"error": f"Egitim hatasi: {str(e)}"}), 500
 
 
 @bp.get("/ml/status")
 def ml_status():
     """Surrogate model durumunu sorgula."""
-    if not _ml_available:
-        return jsonify({
+    if not _ensure_ml_loaded():
+        return _ojson({
             "ml_available": False,
             "model_exists": False,
             "message": "ML modulu yuklu degil. scikit-learn ve joblib kurun."
         })
 
     status = get_model_status()
-    return jsonify({
+    return _ojson({
         "ml_available": True,
         **status,
     })
@@ -808,7 +1153,7 @@ def generate_pdf_report():
     try:
         from ..reports.pdf_generator import generate_optimization_report
     except ImportError:
-        return jsonify({"error": "PDF modulu yuklu degil. reportlab kurun."}), 500
+        return _ojson({"error": "PDF modulu yuklu degil. reportlab kurun."}), 500
 
     payload = request.get_json(force=True, silent=True) or {}
 
@@ -819,25 +1164,42 @@ def generate_pdf_report():
     revision = payload.get("revision", "Rev. 1")
 
     if not zones:
-        return jsonify({"error": "En az 1 zone sonucu gerekli"}), 400
+        return _ojson({"error": "En az 1 zone sonucu gerekli"}), 400
 
+    # Küçük raporlar bellekte kalır, büyükler diske taşar; yanıt parça parça okunarak gönderilir
+    pdf_file = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES)
     try:
-        pdf_bytes = generate_optimization_report(
+        generate_optimization_report(
             zones=zones,
             optimization_params=optimization_params,
             engineer_name=engineer_name,
             project_name=project_name,
             revision=revision,
+            output=pdf_file,
         )
-
-        return Response(
-            pdf_bytes,
-            mimetype="application/pdf",
-            headers={
-                "Content-Disposition": "attachment; filename=optimizasyon_raporu.pdf",
-                "Content-Length": str(len(pdf_bytes)),
-            },
-        )
+        size = pdf_file.tell()
     except Exception as e:
-        return jsonify({"error": f"PDF olusturma hatasi: {str(e)}"}), 500
+        pdf_file.close()
+        return _ojson({"error": f"PDF olusturma hatasi: {str(e)}"}), 500
+
+    def chunks():
+        try:
+            pdf_file.seek(0)
+            while True:
+                chunk = pdf_file.read(PDF_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            pdf_file.close()
+
+    return Response(
+        chunks(),
+        mimetype="application/pdf",
+        headers={
+            "Content-Disposition": "attachment; filename=optimizasyon_raporu.pdf",
+            # Boyut build sonrası bilinir; indirme ilerlemesi için gönderilmeye devam eder
+            "Content-Length": str(size),
+        },
+    )
 
@@ -2,14 +2,18 @@ import os
 
 from flask import Flask
 
+# Yollar import sırasında bir kez hesaplanır; create_app() tekrar çağrıldığında (testler) yeniden hesaplanmaz
+_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+_STATIC_FOLDER = os.path.join(_ROOT_DIR, "static")
+_TEMPLATE_FOLDER = os.path.join(_ROOT_DIR, "templates")
+
 
 def create_app() -> Flask:
-    root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
     app = Flask(
         __name__,
-        static_folder=os.path.join(root_dir, "static"),
+        static_folder=_STATIC_FOLDER,
         static_url_path="/static",
-        template_folder=os.path.join(root_dir, "templates"),
+        template_folder=_TEMPLATE_FOLDER,
     )
 
     from .api.routes import bp
@@ -17,3 +21,38 @@ def create_app() -> Flask:
     app.register_blueprint(bp)
     return app
 
+
+def serve(app: Flask, port: int = 5000, open_browser: bool = False) -> None:
+    """Yerel sunucuyu başlat (app.py / main.py giriş noktaları).
+
+    TUSAS_DEV=1 -> Flask geliştirme sunucusu (debug); aksi halde waitress (çok thread'li
+    WSGI), kurulu değilse Flask'ın thread'li sunucusu.
+    """
+    url = "http://127.0.0.1:{}".format(port)
+    print("\n  Tarayicida acin: {}".format(url))
+    print("  (https DEGIL, http kullanin - sunucu acik kalmali.)\n")
+    if open_browser:
+        import threading
+        import time
+        import webbrowser
+
+        def _open_browser():
+            time.sleep(1.2)
+            webbrowser.open(url + "/")
+
+        threading.Thread(target=_open_browser, daemon=True).start()
+
+    if os.environ.get("TUSAS_DEV"):
+        # Reloader uygulamayı iki kez import eder (çift başlangıç maliyeti + iki tarayıcı
+        # sekmesi); yalnızca TUSAS_RELOAD=1 ile aç
+        app.run(host="0.0.0.0", port=port, debug=True,
+                use_reloader=os.environ.get("TUSAS_RELOAD") == "1")
+        return
+
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        print("  waitress kurulu degil (pip install waitress); Flask sunucusu kullaniliyor.")
+        app.run(host="0.0.0.0", port=port, debug=False, threaded=True)
+    else:
+        waitress_serve(app, host="0.0.0.0", port=port, threads=8)
@@ -1,4 +1,5 @@
-import random
+import bisect
+import math
 from typing import Dict, List, Tuple, Optional
 
 import numpy as np
@@ -12,13 +13,39 @@ class DropOffOptimizer:
     """
 
     MAX_CONSECUTIVE_DROPS = 2
+    # calculate_fitness_batch toplamı kural başına ±0.01 sapabilir (8 kural); kesin
+    # skorla yeniden değerlendirilecek adayların batch maksimumuna uzaklık sınırı
+    BATCH_SCORE_TOLERANCE = 0.1
+    ANGLE_HIST_OFFSET = 90  # Açı histogramında negatif açıları kaydırma miktarı (en az)
+    SPACING_NUMPY_MIN = 8  # Bu boyutun altında aralık istatistikleri saf Python (dispatch maliyeti yok)
+    FIT_CACHE_LIMIT = 20000  # Drop-seviyesi önbellek bu boyuta ulaşınca temizlenir
+    ANGLE_TARGET_EARLY_STOP_BLOCKS = 4  # Açı hedefli denemeler bu kadar bloğa bölünür (erken durma)
+    # Drop sonrası kuralların korunması gereken minimum skor oranları (R1-R8)
+    MIN_RULE_RATIOS = {
+        "R1": 0.85,  # Symmetry - %85 minimum
+        "R2": 0.80,  # Balance - %80 minimum
+        "R3": 0.80,  # Percentage - %80 minimum
+        "R4": 0.75,  # External plies - %75 minimum
+        "R5": 0.70,  # Distribution - %70 minimum
+        "R6": 0.75,  # Grouping - %75 minimum (önemli!)
+        "R7": 0.75,  # Buckling - %75 minimum
+        "R8": 0.85,  # Lateral bending - %85 minimum
+    }
     DEFAULT_HARD_RULES = {
         "max_two_consecutive_drops": True,
         "adjacent_0_90": True,
     }
 
-    def __init__(self, master_sequence: List[int], base_optimizer: LaminateOptimizer, hard_rules: Optional[Dict[str, bool]] = None):
+    def __init__(self, master_sequence: List[int], base_optimizer: LaminateOptimizer,
+                 hard_rules: Optional[Dict[str, bool]] = None, rng: Optional[np.random.Generator] = None):
         self.master_sequence = master_sequence
+        # Örneğe özel RNG: verilmezse base optimizer'ın RNG'sinden tohumlanır (seed'li
+        # LaminateOptimizer ile drop-off sonuçları da tekrarlanabilir)
+        if rng is None:
+            base_rng = getattr(base_optimizer, "rng", None)
+            seed = int(base_rng.integers(2 ** 63)) if base_rng is not None else None
+            rng = np.random.default_rng(seed)
+        self.rng = rng
         self.base_opt = base_optimizer
         self.total_plies = len(master_sequence)
         self.hard_rules = dict(self.DEFAULT_HARD_RULES)
@@ -30,10 +57,219 @@ class DropOffOptimizer:
             for key, value in hard_rules.items():
                 if key in self.hard_rules:
                     self.hard_rules[key] = bool(value)
+        # Aday dizilim tuple'ı -> fitness skoru / optimize_drop seçim metrikleri.
+        # Rastgele örnekleme aynı temp_seq'i sık üretir; details dict'leri tutulmaz.
+        self._fit_cache = {}  # type: Dict[Tuple[int, ...], float]
+        self._drop_eval_cache = {}  # type: Dict[Tuple[int, ...], Optional[Tuple[float, int, int, int, float, float, float]]]
+        # _draw_drop_samples permütasyon tamponu (şekil değişince yeniden ayrılır)
+        self._order_scratch = None  # type: Optional[np.ndarray]
+        # MIN_RULE_RATIOS, base optimizer'ın R1..R8 sırasıyla (kural ihlali sayımı tek karşılaştırma)
+        self._min_ratio_vec = np.array(
+            [self.MIN_RULE_RATIOS.get(k, 0.0) for k in base_optimizer.RULE_KEYS], dtype=np.float64
+        )
+
+    @property
+    def master_sequence(self) -> List[int]:
+        return self._master_sequence
+
+    @master_sequence.setter
+    def master_sequence(self, sequence: List[int]) -> None:
+        # Drop maskeleri ve açı sayımları için NumPy kopyaları (int16: standart dışı açılar da sığar)
+        self._master_sequence = sequence
+        self._master_arr = np.asarray(sequence, dtype=np.int16)
+        self._angle_positions = None  # type: Optional[Dict[int, np.ndarray]]
+        # Açı histogramı: indeks = açı + _hist_offset (-90..90 -> 0..180; daha negatif açı varsa genişler)
+        self._hist_offset = max(self.ANGLE_HIST_OFFSET, -int(self._master_arr.min()) if self._master_arr.size else 0)
+        self._angle_hist = np.bincount(
+            self._master_arr.astype(np.int64) + self._hist_offset, minlength=2 * self._hist_offset + 1
+        )
+
+    def _positions_by_angle(self) -> Dict[int, np.ndarray]:
+        """
+        Açı -> master'daki artan pozisyonlar; tek kararlı argsort ile tüm açılar birlikte.
+        Master değişene kadar önbellekte tutulur.
+        """
+        if self._angle_positions is None:
+            order = np.argsort(self._master_arr, kind="stable")
+            sorted_angles = self._master_arr[order]
+            split_points = np.flatnonzero(np.diff(sorted_angles)) + 1
+            groups = np.split(order, split_points)
+            starts = np.r_[0, split_points] if order.size else np.empty(0, dtype=np.intp)
+            self._angle_positions = dict(zip(sorted_angles[starts].tolist(), groups))
+        return self._angle_positions
+
+    def _master_angle_counts(self, angles: List[int]) -> np.ndarray:
+        """Verilen açıların master'daki katman sayıları (histogram aralığı dışı açılar 0)."""
+        idx = np.asarray(angles, dtype=np.int64) + self._hist_offset
+        in_range = (idx >= 0) & (idx < self._angle_hist.size)
+        counts = np.zeros(idx.size, dtype=np.int64)
+        counts[in_range] = self._angle_hist[idx[in_range]]
+        return counts
+
+    def _drop_from_master(self, drop_indices: List[int]) -> List[int]:
+        """Master dizilimden verilen indeksleri boolean maske ile çıkar."""
+        mask = np.ones(self.total_plies, dtype=bool)
+        mask[drop_indices] = False
+        return self._master_arr[mask].tolist()
+
+    @classmethod
+    def _spacing_stats(cls, spacings: List[int]) -> Tuple[float, float]:
+        """Drop aralıklarının (ortalama, popülasyon std) değeri; np.mean/np.std ile aynı."""
+        k = len(spacings)
+        if k >= cls.SPACING_NUMPY_MIN:
+            arr = np.asarray(spacings)
+            return float(arr.mean()), float(arr.std())
+        mean = sum(spacings) / k
+        var = sum((d - mean) ** 2 for d in spacings) / k
+        return mean, math.sqrt(var)
 
     def _hard_rule_enabled(self, key: str) -> bool:
         return bool(self.hard_rules.get(key, self.DEFAULT_HARD_RULES.get(key, True)))
 
+    def clear_fit_cache(self) -> None:
+        """Drop-seviyesi fitness önbelleklerini temizle."""
+        self._fit_cache.clear()
+        self._drop_eval_cache.clear()
+
+    def _cached_fitness(self, seq) -> float:
+        """Sadece skor gereken çağrılar için önbellekli calculate_fitness."""
+        key = tuple(seq)  # tuple girdide kopya yok (aynı nesne döner)
+        score = self._fit_cache.get(key)
+        if score is None:
+            score, _ = self.base_opt.calculate_fitness(list(key))
+            if len(self._fit_cache) >= self.FIT_CACHE_LIMIT:
+                self._fit_cache.clear()
+            self._fit_cache[key] = score
+        return score
+
+    def _cached_drop_eval(self, seq):
+        """
+        optimize_drop için aday değerlendirmesi (önbellekli).
+
+        Returns:
+            None (hard constraint ihlali) ya da
+            (total_score, groups_of_3, groups_of_4_or_more, rule_violations,
+             r6_penalty, r1_r8_penalty, total_penalty)
+        """
+        key = tuple(seq)
+        if key in self._drop_eval_cache:
+            return self._drop_eval_cache[key]
+
+        result = None
+        temp_seq = list(key)
+        # details dict'i kurulmaz: R1..R8 skor/ceza dizileri doğrudan kullanılır
+        hard, scores, penalties, weights = self.base_opt._compute_rule_arrays(temp_seq)
+        if hard is None:
+            total_score = float(sum(scores.tolist()))
+        else:
+            total_score = 0.0
+        if total_score > 0:
+            groups_of_3, groups_of_4_or_more = self._group_counts(temp_seq)
+            ratios = np.divide(scores, weights, out=np.zeros_like(scores), where=weights > 0)
+            rule_violations = int((ratios < self._min_ratio_vec).sum())
+            penalty_list = penalties.tolist()
+            result = (
+                total_score,
+                groups_of_3,
+                groups_of_4_or_more,
+                rule_violations,
+                penalty_list[5],  # R6
+                penalty_list[0] + penalty_list[7],  # R1 + R8
+                sum(penalty_list),
+            )
+
+        if len(self._drop_eval_cache) >= self.FIT_CACHE_LIMIT:
+            self._drop_eval_cache.clear()
+        self._drop_eval_cache[key] = result
+        return result
+
+    def _group_counts(self, seq: List[int]) -> Tuple[int, int]:
+        """
+        (3'lü grup sayısı, 4+ grup sayısı) — base optimizer'ın önbellekli RLE profilinden.
+        calculate_fitness (Rule 6) aynı profili zaten hesapladığından ek tarama yapılmaz.
+        """
+        gstats = self.base_opt._grouping_stats(seq)
+        return gstats["groups_len_3"], gstats["groups_len_ge4"]
+
+    def _best_single_drops(
+        self,
+        seq: List[int],
+        pos_map: List[int],
+        dropped_by_angle: Dict[int, List[int]],
+        angles: List[int],
+    ) -> Optional[Tuple[Tuple[int, ...], float]]:
+        """
+        Tek sayılı delta kalan açılar için birlikte kaldırılacak tekil ply pozisyonları.
+
+        Her açı için dış 2 katman hariç bir pozisyon seçilir; tüm kombinasyonlar
+        (itertools.product sırasıyla) tek bir (M, n - k) matrisinde calculate_fitness_batch
+        ile skorlanır. Batch skoru kesin skordan sapabildiğinden yalnızca batch maksimumuna
+        BATCH_SCORE_TOLERANCE içinde kalanlar kesin fitness ile yeniden skorlanır; seçim
+        (eşitlikte ilk kombinasyon) kesin skora göredir.
+
+        Returns:
+            None (geçerli kombinasyon yok) ya da (seq üzerindeki pozisyonlar, kesin skor)
+        """
+        from itertools import product
+
+        n = len(seq)
+        pos_lists = [[i for i in range(2, n - 2) if seq[i] == ang] for ang in angles]
+        prior_drops = self._flatten_dropped_by_angle(dropped_by_angle)
+        combos = []
+        for combo in product(*pos_lists):
+            if len(set(combo)) != len(combo):
+                continue  # Aynı pozisyon birden fazla açı için seçilmişse atla
+            if self._has_excessive_drop_run(prior_drops + [pos_map[pos] for pos in combo]):
+                continue
+            combos.append(combo)
+        if not combos:
+            return None
+
+        combo_arr = np.array(combos, dtype=np.intp)
+        m = combo_arr.shape[0]
+        keep = np.ones((m, n), dtype=bool)
+        keep[np.arange(m)[:, None], combo_arr] = False
+        seq_arr = np.asarray(seq, dtype=np.int16)
+        candidates = np.broadcast_to(seq_arr, keep.shape)[keep].reshape(m, -1)
+        batch_scores = self.base_opt.calculate_fitness_batch(candidates)
+        near_best = np.flatnonzero(batch_scores >= batch_scores.max() - self.BATCH_SCORE_TOLERANCE)
+
+        best_combo = None
+        best_score = -1.0
+        for row in near_best.tolist():
+            temp, _ = self._normalize_sequence_after_drop(candidates[row].tolist())
+            sc = self._cached_fitness(temp)
+            if sc > best_score:
+                best_score = sc
+                best_combo = combos[row]
+        return best_combo, best_score
+
+    @staticmethod
+    def _symmetric_pair_positions(seq: List[int]) -> Dict[int, List[int]]:
+        """Sol yarıda aynası aynı açıda olan pozisyonlar, açıya göre (artan sırada)."""
+        n = len(seq)
+        positions = {}  # type: Dict[int, List[int]]
+        for left_idx in range(n // 2):
+            ang = seq[left_idx]
+            if seq[n - 1 - left_idx] == ang:
+                positions.setdefault(ang, []).append(left_idx)
+        return positions
+
+    @staticmethod
+    def _drop_symmetric_pair_position(positions: Dict[int, List[int]], ang: int, left_idx: int) -> Dict[int, List[int]]:
+        """
+        Simetrik çift (left_idx, n-1-left_idx) düşünce pozisyon listelerini yamala.
+
+        Kalan elemanların ayna eşleşmeleri korunur; sadece left_idx'ten büyük sol
+        indeksler bir kayar.
+        """
+        patched = {}  # type: Dict[int, List[int]]
+        for a, idxs in positions.items():
+            if a == ang:
+                idxs = [i for i in idxs if i != left_idx]
+            patched[a] = [i - 1 if i > left_idx else i for i in idxs]
+        return patched
+
     @staticmethod
     def _flatten_dropped_by_angle(dropped_by_angle: Dict[int, List[int]]) -> List[int]:
         flat = []
@@ -82,6 +318,371 @@ class DropOffOptimizer:
 
         return normalized_seq, normalized_pos
 
+    def _draw_drop_samples(
+        self,
+        search_arr: np.ndarray,
+        pairs_to_remove: int,
+        break_pair_for_middle: bool,
+        drop_middle: bool,
+        middle_idx: Optional[int],
+        attempts: int,
+    ) -> List[Tuple[List[int], Optional[int], Tuple[int, int, int, int, int]]]:
+        """
+        optimize_drop denemelerinin tüm rastgele çekilişleri tek seferde + açı kontrolleri.
+
+        Her satır search_arr'ın bağımsız bir permütasyonudur; (varsa) ilk eleman kırılacak
+        çift, sonraki k eleman çift drop pozisyonları — break_pair_idx'i hariç tutmak için
+        deneme başına liste/maske kurulmaz. Sadece tamsayı sayımlarına dayanan açı
+        çeşitliliği/dengesi kontrolleri tüm denemelere vektörel uygulanır; yalnızca geçen
+        denemeler döner.
+
+        Returns:
+            [(sıralı sol yarı drop pozisyonları, kırılacak çift pozisyonu veya None,
+              (angle_diversity, count_45, count_minus45, count_0, count_90)), ...]
+        """
+        n = search_arr.size
+        if break_pair_for_middle and n == 0:
+            return []
+        # Permütasyonlar yeniden kullanılan (attempts, n) tampon üzerinde yerinde karıştırılır;
+        # optimize_drop_multi'nin ardışık seviyelerinde np.tile ile yeni dizi kurulmaz
+        orders = self._order_scratch
+        if orders is None or orders.shape != (attempts, n):
+            orders = self._order_scratch = np.empty((attempts, n), dtype=np.intp)
+        orders[:] = np.arange(n)
+        self.rng.permuted(orders, axis=1, out=orders)
+
+        offset = 0
+        breaks = None
+        if break_pair_for_middle:
+            # Ortaya yakın bir pozisyon seç (sol yarının sonlarından)
+            # Bu pozisyondaki ply ortaya geçecek, mirror'ı drop edilecek
+            breaks = search_arr[orders[:, 0]]
+            offset = 1
+
+        sample_size = min(pairs_to_remove, n - offset) if pairs_to_remove > 0 else 0
+        lefts = np.sort(search_arr[orders[:, offset:offset + sample_size]], axis=1)
+
+        # ✅ 3. MULTI-ANGLE CHECK - Drop edilen açılar (sol yarı + orta ply + kırılan çiftin mirror'ı)
+        columns = [self._master_arr[lefts]]
+        if drop_middle and middle_idx is not None:
+            columns.append(np.full((attempts, 1), self._master_arr[middle_idx]))
+        if breaks is not None:
+            # Kırılan çiftin mirror'ını da ekle (sağ yarıdaki drop edilen)
+            columns.append(self._master_arr[self.total_plies - 1 - breaks][:, None])
+        dropped = np.concatenate(columns, axis=1)
+        total_drops = dropped.shape[1]
+
+        count_45 = (dropped == 45).sum(axis=1)
+        count_minus45 = (dropped == -45).sum(axis=1)
+        count_0 = (dropped == 0).sum(axis=1)
+        count_90 = (dropped == 90).sum(axis=1)
+        if total_drops > 0:
+            dropped_sorted = np.sort(dropped, axis=1)
+            angle_diversity = 1 + (np.diff(dropped_sorted, axis=1) != 0).sum(axis=1)
+        else:
+            angle_diversity = np.zeros(attempts, dtype=np.intp)
+
+        ok = np.ones(attempts, dtype=bool)
+        # Eğer sadece bir açıdan drop varsa ve toplam drop sayısı 2'den fazlaysa, reddet
+        # Bu, 0°, 90°, 45°, -45° tüm açılar için geçerli
+        # Özellikle 0°'dan da drop yapılabilmeli, ama tek başına olmamalı
+        if total_drops > 2:
+            ok &= angle_diversity != 1
+
+        # ✅ 4. BALANCE CHECK (45°/-45° alternasyon + tüm açılar için denge)
+        # 90°'dan aşırı drop yapılmasını engelle (en fazla 3 çift = 6 ply)
+        ok &= count_90 <= 3
+        # 45°/-45° düşüşünü teşvik et: 4+ drop varsa en az bir 45° veya -45° olmalı
+        if total_drops >= 4:
+            ok &= (count_45 > 0) | (count_minus45 > 0)
+        # 45°/-45° dengesi: ikisi de varsa sayıları yakın olmalı (fark ≤ 2);
+        # sadece biri varsa 2'den fazla olmamalı
+        both = (count_45 > 0) & (count_minus45 > 0)
+        ok &= ~(both & (np.abs(count_45 - count_minus45) > 2))
+        ok &= ~(~both & ((count_45 > 2) | (count_minus45 > 2)))
+
+        keep = np.flatnonzero(ok)
+        stats = np.stack([angle_diversity, count_45, count_minus45, count_0, count_90], axis=1)[keep]
+        kept_breaks = breaks[keep].tolist() if breaks is not None else [None] * keep.size
+        return list(zip(lefts[keep].tolist(), kept_breaks, map(tuple, stats.tolist())))
+
+    @staticmethod
+    def _unique_rows(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (benzersiz satırlar, satır -> benzersiz indeks) — np.unique(axis=0) karşılığı.
+
+        Her satır tek bir void (ham bayt) eleman olarak görülür; axis=0 yolunun yapısal
+        dtype karşılaştırmalarından çok daha hızlıdır. Benzersiz satırların sırası bayt
+        sırasıdır (skorlar inverse ile geri dağıtıldığından önemsizdir).
+        """
+        rows = np.ascontiguousarray(rows)
+        as_void = rows.view(np.dtype((np.void, rows.dtype.itemsize * rows.shape[1]))).reshape(-1)
+        _, first, inverse = np.unique(as_void, return_index=True, return_inverse=True)
+        return rows[first], inverse.reshape(-1)
+
+    @staticmethod
+    def _has_run_of_batch(rows: np.ndarray, size: int) -> np.ndarray:
+        """(M, L) dizilimlerde en az `size` uzunlukta aynı açı run'ı olan satırlar."""
+        m, length = rows.shape
+        if size <= 1:
+            return np.full(m, length > 0, dtype=bool)
+        if length < size:
+            return np.zeros(m, dtype=bool)
+        eq = rows[:, 1:] == rows[:, :-1]
+        # size-1 ardışık eşitlik = size uzunlukta run
+        run = eq[:, :length - size + 1].copy()
+        for shift in range(1, size - 1):
+            run &= eq[:, shift:length - size + 1 + shift]
+        return run.any(axis=1)
+
+    @staticmethod
+    def _group_counts_batch(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Eşit uzunluklu (M, L) dizilimler için (3'lü grup sayıları, 4+ grup sayıları).
+
+        Run sınırları tek düzleştirilmiş maskede bulunur; ardışık sınırlar arası farklar
+        (aynı satırdakiler) run uzunluklarıdır. _group_counts ile aynı tanım.
+        """
+        m, length = rows.shape
+        g3 = np.zeros(m, dtype=np.int64)
+        g4 = np.zeros(m, dtype=np.int64)
+        if m == 0 or length == 0:
+            return g3, g4
+        bounds = np.ones((m, length + 1), dtype=bool)
+        bounds[:, 1:length] = rows[:, 1:] != rows[:, :-1]
+        flat = np.flatnonzero(bounds)
+        row_of = flat // (length + 1)
+        same_row = row_of[1:] == row_of[:-1]
+        run_lens = np.diff(flat)[same_row]
+        run_rows = row_of[1:][same_row]
+        g3 += np.bincount(run_rows[run_lens == 3], minlength=m)
+        g4 += np.bincount(run_rows[run_lens >= 4], minlength=m)
+        return g3, g4
+
+    def _draw_angle_target_attempts(
+        self,
+        attempts: int,
+        drops_needed: Dict[int, int],
+        left_pools: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]],
+        middle_idx: Optional[int],
+        break_pool: Optional[np.ndarray],
+        single_pools: List[np.ndarray],
+    ) -> np.ndarray:
+        """
+        optimize_drop_with_angle_targets denemelerinin tüm çekilişleri tek seferde.
+
+        Her açı için drops_needed // 2 sol yarı pozisyonu seçilir (%70 ihtimalle önce
+        gruplanmış pozisyonlardan); aynaları, (varsa) orta ply, kırılan çiftin aynası ve
+        asimetrik tek-ply drop'lar eklenir. Çekilişler satır bazlı permütasyon / rastgele
+        anahtarlarla vektöreldir; ardışık sol yarı drop'u olan veya tek-ply için boş
+        pozisyon kalmayan denemeler elenir. Havuz kapasiteleri (her açı için en az
+        drops_needed // 2 sol yarı pozisyonu, boş olmayan tek-ply havuzları) çağıran
+        tarafından önceden doğrulanır.
+
+        Returns:
+            Geçerli denemelerin (M, total_plies) bool drop maskesi (deneme sırasıyla)
+        """
+        n = self.total_plies
+        rng = self.rng
+        rows = np.arange(attempts)
+        left_mask = np.zeros((attempts, n), dtype=bool)
+        if attempts == 0:
+            return left_mask
+
+        # %70 ihtimalle gruplanmış pozisyonları tercih et (grouping kırma stratejisi)
+        prefer_grouped = rng.random(attempts) < 0.70
+
+        def sample_rows(pool: np.ndarray, k: int, count: int) -> np.ndarray:
+            # Her satır için pool'dan tekrarsız k eleman
+            orders = rng.permuted(np.tile(np.arange(pool.size), (count, 1)), axis=1)
+            return pool[orders[:, :k]]
+
+        for angle, drop_count in drops_needed.items():
+            pairs_needed = drop_count // 2  # Simetrik droplar
+            available, grouped, ungrouped = left_pools[angle]
+
+            picks = np.empty((attempts, pairs_needed), dtype=np.intp)
+            use_grouped = prefer_grouped if grouped.size else np.zeros(attempts, dtype=bool)
+            g_rows = rows[use_grouped]
+            a_rows = rows[~use_grouped]
+            if g_rows.size:
+                if grouped.size >= pairs_needed:
+                    picks[g_rows] = sample_rows(grouped, pairs_needed, g_rows.size)
+                else:
+                    # Gruplanmış yetmiyorsa, kalanı ungrouped'dan al (available yeterli olduğundan
+                    # ungrouped her zaman kalanı karşılar)
+                    picks[g_rows, :grouped.size] = grouped
+                    picks[g_rows, grouped.size:] = sample_rows(ungrouped, pairs_needed - grouped.size, g_rows.size)
+            if a_rows.size:
+                picks[a_rows] = sample_rows(available, pairs_needed, a_rows.size)
+            left_mask[rows[:, None], picks] = True
+
+        # Ardışık drop kontrolü (sol yarı, tüm açılar birlikte)
+        valid = ~(left_mask[:, :-1] & left_mask[:, 1:]).any(axis=1)
+
+        # Simetrik pozisyonlar: i -> n-1-i sütun ters çevirme ile
+        drop_mask = left_mask | left_mask[:, ::-1]
+
+        # Ortadaki ply'ı drop et (eğer gerekiyorsa - Tek → Çift)
+        if middle_idx is not None:
+            drop_mask[:, middle_idx] = True
+
+        # Çift → Tek: Bir çifti kır - sol yarıda kullanılmamış bir pozisyonun sadece
+        # mirror'ı drop edilir; uygun pozisyon yoksa çift kırılmaz
+        if break_pool is not None and break_pool.size:
+            keys = rng.random((attempts, break_pool.size))
+            used = left_mask[:, break_pool]
+            keys[used] = np.inf
+            choice = keys.argmin(axis=1)
+            has_break = ~used.all(axis=1)
+            drop_mask[rows[has_break], n - 1 - break_pool[choice[has_break]]] = True
+
+        # Asimetrik tek-ply drop'lar (simetriyi hafifçe kırarak hedef açı sayısına ulaş)
+        for pool in single_pools:
+            keys = rng.random((attempts, pool.size))
+            taken = drop_mask[:, pool]
+            keys[taken] = np.inf
+            choice = keys.argmin(axis=1)
+            has_free = ~taken.all(axis=1)
+            valid &= has_free
+            drop_mask[rows[has_free], pool[choice[has_free]]] = True
+
+        return drop_mask[valid]
+
+    def _select_angle_target_candidate(
+        self,
+        drop_mask: np.ndarray,
+        target_ply_counts: Dict[int, int],
+    ) -> Optional[Tuple[List[int], float, Dict[int, List[int]]]]:
+        """
+        optimize_drop_with_angle_targets denemelerinden (drop maskesi satırları) en iyi aday.
+
+        Seçim anahtarı (3'lü grup sayısı, -fitness), eşitlikte ilk deneme. Drop run, hedef
+        açı sayısı ve 4+/3'lü grup filtreleri vektöreldir; fitness 3'lü grup sayısı en
+        düşük gruptan başlanarak hesaplanır, pozitif skorlu aday bulunan ilk grupta durulur.
+
+        Returns:
+            None ya da (dizilim, skor, açı -> sıralı drop indeksleri)
+        """
+        m, n = drop_mask.shape
+        if m == 0:
+            return None
+
+        ok = np.ones(m, dtype=bool)
+        window = self.MAX_CONSECUTIVE_DROPS + 1
+        if self._hard_rule_enabled("max_two_consecutive_drops") and n >= window:
+            # MAX_CONSECUTIVE_DROPS'tan uzun ardışık drop run'ı
+            run = drop_mask[:, :n - window + 1].copy()
+            for shift in range(1, window):
+                run &= drop_mask[:, shift:n - window + 1 + shift]
+            ok &= ~run.any(axis=1)
+
+        # Hedef açı sayılarına tam eşleşme
+        positions_by_angle = self._positions_by_angle()
+        target_angles = list(target_ply_counts.keys())
+        master_counts = self._master_angle_counts(target_angles).tolist()
+        for angle, master_count in zip(target_angles, master_counts):
+            positions = positions_by_angle.get(angle)
+            dropped = drop_mask[:, positions].sum(axis=1) if positions is not None else 0
+            ok &= master_count - dropped == target_ply_counts[angle]
+
+        rows = np.flatnonzero(ok)
+        if rows.size == 0:
+            return None
+
+        # Grouping kalite kontrolü: 4+ gruplar ve 4'ten fazla 3'lü grup reddedilir.
+        # 4+ run varlığı kaydırmalı eşitlik maskesiyle önce elenir; run uzunlukları
+        # (3'lü grup sayımı) yalnızca kalan satırlar için çıkarılır
+        keep = ~drop_mask[rows]
+        lengths = keep.sum(axis=1)
+        groups_of_3 = np.full(rows.size, -1, dtype=np.int64)  # -1: 4+ grup nedeniyle elendi
+        master_rows = np.broadcast_to(self._master_arr, keep.shape)
+        for length in np.unique(lengths).tolist():
+            sel = np.flatnonzero(lengths == length)
+            candidates = master_rows[sel][keep[sel]].reshape(sel.size, length)
+            no_long_run = ~self._has_run_of_batch(candidates, 4)
+            sel, candidates = sel[no_long_run], candidates[no_long_run]
+            groups_of_3[sel] = self._group_counts_batch(candidates)[0]
+        good = (groups_of_3 >= 0) & (groups_of_3 <= 4)
+        rows, groups_of_3 = rows[good], groups_of_3[good]
+
+        # 3'lü grup sayısına göre artan, eşitlikte deneme sırası
+        order = np.lexsort((rows, groups_of_3))
+        best = None
+        best_score = 0.0
+        current_g3 = None
+        for row, g3 in zip(rows[order].tolist(), groups_of_3[order].tolist()):
+            if g3 != current_g3:
+                if best is not None:
+                    break
+                current_g3 = g3
+            # Dizilim sadece fitness gereken adaylar için, mevcut drop maskesinden kurulur
+            temp_seq, _ = self._normalize_sequence_after_drop(self._master_arr[~drop_mask[row]].tolist())
+            score = self._cached_fitness(temp_seq)
+            # Hard constraint ihlali (0) atlanır; eşit skorda önceki deneme kalır
+            if score > best_score:
+                best, best_score = (row, temp_seq), score
+
+        if best is None:
+            return None
+        row, temp_seq = best
+        # Açı -> drop indeksleri (artan) doğrudan kazanan satırın maskesinden
+        dropped_by_angle = {}  # type: Dict[int, List[int]]
+        for idx in np.flatnonzero(drop_mask[row]).tolist():
+            dropped_by_angle.setdefault(self.master_sequence[idx], []).append(idx)
+        return temp_seq, best_score, dropped_by_angle
+
+    def _propose_drops(
+        self,
+        left_drops: List[int],
+        break_pair_idx: Optional[int],
+        drop_middle: bool,
+        middle_idx: Optional[int],
+    ) -> Optional[Tuple[List[int], float]]:
+        """
+        _draw_drop_samples'ın açı kontrollerinden geçen tek bir drop önerisine kalan
+        fitness gerektirmeyen kontrolleri (gruplama, aralık dağılımı, drop run) uygula.
+
+        Returns:
+            None (reddedildi) ya da (sıralı all_drops, spacing_std)
+        """
+        # Ardışık drop farkları bir kez hesaplanır; iki kontrol de bunları kullanır
+        spacings = [b - a for a, b in zip(left_drops, left_drops[1:])]
+
+        # ✅ 1. NO GROUPING CHECK - Ardışık drop pozisyonları yasak
+        # Drop pozisyonları birbirine çok yakın olmamalı (gruplama önleme)
+        if 1 in spacings:
+            return None  # Grouped drops = reddet
+
+        # ✅ 2. UNIFORM DISTRIBUTION CHECK - Drop'lar düzgün dağıtılmış olmalı
+        spacing_std = 0.0  # Default değer
+        if len(left_drops) > 2:
+            spacing_mean, spacing_std = self._spacing_stats(spacings)
+            # Çok yüksek standart sapma = kötü dağılım (AVOID örneği gibi)
+            if spacing_std > spacing_mean * 0.7:  # Çok düzensiz dağılım
+                return None
+
+        # all_drops doğrudan sıralı kurulur: sol yarı (artan) + orta ply + sağ yarı aynalar
+        # (sol sıranın tersi artan); kırılan çiftin mirror'ı sağ yarıya ikili aramayla girer
+        last = self.total_plies - 1
+        right_drops = [last - idx for idx in reversed(left_drops)]
+
+        # Çift → Tek: Bir çifti kır - sadece sağ yarıdaki mirror'ı drop et
+        # Sol yarıdaki ply otomatik olarak yeni ortada kalır
+        if break_pair_idx is not None:
+            bisect.insort(right_drops, last - break_pair_idx)
+
+        # Ortadaki ply'ı drop et (eğer gerekiyorsa - Tek → Çift)
+        if drop_middle and middle_idx is not None:
+            all_drops = left_drops + [middle_idx] + right_drops
+        else:
+            all_drops = left_drops + right_drops
+
+        if self._has_excessive_drop_run(all_drops):
+            return None
+
+        return all_drops, spacing_std
+
     def optimize_drop(self, target_ply: int) -> Tuple[List[int], float, List[int]]:
         """
         Drop-off optimization with odd/even ply support.
@@ -92,6 +693,7 @@ class DropOffOptimizer:
         - Odd → Even: Drop middle ply + symmetric pairs
         - Even → Odd: Break one pair - keep one as middle, drop its mirror
         """
+        self.clear_fit_cache()
         remove_cnt = self.total_plies - target_ply
         if remove_cnt <= 0:
             return self.master_sequence, 0.0, []
@@ -104,7 +706,6 @@ class DropOffOptimizer:
         # Drop stratejisini belirle
         drop_middle = False
         break_pair_for_middle = False  # Çift → Tek için: bir çifti kır
-        break_pair_idx = None  # Kırılacak çiftin sol yarıdaki pozisyonu
 
         if master_is_odd and not target_is_odd:
             # Tek → Çift: Ortadaki ply'ı da drop et
@@ -124,216 +725,121 @@ class DropOffOptimizer:
 
         # External plies koruması: ilk 2 katmanı koru (pozisyon 0 ve 1)
         # Rule 4'e göre ilk 2 ve son 2 katman korunmalı
-        search_indices = list(range(2, half_len))  # Pozisyon 0 ve 1 hariç
-
-        best_candidate = None
-        best_key = None
-        best_dropped = []
+        search_arr = np.arange(2, half_len, dtype=np.int32)  # Pozisyon 0 ve 1 hariç; döngü boyunca sabit
 
         attempts = self.base_opt.DROP_OFF_ATTEMPTS
-        for _ in range(attempts):
-            left_drops = []
-
-            # Çift → Tek: Bir çifti kırmak için pozisyon seç
-            if break_pair_for_middle:
-                if len(search_indices) == 0:
-                    continue
-                # Ortaya yakın bir pozisyon seç (sol yarının sonlarından)
-                # Bu pozisyondaki ply ortaya geçecek, mirror'ı drop edilecek
-                break_pair_idx = random.choice(search_indices)
-
-            # Normal çift drop pozisyonları seç
-            if pairs_to_remove > 0 and len(search_indices) > 0:
-                # break_pair_idx zaten kullanıldıysa onu hariç tut
-                available_indices = [i for i in search_indices if i != break_pair_idx]
-                sample_size = min(pairs_to_remove, len(available_indices))
-                if sample_size > 0:
-                    left_drops = random.sample(available_indices, sample_size)
-                    left_drops.sort()
-
-            # ✅ 1. NO GROUPING CHECK - Ardışık drop pozisyonları yasak
-            # Drop pozisyonları birbirine çok yakın olmamalı (gruplama önleme)
-            if len(left_drops) > 1:
-                has_consecutive = any(left_drops[i + 1] - left_drops[i] == 1 for i in range(len(left_drops) - 1))
-                if has_consecutive:
-                    continue  # Grouped drops = reddet
-
-            # ✅ 2. UNIFORM DISTRIBUTION CHECK - Drop'lar düzgün dağıtılmış olmalı
-            spacing_std = 0.0  # Default değer
-            if len(left_drops) > 2:
-                spacings = [left_drops[i + 1] - left_drops[i] for i in range(len(left_drops) - 1)]
-                spacing_mean = np.mean(spacings)
-                spacing_std = np.std(spacings)
-                # Çok yüksek standart sapma = kötü dağılım (AVOID örneği gibi)
-                if spacing_std > spacing_mean * 0.7:  # Çok düzensiz dağılım
-                    continue
-
-            all_drops = []
-            for idx in left_drops:
-                all_drops.append(idx)
-                all_drops.append(self.total_plies - 1 - idx)
-
-            # Ortadaki ply'ı drop et (eğer gerekiyorsa - Tek → Çift)
-            if drop_middle and middle_idx is not None:
-                all_drops.append(middle_idx)
-
-            # Çift → Tek: Bir çifti kır - sadece sağ yarıdaki mirror'ı drop et
-            # Sol yarıdaki ply otomatik olarak yeni ortada kalır
-            if break_pair_for_middle and break_pair_idx is not None:
-                mirror_idx = self.total_plies - 1 - break_pair_idx
-                all_drops.append(mirror_idx)
-
-            all_drops.sort()
-            if self._has_excessive_drop_run(all_drops):
-                continue
-
-            temp_seq = [ang for i, ang in enumerate(self.master_sequence) if i not in all_drops]
-            temp_seq, _ = self._normalize_sequence_after_drop(temp_seq)
-
-            # ✅ 3. MULTI-ANGLE CHECK - Sadece bir açıdan drop olmasın (0° dahil tüm açılar)
-            dropped_angles_left = [self.master_sequence[idx] for idx in left_drops]
-            if drop_middle and middle_idx is not None:
-                dropped_angles_left.append(self.master_sequence[middle_idx])
-            if break_pair_for_middle and break_pair_idx is not None:
-                # Kırılan çiftin mirror'ını da ekle (sağ yarıdaki drop edilen)
-                mirror_idx = self.total_plies - 1 - break_pair_idx
-                dropped_angles_left.append(self.master_sequence[mirror_idx])
-            unique_angles_dropped = set(dropped_angles_left)
-
-            # Eğer sadece bir açıdan drop varsa ve toplam drop sayısı 2'den fazlaysa, reddet
-            # Bu, 0°, 90°, 45°, -45° tüm açılar için geçerli
-            # Özellikle 0°'dan da drop yapılabilmeli, ama tek başına olmamalı
-            if len(unique_angles_dropped) == 1 and len(dropped_angles_left) > 2:
-                continue  # Sadece bir açıdan drop yapılmış = reddet
-
-            # ✅ 4. BALANCE CHECK (45°/-45° alternasyon + tüm açılar için denge)
-            # Drop edilen açıların dağılımı dengeli olmalı
-            count_45 = dropped_angles_left.count(45)
-            count_minus45 = dropped_angles_left.count(-45)
-            count_0 = dropped_angles_left.count(0)
-            count_90 = dropped_angles_left.count(90)
-
-            # 90°'dan aşırı drop yapılmasını engelle (en fazla 3 çift = 6 ply)
-            if count_90 > 3:
-                continue
-
-            # 45°/-45° düşüşünü teşvik et: 4+ drop varsa en az bir 45° veya -45° olmalı
-            total_drops = len(dropped_angles_left)
-            if total_drops >= 4 and count_45 == 0 and count_minus45 == 0:
+        # Ucuz tamsayı (açı sayımı) kontrolleri çekilişle birlikte vektörel yapılır; döngüye
+        # yalnızca geçen denemeler girer
+        samples = self._draw_drop_samples(
+            search_arr, pairs_to_remove, break_pair_for_middle, drop_middle, middle_idx, attempts,
+        )
+        accepted = []  # type: List[Tuple[List[int], float, Tuple[int, int, int, int, int]]]
+        for left_drops, break_pair_idx, angle_stats in samples:
+            # Kalan fitness dışı kontroller _propose_drops içinde
+            proposal = self._propose_drops(left_drops, break_pair_idx, drop_middle, middle_idx)
+            if proposal is None:
                 continue
+            all_drops, spacing_std = proposal
+            accepted.append((all_drops, spacing_std, angle_stats))
 
-            # 45°/-45° dengesi kontrolü
-            if count_45 > 0 or count_minus45 > 0:
-                # Eğer her ikisi de varsa, sayıları yakın olmalı
-                if count_45 > 0 and count_minus45 > 0:
-                    if abs(count_45 - count_minus45) > 2:  # Çok dengesiz
-                        continue
-                # Eğer sadece biri varsa ve sayı 2'den fazlaysa, bu da dengesizlik
-                elif (count_45 > 2 and count_minus45 == 0) or (count_minus45 > 2 and count_45 == 0):
-                    continue
-
-            total_score, details = self.base_opt.calculate_fitness(temp_seq)
-
-            # 🚫 HARD FAIL (Hard constraints ihlali)
-            if total_score <= 0:
-                continue
-
-            rules = details["rules"]
+        if not accepted:
+            return self.master_sequence, 0.0, []
 
-            # ✅ 5. RULE 6 (GROUPING) ÖZEL KONTROL - Drop sonrası grouping kontrolü
-            # 3'lü veya daha fazla grouping varsa reddet
-            groups_of_3 = self.base_opt._find_groups_of_size(temp_seq, 3)
-            groups_of_4 = self.base_opt._find_groups_of_size(temp_seq, 4)
-            groups_of_5 = self.base_opt._find_groups_of_size(temp_seq, 5)
-            groups_of_4_or_more = groups_of_4 + groups_of_5  # 4 veya daha fazla
+        # Kabul edilen tüm adaylar aynı uzunlukta: tek maske ile (M, target) matrisi kurulur ve
+        # kurallar calculate_rules_batch ile satır bazında vektörel hesaplanır.
+        # _normalize_sequence_after_drop sırayı koruduğundan (kimlik) matrise uygulanmaz.
+        drops = np.array([item[0] for item in accepted], dtype=np.intp).reshape(len(accepted), -1)
+        m = drops.shape[0]
+        keep = np.ones((m, self.total_plies), dtype=bool)
+        keep[np.arange(m)[:, None], drops] = False
+        candidates = np.broadcast_to(self._master_arr, keep.shape)[keep].reshape(m, -1)
+        if candidates.shape[1] == 0:
+            return self.master_sequence, 0.0, []
 
-            # 4 veya daha fazla grouping varsa kesinlikle reddet
-            if groups_of_4_or_more > 0:
-                continue
+        # Aynı temp_seq'i üreten denemeler bir kez değerlendirilir
+        unique_rows, inverse = self._unique_rows(candidates)
+        hard, scores, penalties, groups = self.base_opt.calculate_rules_batch(unique_rows)
+        # details dict'indeki gibi 2 haneye yuvarla
+        scores = np.round(scores, 2)[inverse]
+        penalties = np.round(penalties, 2)[inverse]
+        hard = hard[inverse]
+        groups_of_3 = groups[inverse, 0]
+        groups_of_4_or_more = groups[inverse, 1]
+
+        # ✅ 6. TÜM KURALLAR (R1-R8) MİNİMUM SKOR KONTROLÜ (MIN_RULE_RATIOS)
+        rule_keys = list(self.base_opt.RULE_KEYS)
+        weights = np.array([self.base_opt.WEIGHTS[k] for k in rule_keys], dtype=np.float64)
+        ratios = np.divide(scores, weights, out=np.zeros_like(scores), where=weights > 0)
+        rule_violations = (ratios < self._min_ratio_vec).sum(axis=1)
+
+        # 🚫 HARD FAIL + ✅ 5. RULE 6: 4+ grup kesinlikle, 3'ten fazla 3'lü grup reddedilir;
+        # 2'den fazla kural minimumun altındaysa reddet
+        ok = ~hard & (groups_of_4_or_more == 0) & (groups_of_3 <= 3) & (rule_violations <= 2)
+        rows = np.flatnonzero(ok)
+        if rows.size == 0:
+            return self.master_sequence, 0.0, []
 
-            # 3'lü grouping sayısı fazla ise (3'ten fazla) reddet
-            if groups_of_3 > 3:
+        spacing_std = np.array([item[1] for item in accepted], dtype=np.float64)
+        angle_stats = np.array([item[2] for item in accepted], dtype=np.int64)
+        angle_diversity, count_45, count_minus45, count_0, count_90 = angle_stats.T
+
+        # ✅ 7. IMPROVED SELECTION KEY (lexicographic) - Tüm kuralları dikkate al
+        key_columns = (
+            rule_violations,  # Primary: Kural ihlali sayısı (düşük = iyi, 0 = hiç ihlal yok)
+            groups_of_3,  # Secondary: 3'lü grup sayısı (düşük = iyi)
+            groups_of_4_or_more,  # Tertiary: 4+ grup sayısı (düşük = iyi, 0 olmalı)
+            penalties[:, rule_keys.index("R6")],  # Quaternary: Rule 6 grouping penalty (düşük = iyi)
+            count_90 * 0.5,  # 90° drop penalty: çok sayıda 90° drop'u ittir (düşük = iyi)
+            penalties[:, rule_keys.index("R1")] + penalties[:, rule_keys.index("R8")],  # Quinary: R1 + R8 penalty
+            spacing_std,  # Senary: Uniform distribution (düşük std = iyi)
+            np.abs(count_45 - count_minus45),  # Senaryedi: 45°/-45° dengesi (düşük = iyi)
+            -angle_diversity,  # Sekizinci: Angle diversity (yüksek = iyi, negatif çünkü min istiyoruz)
+            -((count_45 > 0) | (count_minus45 > 0)).astype(np.int64),  # 45°/-45° drop bonusu (negatif = ödül)
+            -(count_0 > 0).astype(np.int64),  # Dokuzuncu: 0° drop bonusu (0° dahil çeşitli drop)
+            penalties.sum(axis=1),  # Onuncu: Toplam penalty
+            -scores.sum(axis=1),  # On birinci: Total fitness score (yüksek = iyi)
+        )
+        # np.lexsort son anahtarı birincil alır ve kararlıdır: eşitlikte önceki deneme kazanır
+        order = rows[np.lexsort(tuple(col[rows] for col in reversed(key_columns)))]
+
+        # Batch skorları calculate_fitness'tan ±0.01 sapabilir: sıralamadaki ilk adaydan
+        # başlayarak kesin değerlendirmeyle eşikleri tekrar doğrula
+        for row in order.tolist():
+            temp_seq, _ = self._normalize_sequence_after_drop(candidates[row].tolist())
+            evaluation = self._cached_drop_eval(temp_seq)
+            if evaluation is None:
                 continue
-
-            # ✅ 6. TÜM KURALLAR (R1-R8) MİNİMUM SKOR KONTROLÜ
-            # Drop-off yapınca kuralların dışına çıkmamalı - minimum skorları koru
-            min_scores = {
-                "R1": 0.85,  # Symmetry - %85 minimum
-                "R2": 0.80,  # Balance - %80 minimum
-                "R3": 0.80,  # Percentage - %80 minimum
-                "R4": 0.75,  # External plies - %75 minimum
-                "R5": 0.70,  # Distribution - %70 minimum
-                "R6": 0.75,  # Grouping - %75 minimum (önemli!)
-                "R7": 0.75,  # Buckling - %75 minimum
-                "R8": 0.85,  # Lateral bending - %85 minimum
-            }
-
-            # Her kural için minimum skor kontrolü
-            rule_violations = 0
-            for rule_name, min_ratio in min_scores.items():
-                if rule_name in rules:
-                    rule_weight = rules[rule_name]["weight"]
-                    rule_score = rules[rule_name]["score"]
-                    rule_ratio = rule_score / rule_weight if rule_weight > 0 else 0
-
-                    if rule_ratio < min_ratio:
-                        rule_violations += 1
-
-            # Çok fazla kural ihlali varsa reddet (2'den fazla kural %75'in altındaysa)
-            if rule_violations > 2:
+            total_score, exact_g3, exact_g4, exact_violations = evaluation[:4]
+            if exact_g4 > 0 or exact_g3 > 3 or exact_violations > 2:
                 continue
+            return temp_seq, total_score, accepted[row][0]
 
-            # ✅ 7. IMPROVED SELECTION KEY (lexicographic) - Tüm kuralları dikkate al
-            # Uniform distribution score (düşük std = iyi)
-            dist_score = spacing_std  # Zaten yukarıda hesaplandı
-
-            # Angle diversity score (daha fazla farklı açı = iyi)
-            angle_diversity = len(unique_angles_dropped)
-
-            # Balance score (45°/-45° dengesi)
-            balance_score = abs(count_45 - count_minus45) if (count_45 > 0 or count_minus45 > 0) else 0
-
-            # Rule 6 (Grouping) penalty - düşük olmalı
-            r6_penalty = rules.get("R6", {}).get("penalty", 0)
-
-            # Tüm kuralların toplam penalty'si (düşük = iyi)
-            total_penalty = sum(r.get("penalty", 0) for r in rules.values())
-
-            # 0° drop bonusu - 0°'dan da drop yapıldıysa bonus ver (daha çeşitli drop için)
-            # Ancak tek başına 0° olmamalı (zaten yukarıda kontrol edildi)
-            has_0_drop = 1 if count_0 > 0 else 0
-
-            # 90° drop penalty: çok sayıda 90° drop'u ittir
-            ninety_drop_penalty = count_90 * 0.5
-
-            # 45°/-45° drop bonusu: bu açılardan drop varsa ödüllendir
-            has_45_drop_bonus = -1 if (count_45 > 0 or count_minus45 > 0) else 0
-
-            key = (
-                rule_violations,  # Primary: Kural ihlali sayısı (düşük = iyi, 0 = hiç ihlal yok)
-                groups_of_3,  # Secondary: 3'lü grup sayısı (düşük = iyi)
-                groups_of_4_or_more,  # Tertiary: 4+ grup sayısı (düşük = iyi, 0 olmalı)
-                r6_penalty,  # Quaternary: Rule 6 grouping penalty (düşük = iyi)
-                ninety_drop_penalty,  # 90° drop penalty (düşük = iyi)
-                rules["R1"]["penalty"] + rules["R8"]["penalty"],  # Quinary: R1 + R8 penalty
-                dist_score,  # Senary: Uniform distribution (düşük = iyi)
-                balance_score,  # Senaryedi: Balance (düşük = iyi)
-                -angle_diversity,  # Sekizinci: Angle diversity (yüksek = iyi, negatif çünkü min istiyoruz)
-                has_45_drop_bonus,  # 45°/-45° drop bonusu (negatif = ödül)
-                -has_0_drop,  # Dokuzuncu: 0° drop bonusu (0° varsa -1, yoksa 0, negatif çünkü min istiyoruz)
-                total_penalty,  # Onuncu: Toplam penalty
-                -total_score,  # On birinci: Total fitness score (yüksek = iyi)
-            )
+        return self.master_sequence, 0.0, []
 
-            if best_key is None or key < best_key:
-                best_key = key
-                best_candidate = temp_seq
-                best_dropped = all_drops
+    def optimize_drop_multi(self, targets: List[int]) -> List[Tuple[List[int], float, List[int]]]:
+        """
+        Zincirleme drop-off: her hedef bir önceki seviyenin sonucundan düşürülür.
 
-        if best_candidate is None:
-            return self.master_sequence, 0.0, []
+        Her seviye için optimize_drop ile aynı sonucu döndürür; seviyeler tek çağrıda
+        yürütülür ve base optimizer'ın fitness önbelleği seviyeler arasında paylaşılır.
+        master_sequence / total_plies çağrı sonunda eski hallerine döner.
 
-        return best_candidate, best_key[10] * -1, best_dropped  # Total score'u döndür (11. eleman)
+        Returns:
+            Her hedef için (sequence, score, dropped_indices) listesi (targets sırasıyla).
+        """
+        original_seq, original_total = self.master_sequence, self.total_plies
+        snapshots = []
+        current_seq = original_seq
+        try:
+            for target in targets:
+                self.master_sequence = current_seq
+                self.total_plies = len(current_seq)
+                new_seq, score, dropped = self.optimize_drop(target)
+                snapshots.append((new_seq, score, dropped))
+                current_seq = new_seq
+        finally:
+            self.master_sequence, self.total_plies = original_seq, original_total
+        return snapshots
 
     def optimize_drop_with_angle_targets(
         self, target_ply_counts: Dict[int, int]
@@ -343,6 +849,8 @@ class DropOffOptimizer:
         """
         from collections import Counter
 
+        self.clear_fit_cache()
+
         def _greedy_angle_target_drop(
             seq_in: List[int],
             target_counts_in: Dict[int, int],
@@ -385,8 +893,7 @@ class DropOffOptimizer:
                 if safety_iter > 5000:
                     return None
 
-                current = Counter(seq)
-                # Pair drop phase done?
+                # Pair drop phase done? (current her çift drop'ta güncellenir; seq yeniden sayılmaz)
                 done = True
                 for ang, tgt in greedy_pair_targets.items():
                     if current.get(ang, 0) > tgt:
@@ -421,9 +928,10 @@ class DropOffOptimizer:
                             continue
 
                         drop_set = {left_idx, right_idx}
-                        temp_seq = [a for i, a in enumerate(seq) if i not in drop_set]
+                        # left_idx < half <= right_idx: iki dilim birleştirme, eleman başına üyelik testi yok
+                        temp_seq = seq[:left_idx] + seq[left_idx + 1:right_idx] + seq[right_idx + 1:]
                         temp_seq, _ = self._normalize_sequence_after_drop(temp_seq)
-                        sc, _ = self.base_opt.calculate_fitness(temp_seq)
+                        sc = self._cached_fitness(temp_seq)
                         if sc <= 0:
                             continue
 
@@ -441,6 +949,7 @@ class DropOffOptimizer:
                 orig_left = pos_map[left_idx]
                 orig_right = pos_map[right_idx]
                 dropped_by_angle.setdefault(int(ang), []).extend([orig_left, orig_right])
+                current[ang] -= 2
 
                 for idx in sorted(drop_set, reverse=True):
                     seq.pop(idx)
@@ -448,36 +957,12 @@ class DropOffOptimizer:
                 seq, pos_map = self._normalize_sequence_after_drop(seq, pos_map)
 
             # Phase 2: Single ply drops for odd-delta angles (asimetrik, hafif simetri kaybı)
-            if len(greedy_single_angles) >= 2:
-                # Birden fazla single drop: birlikte kaldırmayı dene (0-90 separator sorunu)
-                n = len(seq)
-                angle_positions = {}
-                for ang in greedy_single_angles:
-                    angle_positions[ang] = [i for i in range(2, n - 2) if seq[i] == ang]
-
-                # Tüm kombinasyonları dene, en iyi skoru bul
-                from itertools import product
-                pos_lists = [angle_positions[ang] for ang in greedy_single_angles]
-                best_combo = None
-                best_combo_score = -1.0
-
-                for combo in product(*pos_lists):
-                    if len(set(combo)) != len(combo):
-                        continue  # Aynı pozisyon birden fazla açı için seçilmişse atla
-                    combo_orig = [pos_map[pos] for pos in combo]
-                    candidate_drops = self._flatten_dropped_by_angle(dropped_by_angle) + combo_orig
-                    if self._has_excessive_drop_run(candidate_drops):
-                        continue
-                    drop_set = set(combo)
-                    temp = [seq[k] for k in range(n) if k not in drop_set]
-                    temp, _ = self._normalize_sequence_after_drop(temp)
-                    sc, _ = self.base_opt.calculate_fitness(temp)
-                    if sc > best_combo_score:
-                        best_combo_score = sc
-                        best_combo = combo
-
-                if best_combo is None or best_combo_score <= 0:
+            # Birden fazla single drop birlikte kaldırılır (0-90 separator sorunu)
+            if greedy_single_angles:
+                picked = self._best_single_drops(seq, pos_map, dropped_by_angle, greedy_single_angles)
+                if picked is None or picked[1] <= 0:
                     return None
+                best_combo = picked[0]
 
                 # Birleşik kaldırma uygula
                 for ang, pos in zip(greedy_single_angles, best_combo):
@@ -490,34 +975,9 @@ class DropOffOptimizer:
                     pos_map.pop(pos)
                 # 0°-90° bitişiklik düzelt
                 seq, pos_map = self._normalize_sequence_after_drop(seq, pos_map)
-            elif len(greedy_single_angles) == 1:
-                # Tek single drop: sıralı kaldırma yeterli
-                ang = greedy_single_angles[0]
-                n = len(seq)
-                best_pos = None
-                best_score = -1.0
-                for i in range(2, n - 2):
-                    if seq[i] != ang:
-                        continue
-                    candidate_drops = self._flatten_dropped_by_angle(dropped_by_angle) + [pos_map[i]]
-                    if self._has_excessive_drop_run(candidate_drops):
-                        continue
-                    temp = seq[:i] + seq[i + 1:]
-                    temp, _ = self._normalize_sequence_after_drop(temp)
-                    sc, _ = self.base_opt.calculate_fitness(temp)
-                    if sc > best_score:
-                        best_score = sc
-                        best_pos = i
-                if best_pos is None or best_score <= 0:
-                    return None
-                orig_idx = pos_map[best_pos]
-                dropped_by_angle.setdefault(int(ang), []).append(orig_idx)
-                seq.pop(best_pos)
-                pos_map.pop(best_pos)
-                seq, pos_map = self._normalize_sequence_after_drop(seq, pos_map)
 
             # Final validation
-            score, _details = self.base_opt.calculate_fitness(seq)
+            score = self._cached_fitness(seq)
             if score <= 0:
                 return None
             return seq, float(score), {a: sorted(v) for a, v in dropped_by_angle.items()}
@@ -561,42 +1021,41 @@ class DropOffOptimizer:
 
             total_pairs = sum(pairs_needed.values())
             if total_pairs == 0 and not beam_single_angles:
-                sc, _ = self.base_opt.calculate_fitness(seq0)
+                sc = self._cached_fitness(seq0)
                 if sc <= 0:
                     return None
                 return seq0, float(sc), {}
 
             # Phase 1: Beam search for symmetric pair drops
-            sc0, _ = self.base_opt.calculate_fitness(seq0)
+            sc0 = self._cached_fitness(seq0)
             if sc0 <= 0:
                 return None
 
             if total_pairs > 0:
-                beam = [(float(sc0), seq0, pos0, dict(pairs_needed), {})]
+                # Her durum simetrik çift pozisyonlarını (açı -> sol indeksler) taşır; her adımda
+                # sol yarı taranmaz, düşen çift için listeler yamalanır. Düşen plylar durumlar
+                # arasında paylaşılan (açı, orijinal indeks) tuple'ı: genişletme sadece 2 eleman ekler
+                beam = [(float(sc0), seq0, pos0, dict(pairs_needed), (), self._symmetric_pair_positions(seq0), tuple(seq0))]
+                min_left_idx = max(protect_left_min_idx, 0)
 
                 for _step in range(total_pairs):
                     next_states = []
 
-                    for _score, seq, pos_map, pairs_left, dropped in beam:
+                    for _score, seq, pos_map, pairs_left, dropped, pair_positions, _key in beam:
                         n = len(seq)
-                        half = n // 2
 
                         for ang in sorted([a for a, k in pairs_left.items() if k > 0]):
-                            for left_idx in range(max(protect_left_min_idx, 0), half):
-                                if seq[left_idx] != ang:
+                            for left_idx in pair_positions.get(ang, ()):
+                                if left_idx < min_left_idx:
                                     continue
                                 right_idx = n - 1 - left_idx
-                                if right_idx == left_idx:
-                                    continue
-                                if seq[right_idx] != ang:
-                                    continue
 
                                 temp_seq = seq[:]
                                 temp_pos = pos_map[:]
                                 orig_left = temp_pos[left_idx]
                                 orig_right = temp_pos[right_idx]
 
-                                candidate_drops = self._flatten_dropped_by_angle(dropped) + [orig_left, orig_right]
+                                candidate_drops = [idx for _ang, idx in dropped] + [orig_left, orig_right]
                                 if self._has_excessive_drop_run(candidate_drops):
                                     continue
 
@@ -606,7 +1065,9 @@ class DropOffOptimizer:
                                 temp_pos.pop(left_idx)
                                 temp_seq, temp_pos = self._normalize_sequence_after_drop(temp_seq, temp_pos)
 
-                                sc, _ = self.base_opt.calculate_fitness(temp_seq)
+                                # Aynı tuple hem fitness önbelleği hem beam tekilleştirme anahtarı
+                                seq_key = tuple(temp_seq)
+                                sc = self._cached_fitness(seq_key)
                                 if sc <= 0:
                                     continue
 
@@ -615,10 +1076,11 @@ class DropOffOptimizer:
                                 if new_pairs_left[ang] <= 0:
                                     new_pairs_left.pop(ang, None)
 
-                                new_dropped = {k: v[:] for k, v in dropped.items()}
-                                new_dropped.setdefault(int(ang), []).extend([orig_left, orig_right])
+                                new_dropped = dropped + ((int(ang), orig_left), (int(ang), orig_right))
 
-                                next_states.append((float(sc), temp_seq, temp_pos, new_pairs_left, new_dropped))
+                                new_positions = self._drop_symmetric_pair_position(pair_positions, ang, left_idx)
+
+                                next_states.append((float(sc), temp_seq, temp_pos, new_pairs_left, new_dropped, new_positions, seq_key))
 
                     if not next_states:
                         return None
@@ -627,7 +1089,7 @@ class DropOffOptimizer:
                     seen = set()
                     new_beam = []
                     for st in next_states:
-                        key = tuple(st[1])
+                        key = st[6]
                         if key in seen:
                             continue
                         seen.add(key)
@@ -639,44 +1101,23 @@ class DropOffOptimizer:
                 best = max(beam, key=lambda x: x[0])
             else:
                 # No pair drops needed, only single drops
-                best = (float(sc0), seq0[:], pos0[:], {}, {})
+                best = (float(sc0), seq0[:], pos0[:], {}, ())
 
             best_seq = best[1]
             best_pos_map = best[2]
-            best_dropped = best[4] if len(best) > 4 else {}
+            # (açı, indeks) çiftlerinden açı -> indeksler sözlüğü (ilk görülme sırasıyla)
+            best_dropped = {}  # type: Dict[int, List[int]]
+            for ang, idx in best[4]:
+                best_dropped.setdefault(ang, []).append(idx)
 
             # Phase 2: Single ply drops for odd-delta angles
-            if len(beam_single_angles) >= 2:
-                # Birden fazla single drop: birlikte kaldır (separator sorunu)
-                from itertools import product
-                n = len(best_seq)
-                angle_positions = {}
-                for ang in beam_single_angles:
-                    angle_positions[ang] = [i for i in range(2, n - 2) if best_seq[i] == ang]
-
-                pos_lists = [angle_positions[ang] for ang in beam_single_angles]
-                best_combo = None
-                best_combo_score = -1.0
-
-                for combo in product(*pos_lists):
-                    if len(set(combo)) != len(combo):
-                        continue
-                    combo_orig = [best_pos_map[pos] for pos in combo]
-                    candidate_drops = self._flatten_dropped_by_angle(best_dropped) + combo_orig
-                    if self._has_excessive_drop_run(candidate_drops):
-                        continue
-                    drop_set = set(combo)
-                    temp = [best_seq[k] for k in range(n) if k not in drop_set]
-                    temp, _ = self._normalize_sequence_after_drop(temp)
-                    sc, _ = self.base_opt.calculate_fitness(temp)
-                    if sc > best_combo_score:
-                        best_combo_score = sc
-                        best_combo = combo
-
-                if best_combo is None or best_combo_score <= 0:
+            # Birden fazla single drop birlikte kaldırılır (separator sorunu)
+            if beam_single_angles:
+                picked = self._best_single_drops(best_seq, best_pos_map, best_dropped, beam_single_angles)
+                if picked is None or picked[1] <= 0:
                     return None
+                best_combo = picked[0]
 
-                best_dropped = {k: v[:] for k, v in best_dropped.items()}
                 for ang, pos in zip(beam_single_angles, best_combo):
                     orig_idx = best_pos_map[pos]
                     best_dropped.setdefault(int(ang), []).append(orig_idx)
@@ -686,63 +1127,38 @@ class DropOffOptimizer:
                     best_pos_map.pop(pos)
                 # 0°-90° bitişiklik düzelt
                 best_seq, best_pos_map = self._normalize_sequence_after_drop(best_seq, best_pos_map)
-            elif len(beam_single_angles) == 1:
-                ang = beam_single_angles[0]
-                n = len(best_seq)
-                best_pos = None
-                best_sc = -1.0
-                for i in range(2, n - 2):
-                    if best_seq[i] != ang:
-                        continue
-                    candidate_drops = self._flatten_dropped_by_angle(best_dropped) + [best_pos_map[i]]
-                    if self._has_excessive_drop_run(candidate_drops):
-                        continue
-                    temp = best_seq[:i] + best_seq[i + 1:]
-                    temp, _ = self._normalize_sequence_after_drop(temp)
-                    sc, _ = self.base_opt.calculate_fitness(temp)
-                    if sc > best_sc:
-                        best_sc = sc
-                        best_pos = i
-                if best_pos is None or best_sc <= 0:
-                    return None
-                orig_idx = best_pos_map[best_pos]
-                best_dropped = {k: v[:] for k, v in best_dropped.items()}
-                best_dropped.setdefault(int(ang), []).append(orig_idx)
-                best_seq.pop(best_pos)
-                best_pos_map.pop(best_pos)
-                best_seq, best_pos_map = self._normalize_sequence_after_drop(best_seq, best_pos_map)
 
             # Final validation
-            final_score, _ = self.base_opt.calculate_fitness(best_seq)
+            final_score = self._cached_fitness(best_seq)
             if final_score <= 0:
                 return None
             return best_seq, float(final_score), {a: sorted(v) for a, v in best_dropped.items()}
 
-        # 1. Validation: Target counts kontrolü
-        current_counts = dict(Counter(self.master_sequence))
+        # 1. Validation: Target counts kontrolü (master histogramından vektörel)
+        target_angles = list(target_ply_counts.keys())
+        targets = np.array([target_ply_counts[a] for a in target_angles], dtype=np.int64)
+        current_counts = self._master_angle_counts(target_angles)
 
-        for angle, target_count in target_ply_counts.items():
-            current = current_counts.get(angle, 0)
+        invalid = np.flatnonzero((targets > current_counts) | (targets < 0))
+        if invalid.size:
+            i = int(invalid[0])
+            angle, target_count, current = target_angles[i], int(targets[i]), int(current_counts[i])
             if target_count > current:
                 raise ValueError(
                     "Angle {}°: hedef {} ama mevcut sadece {} katman var".format(angle, target_count, current)
                 )
-            if target_count < 0:
-                raise ValueError("Angle {}°: hedef sayı negatif olamaz".format(angle))
+            raise ValueError("Angle {}°: hedef sayı negatif olamaz".format(angle))
 
         # 2. Her açıdan kaç ply düşeceğini hesapla
-        drops_needed = {}
-        for angle, target_count in target_ply_counts.items():
-            current = current_counts.get(angle, 0)
-            if current > target_count:
-                drops_needed[angle] = current - target_count
+        deltas = (current_counts - targets).tolist()
+        drops_needed = {angle: delta for angle, delta in zip(target_angles, deltas) if delta > 0}
 
         # Toplam düşürülecek ply sayısı
         total_drops = sum(drops_needed.values())
 
         if total_drops == 0:
             # Hiç drop gerekmiyorsa master sequence'i döndür
-            score, _ = self.base_opt.calculate_fitness(self.master_sequence)
+            score = self._cached_fitness(self.master_sequence)
             return self.master_sequence[:], score, {}
 
         # 3. Her açı için drop edilebilir pozisyonları bul (sol yarıdan)
@@ -781,13 +1197,13 @@ class DropOffOptimizer:
                     break
             # Eğer hiçbiri tek değilse, herhangi birinden kır
             if break_pair_angle is None and drops_needed:
-                break_pair_angle = list(drops_needed.keys())[0]
+                break_pair_angle = next(iter(drops_needed))
 
         # Her açının simetrik (çift) drop sayısını belirle
         # Tek kalan 1 ply asimetrik drop ile çözülecek (hafif simetri kaybı kabul edilir)
         single_ply_drops = {}  # angle -> 1 (asimetrik tek ply drop gerekiyor)
 
-        for angle in list(drops_needed.keys()):
+        for angle in tuple(drops_needed):  # Döngüde silme olduğundan anlık görüntü
             if drops_needed[angle] % 2 != 0:
                 # Tek sayıda drop varsa, ortadaki ply bu açıdansa onu kullan
                 if master_is_odd and middle_angle == angle and not drop_middle:
@@ -804,197 +1220,83 @@ class DropOffOptimizer:
 
         angle_positions_left = {}  # Her açının sol yarıdaki pozisyonları
         angle_grouped_left = {}   # Her açının gruplanmış (ikili+) pozisyonları
+        angle_ungrouped_left = {}  # Gruplanmamış pozisyonlar
         all_angles_to_check = set(drops_needed.keys())
         if break_pair_angle:
             all_angles_to_check.add(break_pair_angle)
 
+        # Tüm açıların pozisyonları master üzerinde tek geçişte (açıya göre gruplanmış)
+        positions_by_angle = self._positions_by_angle()
+        no_positions = np.empty(0, dtype=np.intp)
+        # Komşusu (solu veya sağı) aynı açıda olan pozisyonlar
+        master_arr = self._master_arr
+        same_as_next = master_arr[1:] == master_arr[:-1]
+        has_twin = np.zeros(n, dtype=bool)
+        has_twin[1:] |= same_as_next
+        has_twin[:-1] |= same_as_next
+
         for angle in all_angles_to_check:
-            positions = [i for i in range(half) if self.master_sequence[i] == angle]
+            positions = positions_by_angle.get(angle, no_positions)
             # External plies koruması: ilk 2 katmanı koru (pozisyon 0 ve 1)
-            positions = [p for p in positions if p > 1]
+            positions = positions[(positions > 1) & (positions < half)]
             angle_positions_left[angle] = positions
 
             # Gruplanmış pozisyonları bul (yan yana aynı açı olan pozisyonlar)
             # Bu pozisyonlardan drop yapılırsa grouping kırılır
-            grouped = set()
-            for p in positions:
-                if p > 0 and self.master_sequence[p - 1] == angle:
-                    grouped.add(p)
-                if p < n - 1 and self.master_sequence[p + 1] == angle:
-                    grouped.add(p)
-            angle_grouped_left[angle] = [p for p in positions if p in grouped]
+            angle_grouped_left[angle] = positions[has_twin[positions]]
+            angle_ungrouped_left[angle] = positions[~has_twin[positions]]
 
         # Asimetrik tek-ply drop'lar için tüm pozisyonlar (sol+sağ yarı)
         angle_positions_all = {}
         for angle in single_ply_drops:
-            positions = [i for i in range(n) if self.master_sequence[i] == angle]
+            positions = positions_by_angle.get(angle, no_positions)
             # External plies koruması: ilk 2 ve son 2 katmanı koru
-            positions = [p for p in positions if 1 < p < n - 2]
-            angle_positions_all[angle] = positions
+            angle_positions_all[angle] = positions[(positions > 1) & (positions < n - 2)]
 
         # 4. En iyi drop kombinasyonunu bul
         best_candidate = None
         best_score = -1
         best_dropped_by_angle = {}
 
-        attempts = self.base_opt.ANGLE_TARGET_DROP_ATTEMPTS
-        for attempt_idx in range(attempts):
-            # Her açı için drop pozisyonları seç (sol yarıdan)
-            # %70 ihtimalle gruplanmış pozisyonları tercih et (grouping kırma stratejisi)
-            left_drops_by_angle = {}
-            valid = True
-            prefer_grouped = random.random() < 0.70
-
-            for angle, drop_count in drops_needed.items():
-                pairs_needed = drop_count // 2  # Simetrik droplar
-                available = angle_positions_left.get(angle, [])
-                grouped = angle_grouped_left.get(angle, [])
-
-                if len(available) < pairs_needed:
-                    valid = False
-                    break
-
-                if prefer_grouped and grouped:
-                    # Gruplanmış pozisyonlardan öncelikli seç
-                    ungrouped = [p for p in available if p not in grouped]
-                    if len(grouped) >= pairs_needed:
-                        selected = random.sample(grouped, pairs_needed)
-                    else:
-                        # Gruplanmış yetmiyorsa, kalanı ungrouped'dan al
-                        selected = list(grouped)
-                        remaining = pairs_needed - len(selected)
-                        if len(ungrouped) >= remaining:
-                            selected += random.sample(ungrouped, remaining)
-                        else:
-                            selected += ungrouped
-                    selected = selected[:pairs_needed]
-                else:
-                    selected = random.sample(available, pairs_needed)
-
-                left_drops_by_angle[angle] = sorted(selected)
-
-            if not valid:
-                continue
-
-            # Tüm drop pozisyonlarını birleştir
-            all_left_drops = []
-            for positions in left_drops_by_angle.values():
-                all_left_drops.extend(positions)
-            all_left_drops.sort()
-
-            # Ardışık drop kontrolü
-            if len(all_left_drops) > 1:
-                has_consecutive = any(
-                    all_left_drops[i + 1] - all_left_drops[i] == 1 for i in range(len(all_left_drops) - 1)
+        # Tüm denemeler tek seferde (attempts, n) drop maskesi olarak çekilir; filtreler ve
+        # seçim bu maske üzerinde
+        left_pools = {
+            angle: (angle_positions_left[angle], angle_grouped_left[angle], angle_ungrouped_left[angle])
+            for angle in drops_needed
+        }
+        break_pool = None
+        if break_pair_for_middle and break_pair_angle is not None:
+            break_pool = angle_positions_left.get(break_pair_angle, no_positions)
+        single_pools = [angle_positions_all[angle] for angle in single_ply_drops]
+        # Kapasiteler denemeden bağımsızdır: bir açının sol yarıda yeterli pozisyonu ya da
+        # tek-ply drop için hiç pozisyonu yoksa hiçbir deneme geçemez, doğrudan fallback'e geçilir
+        feasible = all(
+            angle_positions_left[angle].size >= drop_count // 2 for angle, drop_count in drops_needed.items()
+        ) and all(pool.size for pool in single_pools)
+        if feasible:
+            # Denemeler ANGLE_TARGET_EARLY_STOP_BLOCKS bloğa bölünür; aday bulunduktan sonra
+            # (3'lü grup sayısı, -skor) anahtarını iyileştirmeyen ilk blokta durulur.
+            # Eşitlikte önceki blok (dolayısıyla önceki deneme) kalır.
+            attempts = self.base_opt.ANGLE_TARGET_DROP_ATTEMPTS
+            block = max(1, -(-attempts // self.ANGLE_TARGET_EARLY_STOP_BLOCKS))
+            best_key = None
+            for start in range(0, attempts, block):
+                drop_mask = self._draw_angle_target_attempts(
+                    min(block, attempts - start),
+                    drops_needed,
+                    left_pools,
+                    middle_idx if drop_middle else None,
+                    break_pool,
+                    single_pools,
                 )
-                if has_consecutive:
-                    continue
-
-            # Simetrik pozisyonları ekle (sağ yarıdan)
-            all_drops = []
-            all_drop_angles = set(drops_needed.keys()) | set(single_ply_drops.keys())
-            dropped_by_angle = {angle: [] for angle in all_drop_angles}
-
-            for angle, left_positions in left_drops_by_angle.items():
-                for idx in left_positions:
-                    all_drops.append(idx)
-                    mirror_idx = n - 1 - idx
-                    all_drops.append(mirror_idx)
-                    dropped_by_angle[angle].extend([idx, mirror_idx])
-
-            # Ortadaki ply'ı drop et (eğer gerekiyorsa - Tek → Çift)
-            if drop_middle and middle_idx is not None:
-                all_drops.append(middle_idx)
-                if middle_angle not in dropped_by_angle:
-                    dropped_by_angle[middle_angle] = []
-                dropped_by_angle[middle_angle].append(middle_idx)
-
-            # Çift → Tek: Bir çifti kır - sadece mirror'ı drop et
-            break_pair_idx = None
-            if break_pair_for_middle and break_pair_angle is not None:
-                available_for_break = angle_positions_left.get(break_pair_angle, [])
-                # left_drops_by_angle'da kullanılmamış bir pozisyon seç
-                used_positions = left_drops_by_angle.get(break_pair_angle, [])
-                available_for_break = [p for p in available_for_break if p not in used_positions]
-
-                if available_for_break:
-                    break_pair_idx = random.choice(available_for_break)
-                    mirror_idx = n - 1 - break_pair_idx
-                    all_drops.append(mirror_idx)
-                    if break_pair_angle not in dropped_by_angle:
-                        dropped_by_angle[break_pair_angle] = []
-                    dropped_by_angle[break_pair_angle].append(mirror_idx)
-
-            # Asimetrik tek-ply drop'ları ekle (simetriyi hafifçe kırarak hedef açı sayısına ulaş)
-            single_valid = True
-            if single_ply_drops:
-                drops_set = set(all_drops)
-                for s_angle in single_ply_drops:
-                    available_for_single = [p for p in angle_positions_all.get(s_angle, [])
-                                            if p not in drops_set]
-                    if not available_for_single:
-                        single_valid = False
-                        break
-                    single_pos = random.choice(available_for_single)
-                    all_drops.append(single_pos)
-                    drops_set.add(single_pos)
-                    dropped_by_angle[s_angle].append(single_pos)
-
-            if not single_valid:
-                continue
-
-            all_drops.sort()
-            if self._has_excessive_drop_run(all_drops):
-                continue
-
-            # Yeni sequence oluştur
-            temp_seq = [ang for i, ang in enumerate(self.master_sequence) if i not in all_drops]
-
-            # Single drop'lar 0°-90° bitişiklik yaratmışsa swap ile düzelt
-            temp_seq, _ = self._normalize_sequence_after_drop(temp_seq)
-
-            # Fitness hesapla
-            score, details = self.base_opt.calculate_fitness(temp_seq)
-
-            # Hard constraint ihlali varsa atla
-            if score <= 0:
-                continue
-
-            # Hedef açı sayılarına ulaşıldı mı kontrol et (tam eşleşme)
-            temp_counts = Counter(temp_seq)
-
-            matches_target = True
-            for angle, orig_target in target_ply_counts.items():
-                actual_count = temp_counts.get(angle, 0)
-                if abs(actual_count - orig_target) > 0:
-                    matches_target = False
+                picked = self._select_angle_target_candidate(drop_mask, target_ply_counts)
+                key = (self._group_counts(picked[0])[0], -picked[1]) if picked is not None else None
+                if key is not None and (best_key is None or key < best_key):
+                    best_key = key
+                    best_candidate, best_score, best_dropped_by_angle = picked
+                elif best_key is not None:
                     break
 
-            if not matches_target:
-                continue
-
-            # Grouping kalite kontrolü: 4+ gruplar kesinlikle reddet
-            groups_of_4 = self.base_opt._find_groups_of_size(temp_seq, 4)
-            groups_of_5 = self.base_opt._find_groups_of_size(temp_seq, 5)
-            if groups_of_4 + groups_of_5 > 0:
-                continue
-
-            groups_of_3 = self.base_opt._find_groups_of_size(temp_seq, 3)
-
-            # Çok fazla 3'lü grup varsa reddet
-            if groups_of_3 > 4:
-                continue
-
-            # En iyi skoru güncelle (grouping kalitesi + fitness birlikte)
-            candidate_key = (groups_of_3, -score)  # Önce az 3'lü grup, sonra yüksek skor
-            best_key_current = (999, 0) if best_score < 0 else (getattr(self, '_best_g3', 999), -best_score)
-
-            if best_candidate is None or candidate_key < best_key_current:
-                best_score = score
-                self._best_g3 = groups_of_3
-                best_candidate = temp_seq
-                best_dropped_by_angle = {angle: sorted(positions) for angle, positions in dropped_by_angle.items()}
-
         if best_candidate is None:
             # Fallback: deterministic search (beam/greedy) to avoid "zone copying"
             # when random sampling can't find a feasible combination.
@@ -1,20 +1,44 @@
 import random
 import time
+from collections import Counter, deque
 from typing import Dict, List, Tuple, Any, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from functools import lru_cache
 import os
 
 import numpy as np
 
-# Surrogate model (opsiyonel - import hatasi olursa None kalir)
-_surrogate_model = None
-_surrogate_available = False
-try:
-    from ..ml.train_surrogate import load_surrogate, predict_fitness
-    _surrogate_available = True
-except ImportError:
-    pass
+# Surrogate model (opsiyonel). scikit-learn/joblib importu ağır olduğundan modül
+# yüklenirken değil, use_surrogate=True ile ilk optimizer oluşturulurken yapılır.
+_surrogate_api = None  # type: Optional[Any]
+
+
+def _get_surrogate_api() -> Optional[Tuple[Any, Any]]:
+    """(load_surrogate, predict_fitness) döndürür; ML bağımlılıkları yoksa None.
+    Yükleyici süreç içi önbelleklidir: model her optimizer için diskten okunmaz."""
+    global _surrogate_api
+    if _surrogate_api is None:
+        try:
+            from ..ml.train_surrogate import load_surrogate_cached, predict_fitness
+            _surrogate_api = (load_surrogate_cached, predict_fitness)
+        except ImportError:
+            _surrogate_api = False
+    return _surrogate_api or None
+
+# Standart açı alfabesi için kompakt kodlama (0/±45/90 -> 0..3)
+ENC = {0: 0, 45: 1, -45: 2, 90: 3}  # type: Dict[int, int]
+DEC = {code: angle for angle, code in ENC.items()}  # type: Dict[int, int]
+
+
+def encode_sequence(sequence: List[int]) -> np.ndarray:
+    """Açı dizilimini uint8 kod dizisine çevir (yalnızca standart açılar)."""
+    return np.fromiter((ENC[a] for a in sequence), dtype=np.uint8, count=len(sequence))
+
+
+def decode_sequence(codes: np.ndarray) -> List[int]:
+    """encode_sequence tersine: kod dizisinden Python int açı listesine."""
+    return [DEC[int(c)] for c in codes]
 
 
 class LaminateOptimizer:
@@ -40,6 +64,20 @@ class LaminateOptimizer:
     DISTRIBUTION_STD_RATIO = 0.7
     DROP_OFF_ATTEMPTS = 3000
     ANGLE_TARGET_DROP_ATTEMPTS = 3000
+    FITNESS_CACHE_LIMIT = 20000  # Önbellek bu boyuta ulaşınca temizlenir (bellek sınırı)
+
+    # Skeleton önbelleği (süreç içi, tüm örnekler arasında paylaşılır): aynı konfigürasyon
+    # için tekrar eden benchmark koşularında Phase 1'i yeniden yapmamak için
+    _skeleton_cache = {}  # type: Dict[Tuple[frozenset, frozenset, frozenset], List[int]]
+
+    # calculate_fitness_fast dizilerinde kural sırası (indeks 0..7)
+    RULE_KEYS = ("R1", "R2", "R3", "R4", "R5", "R6", "R7", "R8")
+
+    # _check_hard_constraints: bu uzunluktan itibaren 0°/90° komşuluk taraması NumPy ile yapılır
+    HARD_SCAN_NUMPY_MIN = 256
+
+    # R5 pozisyon taramasındaki standart açı sırası: 0, 45, -45, 90
+    _STANDARD_ANGLES = np.array([0, 45, -45, 90], dtype=np.int8)
 
     DEFAULT_HARD_RULES = {
         "external_0": True,
@@ -49,13 +87,31 @@ class LaminateOptimizer:
     }
 
     def __init__(self, ply_counts: Dict[int, int], weights: Optional[Dict[str, float]] = None,
-                 use_surrogate: bool = False, hard_rules: Optional[Dict[str, bool]] = None):
+                 use_surrogate: bool = False, hard_rules: Optional[Dict[str, bool]] = None,
+                 rng: Optional[np.random.Generator] = None, surrogate_model: Optional[Any] = None,
+                 ga_backend: str = "thread"):
         self.ply_counts = ply_counts
+
+        # Multi-start GA paralel backend'i: "thread" (varsayılan) veya "process". "process" her
+        # çağrıda yeni bir süreç havuzu açar; yalnızca en üst seviyede (süreç havuzu işçisi
+        # olmayan çağıranlarda) kullanılmalı, aksi halde iç içe havuzlar ~cpu² süreç başlatır.
+        self.ga_backend = ga_backend
+
+        # Örneğe özel RNG: verilen Generator'dan (tekrarlanabilir) veya rastgele tohumdan.
+        # Skaler çekilişler (GA mutasyonları) için ondan tohumlanan random.Random kullanılır;
+        # toplu çekilişler (SA programı) doğrudan self.rng ile yapılır.
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self._random = random.Random(int(self.rng.integers(2 ** 63)))
+
         self.initial_pool = []  # type: List[int]
         for angle, count in ply_counts.items():
             self.initial_pool.extend([angle] * int(count))
 
         self.total_plies = len(self.initial_pool)
+        # Açı -> havuzdaki katman sayısı (tek Counter geçişi). Anahtar sırası set(initial_pool)
+        # iterasyon sırasıdır; _create_symmetric_individual'daki RNG seçimleri bu sıraya bağlıdır
+        pool_counter = Counter(self.initial_pool)
+        self._pool_counts = {angle: pool_counter[angle] for angle in set(self.initial_pool)}  # type: Dict[int, int]
         # Kural agirliklari: verilirse kullan, yoksa sinif varsayilaninin kopyasi
         if weights is not None:
             self.WEIGHTS = dict(weights)
@@ -73,11 +129,41 @@ class LaminateOptimizer:
         self._use_surrogate = use_surrogate
         self._surrogate_eval_count = 0
         self._real_eval_count = 0
-        if use_surrogate and _surrogate_available:
-            self._surrogate = load_surrogate()
+        surrogate_api = _get_surrogate_api() if use_surrogate else None
+        if surrogate_api is not None:
+            load_surrogate, self._predict_fitness = surrogate_api
+            # Önceden yüklenmiş model verilirse disk/önbellek hiç kullanılmaz
+            self._surrogate = surrogate_model if surrogate_model is not None else load_surrogate()
             if self._surrogate is not None:
                 print("Surrogate model yuklendi - hizlandirilmis mod aktif")
 
+        # Fitness önbelleği: aynı dizilim (elitler, geri alınan swap'lar, tekrar eden
+        # adaylar) tekrar tekrar skorlanmasın. Anahtar: tuple(sequence)
+        self._fitness_cache = {}  # type: Dict[Tuple[int, ...], Tuple[float, Dict[str, Any]]]
+        self._grouping_cache = {}  # type: Dict[Tuple[int, ...], Tuple[Dict[str, int], int]]
+        self._fast_fitness_cache = {}  # type: Dict[Tuple[int, ...], Tuple[float, np.ndarray, np.ndarray]]
+        # calculate_fitness_batch satır önbelleği; anahtar: _seq_dtype satırın baytları (uzunluk dahil)
+        self._batch_fitness_cache = {}  # type: Dict[bytes, float]
+        # Surrogate tahminleri; model ve ply_counts örnek boyunca sabit
+        self._surrogate_cache = {}  # type: Dict[Tuple[int, ...], float]
+        self._position_profile_cache = {}  # type: Dict[int, Dict[str, np.ndarray]]
+
+        # NumPy taramaları (RLE, simetri) için dizilim dtype'ı; standart dışı açılar
+        # (ör. 135°) da taşmadan sığar
+        self._seq_dtype = np.int16
+
+    def clear_fitness_cache(self) -> None:
+        """Fitness ve grouping önbelleklerini temizle."""
+        self._fitness_cache.clear()
+        self._fast_fitness_cache.clear()
+        self._batch_fitness_cache.clear()
+        self._surrogate_cache.clear()
+        self._grouping_cache.clear()
+
+    def _as_array(self, sequence) -> np.ndarray:
+        """Dizilimi (liste veya ndarray) kompakt NumPy dizisine çevir; kopya yapmaz."""
+        return np.asarray(sequence, dtype=self._seq_dtype)
+
     def _hard_rule_enabled(self, key: str) -> bool:
         return bool(self.hard_rules.get(key, self.DEFAULT_HARD_RULES.get(key, True)))
 
@@ -85,12 +171,9 @@ class LaminateOptimizer:
         return 2 if self._hard_rule_enabled("external_45") else 0
 
     def _is_symmetric(self, sequence: List[int]) -> bool:
-        """Sequence simetrik mi kontrol et."""
-        n = len(sequence)
-        for i in range(n // 2):
-            if sequence[i] != sequence[n - 1 - i]:
-                return False
-        return True
+        """Sequence simetrik mi kontrol et (vektörel: a == a[::-1])."""
+        a = self._as_array(sequence)
+        return bool(np.array_equal(a, a[::-1]))
 
     def _create_symmetric_individual(self) -> List[int]:
         """
@@ -102,10 +185,8 @@ class LaminateOptimizer:
         half = total // 2
         is_odd_total = total % 2 == 1
 
-        # Her açının sayısını hesapla
-        angle_total_counts = {}
-        for angle in set(self.initial_pool):
-            angle_total_counts[angle] = self.initial_pool.count(angle)
+        # Her açının sayısı (__init__'te bir kez sayılır)
+        angle_total_counts = self._pool_counts.copy()
 
         # Tek sayıda olan açıları bul
         odd_angles = [ang for ang, cnt in angle_total_counts.items() if cnt % 2 == 1]
@@ -113,9 +194,9 @@ class LaminateOptimizer:
         middle_ply = None
         if is_odd_total:
             if odd_angles:
-                middle_ply = random.choice(odd_angles)
+                middle_ply = self._random.choice(odd_angles)
             else:
-                middle_ply = random.choice(list(angle_total_counts.keys()))
+                middle_ply = self._random.choice(list(angle_total_counts.keys()))
 
         # Sol yarı için açı sayıları
         angle_counts_for_left = {}
@@ -135,7 +216,7 @@ class LaminateOptimizer:
 
             if available_45 >= 1 and available_m45 >= 1:
                 # İdeal: 45, -45 veya -45, 45 alternasyonu
-                if random.random() < 0.5:
+                if self._random.random() < 0.5:
                     left_half = [45, -45]
                 else:
                     left_half = [-45, 45]
@@ -161,7 +242,7 @@ class LaminateOptimizer:
 
         # Kalan pozisyonları doldur
         pool_copy = self.initial_pool[:]
-        random.shuffle(pool_copy)
+        self._random.shuffle(pool_copy)
 
         for ply in pool_copy:
             target_count = angle_counts_for_left.get(ply, 0)
@@ -178,11 +259,14 @@ class LaminateOptimizer:
                     left_half.append(ply)
                     angle_counts_left[ply] += 1
             if len(left_half) < half:
+                # Sol yarıdaki gerçek açı sayıları (dış ±45 ataması dahil), eklemelerle güncellenir
+                left_counter = Counter(left_half)
                 for ply in pool_copy:
                     if len(left_half) >= half:
                         break
-                    if left_half.count(ply) < angle_total_counts[ply] // 2 + 1:
+                    if left_counter[ply] < angle_total_counts[ply] // 2 + 1:
                         left_half.append(ply)
+                        left_counter[ply] += 1
                 break
 
         lock_count = self._locked_outer_ply_count()
@@ -203,13 +287,17 @@ class LaminateOptimizer:
         else:
             sequence = left_half + right_half
 
-        sequence = self._fix_adjacent_0_90(sequence, enabled=self._hard_rule_enabled("adjacent_0_90"))
+        sequence = self._fix_adjacent_0_90(
+            sequence,
+            enabled=self._hard_rule_enabled("adjacent_0_90"),
+            locked=self._locked_outer_ply_count(),
+        )
 
         # Validation
         assert len(sequence) == total, "Sequence length mismatch: {} != {}".format(len(sequence), total)
-        for angle in set(self.initial_pool):
-            expected = self.initial_pool.count(angle)
-            actual = sequence.count(angle)
+        sequence_counts = Counter(sequence)
+        for angle, expected in self._pool_counts.items():
+            actual = sequence_counts[angle]
             assert expected == actual, "Angle {} count mismatch: expected {}, got {}".format(angle, expected, actual)
 
         return sequence
@@ -233,16 +321,15 @@ class LaminateOptimizer:
         if n == 0:
             return plies
 
-        # Tüm plyleri karıştır, sonra 0-90 bitişiklik ve grouping kontrolü ile yerleştir
-        # 90°'yi sadece iç %20'den uzak tut, geri kalanı serbest dağıt
-        pool = plies[:]
-        random.shuffle(pool)
+        # Tüm plyleri karıştır (tek toplu permütasyon çekilişi), sonra 0-90 bitişiklik ve
+        # grouping kontrolü ile yerleştir; 90°'yi sadece iç %20'den uzak tut, geri kalanı serbest dağıt
+        pool = [plies[i] for i in self.rng.permutation(n).tolist()]
 
         # İç %20'lik yasak bölge (merkeze yakın kısım)
         forbidden_start = int(n * 0.80)  # Son %20 = merkeze yakın
 
         result = []
-        remaining = list(pool)
+        remaining = pool
 
         while remaining:
             pos = len(result)  # Şu anki yerleştirme pozisyonu
@@ -278,76 +365,79 @@ class LaminateOptimizer:
         return result
 
     @staticmethod
-    def _fix_adjacent_0_90(seq, enabled: bool = True):
-        """0° ve 90° yan yana geliyorsa swap yaparak düzelt."""
+    def _fix_adjacent_0_90(seq, enabled: bool = True, locked: int = 0):
+        """0° ve 90° yan yana geliyorsa swap yaparak düzelt.
+
+        Soldan sağa tek tarama: (i, i+1) ihlalinde önce i+1, olmazsa i pozisyonundaki ply,
+        en yakından uzağa doğru ilk uygun pozisyonla yer değiştirir. Uygun swap (i, i+1)'i
+        temizler ve dokunduğu komşuluklardaki toplam ihlali azaltır; her swap ihlal sayısını
+        düşürdüğünden tarama yalnızca swap'ın dokunduğu en sol komşuluğa geri döner. Her iki
+        uçtaki `locked` katman swap'a katılmaz.
+        """
         if not enabled:
             return seq[:]
         seq = seq[:]
-        max_attempts = len(seq) * 3
-        attempt = 0
-        while attempt < max_attempts:
-            found = False
-            for i in range(len(seq) - 1):
-                a, b = seq[i], seq[i + 1]
-                if (a == 0 and b == 90) or (a == 90 and b == 0):
-                    # i+1 pozisyonunu başka bir uygun pozisyonla swap et
-                    swapped = False
-                    candidates = list(range(len(seq)))
-                    random.shuffle(candidates)
-                    for j in candidates:
-                        if j == i or j == i + 1:
-                            continue
-                        # Swap sonrası yeni ihlal oluşmayacağını kontrol et
-                        seq[i + 1], seq[j] = seq[j], seq[i + 1]
-                        ok = True
-                        # i ve i+1 arası
-                        if i + 1 < len(seq):
-                            a2, b2 = seq[i], seq[i + 1]
-                            if (a2 == 0 and b2 == 90) or (a2 == 90 and b2 == 0):
-                                ok = False
-                        # j-1 ve j arası
-                        if ok and j > 0:
-                            a2, b2 = seq[j - 1], seq[j]
-                            if (a2 == 0 and b2 == 90) or (a2 == 90 and b2 == 0):
-                                ok = False
-                        # j ve j+1 arası
-                        if ok and j < len(seq) - 1:
-                            a2, b2 = seq[j], seq[j + 1]
-                            if (a2 == 0 and b2 == 90) or (a2 == 90 and b2 == 0):
-                                ok = False
-                        if ok:
-                            swapped = True
-                            break
-                        else:
-                            # Geri al
-                            seq[i + 1], seq[j] = seq[j], seq[i + 1]
-                    if swapped:
-                        found = True
+        n = len(seq)
+
+        forbidden = {(0, 90), (90, 0)}
+
+        def dirty(k):
+            # k, k+1 komşuluğu 0°/90° mı (dizi dışı komşuluklar temiz sayılır)
+            return 0 <= k < n - 1 and (seq[k], seq[k + 1]) in forbidden
+
+        def try_move(p, partner, i):
+            # p'deki ply'ı en yakın uygun j ile değiştir; başarılıysa dokunulan en sol komşuluk
+            for d in range(1, n):
+                for j in (p + d, p - d):
+                    if j == partner or not locked <= j < n - locked:
+                        continue
+                    touched = {p - 1, p, j - 1, j}
+                    dirty_before = sum(dirty(k) for k in touched)
+                    seq[p], seq[j] = seq[j], seq[p]
+                    if not dirty(i) and sum(dirty(k) for k in touched) < dirty_before:
+                        return min(touched)
+                    # Geri al
+                    seq[p], seq[j] = seq[j], seq[p]
+            return None
+
+        i = 0
+        while i < n - 1:
+            if not dirty(i):
+                i += 1
+                continue
+            restart = None
+            for p, partner in ((i + 1, i), (i, i + 1)):
+                if locked <= p < n - locked:
+                    restart = try_move(p, partner, i)
+                    if restart is not None:
                         break
-            if not found:
-                break
-            attempt += 1
+            # Düzeltilemeyen ihlal olduğu gibi bırakılır
+            i = max(restart, 0) if restart is not None else i + 1
         return seq
 
     def _check_symmetry_distance_weighted(self, sequence: List[int]) -> float:
         """Rule 1: Distance-weighted symmetry penalty."""
         penalty = 0.0
-        n = len(sequence)
+        seq = sequence
+        n = len(seq)
         mid = (n - 1) / 2
+        mid_norm = max(1, mid)
         max_penalty = self.WEIGHTS["R1"]
 
         for i in range(n // 2):
-            if sequence[i] != sequence[-1 - i]:
+            if seq[i] != seq[-1 - i]:
                 # Middle plane'e yakınsa daha az penalty
-                dist_from_mid = abs(i - mid) / max(1, mid)
+                dist_from_mid = abs(i - mid) / mid_norm
                 penalty += max_penalty * dist_from_mid
 
         return min(penalty, max_penalty)
 
     def _check_balance_45(self, sequence: List[int]) -> float:
         """Rule 2: ±45 balance check."""
-        diff = abs(sequence.count(45) - sequence.count(-45))
-        total_45_count = sequence.count(45) + sequence.count(-45)
+        count_p45 = sequence.count(45)
+        count_m45 = sequence.count(-45)
+        diff = abs(count_p45 - count_m45)
+        total_45_count = count_p45 + count_m45
         max_penalty = self.WEIGHTS["R2"]
 
         if total_45_count > 0:
@@ -413,23 +503,41 @@ class LaminateOptimizer:
         max_penalty = self.WEIGHTS["R5"]
         per_angle_penalty = max_penalty / 4
 
-        for angle in [0, 45, -45, 90]:
-            indices = [i for i, x in enumerate(sequence) if x == angle]
-
-            if len(indices) > 1:
-                ideal_spacing = n / len(indices)
-                actual_spacings = np.diff(indices)
+        # Dört açının pozisyonları tek np.nonzero ile (açı sırasıyla, her açıda artan);
+        # aralıklar ve ortalamadan sapma kareleri tüm açılar için tek seferde. std, np.std
+        # ile aynı adımlardır: float64 ortalama, açının dilimi üzerinde sum (aynı toplama
+        # sırası), / k, sqrt
+        arr = self._as_array(sequence)
+        angle_rows, positions = np.nonzero(arr == self._STANDARD_ANGLES[:, None])
+        counts = np.bincount(angle_rows, minlength=4).tolist()
+        spacings = np.diff(positions)[angle_rows[1:] == angle_rows[:-1]]
+        sizes = np.maximum(np.array(counts) - 1, 0)
+        squared_devs = None
+        if spacings.size:
+            # Tam sayı aralıkların toplamı float64'te kesindir; sıra farkı ortalamayı etkilemez
+            valid = sizes > 0
+            means = np.zeros(4, dtype=np.float64)
+            means[valid] = np.add.reduceat(spacings, (np.cumsum(sizes) - sizes)[valid]) / sizes[valid]
+            deviations = spacings - np.repeat(means, sizes)
+            squared_devs = deviations * deviations
+        spacing_start = 0
+        position_start = 0
+
+        for count in counts:
+            if count > 1:
+                ideal_spacing = n / count
+                first = int(positions[position_start])
+                last = int(positions[position_start + count - 1])
 
                 # Bileşen 1: Spacing standart sapması (%60 ağırlık)
-                if len(actual_spacings) > 0:
-                    std_dev = np.std(actual_spacings)
-                    normalized_std = min(1.0, std_dev / max(ideal_spacing, 1.0))
-                    penalty += normalized_std * per_angle_penalty * 0.6
+                std_dev = np.sqrt(squared_devs[spacing_start:spacing_start + count - 1].sum() / (count - 1))
+                normalized_std = min(1.0, std_dev / max(ideal_spacing, 1.0))
+                penalty += normalized_std * per_angle_penalty * 0.6
 
                 # Bileşen 2: Bölge kümeleme cezası (%40 ağırlık)
                 # Eğer bir açının ilk ve son görüldüğü yer arasındaki mesafe
                 # sequence uzunluğunun %60'ından azsa, kümelenmiş demektir
-                span = indices[-1] - indices[0]
+                span = last - first
                 span_ratio = span / max(1, n - 1)
                 target_span = 0.6  # En az %60 kaplamasını iste
 
@@ -438,34 +546,60 @@ class LaminateOptimizer:
                     clustering = (target_span - span_ratio) / target_span
                     penalty += clustering * per_angle_penalty * 0.4
 
+            spacing_start += max(count - 1, 0)
+            position_start += count
+
         return min(penalty, max_penalty)
 
     def _count_groupings(self, sequence: List[int]) -> int:
-        """Sequence'deki toplam grouping sayısını döndür (adjacent pairs)."""
-        count = 0
-        for i in range(1, len(sequence)):
-            if sequence[i] == sequence[i - 1]:
-                count += 1
-        return count
+        """Sequence'deki toplam grouping sayısını döndür (adjacent pairs).
+
+        Kısa listelerde Python döngüsü (mutasyon adayları), uzun dizilim/ndarray'lerde
+        tek komşu eşitlik maskesi.
+        """
+        if type(sequence) is list and len(sequence) < self.HARD_SCAN_NUMPY_MIN:
+            count = 0
+            for i in range(1, len(sequence)):
+                if sequence[i] == sequence[i - 1]:
+                    count += 1
+            return count
+        arr = self._as_array(sequence)
+        return int(np.count_nonzero(arr[1:] == arr[:-1]))
 
     def _find_groups_of_size(self, sequence: List[int], target_size: int) -> int:
         """Belirli boyutta grupları say (örn: 3'lü gruplar)."""
         if len(sequence) < target_size:
             return 0
-        count = 0
-        curr = 1
-        for i in range(1, len(sequence)):
-            if sequence[i] == sequence[i - 1]:
-                curr += 1
-            else:
-                if curr == target_size:
-                    count += 1
-                curr = 1
-        if curr == target_size:
-            count += 1
-        return count
+        runs, _ = self._run_lengths(self._as_array(sequence))
+        return int(np.count_nonzero(runs == target_size))
+
+    @staticmethod
+    def _run_lengths(arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(run uzunlukları, run son indeksleri) — açı değişim sınırlarından tek geçişte."""
+        if arr.size == 0:
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        bounds = np.flatnonzero(np.concatenate(([True], arr[1:] != arr[:-1], [True])))
+        return np.diff(bounds), bounds[1:] - 1
 
     def _grouping_stats(self, sequence: List[int]) -> Dict[str, int]:
+        """Grouping istatistikleri (önbellekli). Bkz. _compute_grouping_stats."""
+        return self._grouping_profile(sequence)[0]
+
+    def _grouping_profile(self, sequence: List[int]) -> Tuple[Dict[str, int], int]:
+        """(grouping istatistikleri, 0°/90° adjacent pair sayısı) — tek RLE geçişi, önbellekli.
+        Rule 6 ve raporlama aynı geçişi paylaşır."""
+        key = tuple(sequence)
+        cached = self._grouping_cache.get(key)
+        if cached is not None:
+            return cached
+        profile = self._compute_grouping_stats(sequence)
+        if len(self._grouping_cache) >= self.FITNESS_CACHE_LIMIT:
+            self._grouping_cache.clear()
+        self._grouping_cache[key] = profile
+        return profile
+
+    def _compute_grouping_stats(self, sequence: List[int]) -> Tuple[Dict[str, int], int]:
         """
         Grouping istatistikleri:
         - adjacent_pairs: yan yana aynı açı sayısı toplamı (her run için run_len-1)
@@ -474,6 +608,7 @@ class LaminateOptimizer:
         - groups_len_3: uzunluğu ==3 olan run sayısı
         - groups_len_ge4: uzunluğu >=4 olan run sayısı
         - max_run: en uzun run uzunluğu
+        İkinci eleman: 0° veya 90° run'larındaki adjacent pair sayısı (Rule 6 ekstra cezası).
         """
         if not sequence:
             return {
@@ -483,43 +618,23 @@ class LaminateOptimizer:
                 "groups_len_3": 0,
                 "groups_len_ge4": 0,
                 "max_run": 0,
-            }
+            }, 0
 
-        adjacent_pairs = 0
-        group_runs = 0
-        groups_len_2 = 0
-        groups_len_3 = 0
-        groups_len_ge4 = 0
-        max_run = 1
-
-        curr = 1
-        for i in range(1, len(sequence)):
-            if sequence[i] == sequence[i - 1]:
-                curr += 1
-            else:
-                if curr >= 2:
-                    group_runs += 1
-                    adjacent_pairs += (curr - 1)
-                    if curr == 2:
-                        groups_len_2 += 1
-                    elif curr == 3:
-                        groups_len_3 += 1
-                    elif curr >= 4:
-                        groups_len_ge4 += 1
-                max_run = max(max_run, curr)
-                curr = 1
-
-        # finalize last run
-        if curr >= 2:
-            group_runs += 1
-            adjacent_pairs += (curr - 1)
-            if curr == 2:
-                groups_len_2 += 1
-            elif curr == 3:
-                groups_len_3 += 1
-            elif curr >= 4:
-                groups_len_ge4 += 1
-        max_run = max(max_run, curr)
+        # Run-length encoding (NumPy): açı değiştiği indekslerden run uzunlukları
+        arr = self._as_array(sequence)
+        runs, run_ends = self._run_lengths(arr)
+        grouped = runs[runs >= 2]
+
+        adjacent_pairs = int((grouped - 1).sum())
+        group_runs = len(grouped)
+        groups_len_2 = int((runs == 2).sum())
+        groups_len_3 = int((runs == 3).sum())
+        groups_len_ge4 = int((runs >= 4).sum())
+        max_run = int(runs.max())
+
+        run_angles = arr[run_ends]
+        is_0_90 = (run_angles == 0) | (run_angles == 90)
+        adjacent_pairs_0_90 = int((runs[is_0_90] - 1).sum())
 
         return {
             "adjacent_pairs": int(adjacent_pairs),
@@ -528,7 +643,7 @@ class LaminateOptimizer:
             "groups_len_3": int(groups_len_3),
             "groups_len_ge4": int(groups_len_ge4),
             "max_run": int(max_run),
-        }
+        }, adjacent_pairs_0_90
 
     def _check_grouping(self, sequence: List[int], max_group: int = 3) -> float:
         """Rule 6: Grouping kontrolü - max 3 ply üst üste + toplam grouping minimize.
@@ -540,21 +655,12 @@ class LaminateOptimizer:
         - Toplam adjacent pairs oranı → genel grouping kalitesi
         """
         penalty = 0.0
-        max_group_found = 1
-        curr = 1
-        total_adjacent_pairs = 0
-        adjacent_pairs_0_90 = 0  # 0° veya 90° yan yana sayısı
         max_penalty = self.WEIGHTS["R6"]
 
-        for i in range(1, len(sequence)):
-            if sequence[i] == sequence[i - 1]:
-                curr += 1
-                total_adjacent_pairs += 1
-                if sequence[i] in (0, 90):
-                    adjacent_pairs_0_90 += 1
-            else:
-                curr = 1
-            max_group_found = max(max_group_found, curr)
+        # Tek RLE geçişi (raporlamadaki _grouping_stats ile paylaşılır)
+        gstats, adjacent_pairs_0_90 = self._grouping_profile(sequence)  # 0° veya 90° yan yana sayısı
+        max_group_found = max(1, gstats["max_run"])
+        total_adjacent_pairs = gstats["adjacent_pairs"]
 
         # Penalty 1: Max group > 3 ise yüksek penalty
         if max_group_found > max_group:
@@ -562,7 +668,7 @@ class LaminateOptimizer:
             penalty += excess * (max_penalty * 0.35)
 
         # Penalty 2: 3'lü gruplar için belirgin penalty
-        groups_of_3 = self._find_groups_of_size(sequence, 3)
+        groups_of_3 = gstats["groups_len_3"]
         penalty += groups_of_3 * 2.0
 
         # Penalty 3: 0°/90° grouping ekstra cezası (yapısal olarak daha zararlı)
@@ -584,26 +690,18 @@ class LaminateOptimizer:
         Sadece çok ortaya yakın olanlar cezalandırılır (hafif tolerans).
         """
         max_penalty = self.WEIGHTS["R7"]
-        n = len(sequence)
-        mid = (n - 1) / 2
 
-        positions_45 = [i for i, ang in enumerate(sequence) if abs(ang) == 45]
+        arr = self._as_array(sequence)
+        is_45 = (arr == 45) | (arr == -45)
+        total_45_count = int(np.count_nonzero(is_45))
 
-        if not positions_45:
+        if not total_45_count:
             return 0.0
 
-        # Sadece en iç %15'lik bölgede penalty ver
-        center_zone = 0.15
-        penalty_sum = 0.0
-
-        for pos in positions_45:
-            dist = abs(pos - mid) / max(1, mid)
+        # Sadece en iç %15'lik bölgede penalty ver (pozisyon terimleri n başına önbellekte,
+        # bölge dışı terimler 0.0); pozisyon sırasıyla toplanır
+        penalty_sum = sum(self._position_profiles(arr.size)["r7"][is_45].tolist())
 
-            if dist < center_zone:
-                proximity = (center_zone - dist) / center_zone
-                penalty_sum += (proximity ** 0.5) * 0.5  # Çok yumuşak ceza
-
-        total_45_count = len(positions_45)
         if total_45_count > 0:
             normalized_penalty = (penalty_sum / total_45_count) * max_penalty
         else:
@@ -618,27 +716,19 @@ class LaminateOptimizer:
         Ortaya yakın 90°'ler agresif şekilde cezalandırılır.
         """
         max_penalty = self.WEIGHTS["R8"]
-        threshold = self.LATERAL_BENDING_THRESHOLD  # 0.25
-        n = len(sequence)
-        mid = (n - 1) / 2
 
-        positions_90 = [i for i, ang in enumerate(sequence) if ang == 90]
+        arr = self._as_array(sequence)
+        is_90 = arr == 90
+        total_90_count = int(np.count_nonzero(is_90))
 
-        if not positions_90:
+        if not total_90_count:
             return 0.0
 
-        penalty_sum = 0.0
-        center_hits = 0
-        for pos in positions_90:
-            dist = abs(pos - mid) / max(1, mid)
-            if dist < threshold:
-                proximity = (threshold - dist) / threshold
-                # Daha agresif ceza eğrisi: düşük üs + yüksek çarpan
-                penalty_sum += (proximity ** 0.4) * 1.5
-                if dist < 0.20:
-                    center_hits += 1
-
-        total_90_count = len(positions_90)
+        # Eşik (LATERAL_BENDING_THRESHOLD) içindeki 90°'ler; terimler n başına önbellekte
+        prof = self._position_profiles(arr.size)
+        penalty_sum = sum(prof["r8"][is_90].tolist())
+        center_hits = int(np.count_nonzero(is_90 & prof["r8_center"]))
+
         if total_90_count > 0:
             normalized_penalty = (penalty_sum / total_90_count) * max_penalty
         else:
@@ -660,9 +750,53 @@ class LaminateOptimizer:
                 return True
         return False
 
-    def _symmetry_preserving_swap(self, sequence: List[int]) -> None:
+    def _grouping_reducing_swaps(self, sequence: List[int], min_idx: int) -> List[Tuple[int, int]]:
+        """
+        Grouping'i azaltan ve (kural açıksa) 0°/90° komşuluğu oluşturmayan simetrik swap
+        çiftleri (i, j), min_idx <= i < j < n // 2.
+
+        Tüm adaylar tek (çift sayısı, n) matriste kurulur ve komşu eşitlikleri satır bazında
+        sayılır; çift başına liste kopyası + tam sayım döngüsü yoktur. Sıra, iç içe i/j
+        döngüsüyle aynıdır (np.triu_indices satır öncelikli).
+        """
+        n = len(sequence)
+        half = n // 2
+        arr = self._as_array(sequence)
+        pairs_i, pairs_j = np.triu_indices(max(half - min_idx, 0), k=1)
+        pairs_i += min_idx
+        pairs_j += min_idx
+        rows = np.arange(pairs_i.size)
+
+        candidates = np.tile(arr, (pairs_i.size, 1))
+        candidates[rows, pairs_i] = arr[pairs_j]
+        candidates[rows, pairs_j] = arr[pairs_i]
+        candidates[rows, n - 1 - pairs_i] = arr[n - 1 - pairs_j]
+        candidates[rows, n - 1 - pairs_j] = arr[n - 1 - pairs_i]
+
+        left, right = candidates[:, :-1], candidates[:, 1:]
+        reduces = (left == right).sum(axis=1) < self._count_groupings(sequence)
+        if self._hard_rule_enabled("adjacent_0_90"):
+            reduces &= ~(((left == 0) & (right == 90)) | ((left == 90) & (right == 0))).any(axis=1)
+        keep = np.flatnonzero(reduces)
+        return list(zip(pairs_i[keep].tolist(), pairs_j[keep].tolist()))
+
+    def _has_adjacent_0_90_around(self, sequence, positions):
+        """positions'daki ply'lara komşu bağlarda 0-90 yan yana var mi kontrol et."""
+        n = len(sequence)
+        for p in positions:
+            for k in (p - 1, p):
+                if 0 <= k < n - 1:
+                    a, b = sequence[k], sequence[k + 1]
+                    if (a == 0 and b == 90) or (a == 90 and b == 0):
+                        return True
+        return False
+
+    def _symmetry_preserving_swap(self, sequence: List[int], assume_clean: bool = False) -> None:
         """Simetriyi koruyarak swap yap - sol yarıda swap, sağ yarıda mirror.
-        İlk 2 ve son 2 pozisyon (±45°) ASLA swap edilmez."""
+        İlk 2 ve son 2 pozisyon (±45°) ASLA swap edilmez.
+
+        assume_clean=True: sequence'ta 0-90 ihlali olmadığı biliniyorsa yalnızca swap'ın
+        dokunduğu bağlar kontrol edilir (tam taramayla aynı sonuç)."""
         n = len(sequence)
         half = n // 2
 
@@ -671,8 +805,8 @@ class LaminateOptimizer:
             return
 
         # Sol yarıdan iki index seç (pozisyon 2'den başla)
-        i = random.randint(min_idx, half - 1)
-        j = random.randint(min_idx, half - 1)
+        i = self._random.randint(min_idx, half - 1)
+        j = self._random.randint(min_idx, half - 1)
 
         if i == j:
             return
@@ -686,7 +820,10 @@ class LaminateOptimizer:
         sequence[i_mirror], sequence[j_mirror] = sequence[j_mirror], sequence[i_mirror]
 
         # 0-90 yan yana oluştuysa geri al
-        if self._hard_rule_enabled("adjacent_0_90") and self._has_adjacent_0_90(sequence):
+        if self._hard_rule_enabled("adjacent_0_90") and (
+            self._has_adjacent_0_90_around(sequence, (i, j, i_mirror, j_mirror))
+            if assume_clean else self._has_adjacent_0_90(sequence)
+        ):
             sequence[i], sequence[j] = sequence[j], sequence[i]
             sequence[i_mirror], sequence[j_mirror] = sequence[j_mirror], sequence[i_mirror]
 
@@ -700,28 +837,11 @@ class LaminateOptimizer:
         if half <= min_idx:
             return False
 
-        current_groupings = self._count_groupings(sequence)
-
-        good_swaps = []
-
-        for i in range(min_idx, half):
-            for j in range(i + 1, half):
-                candidate = sequence[:]
-                candidate[i], candidate[j] = candidate[j], candidate[i]
-                mirror_i = n - 1 - i
-                mirror_j = n - 1 - j
-                candidate[mirror_i], candidate[mirror_j] = candidate[mirror_j], candidate[mirror_i]
-
-                candidate_groupings = self._count_groupings(candidate)
-
-                if candidate_groupings < current_groupings and (
-                    not self._hard_rule_enabled("adjacent_0_90") or not self._has_adjacent_0_90(candidate)
-                ):
-                    good_swaps.append((i, j))
+        good_swaps = self._grouping_reducing_swaps(sequence, min_idx)
 
         if good_swaps:
             # Random bir grouping-azaltan swap seç
-            i, j = random.choice(good_swaps)
+            i, j = self._random.choice(good_swaps)
             sequence[i], sequence[j] = sequence[j], sequence[i]
             mirror_i = n - 1 - i
             mirror_j = n - 1 - j
@@ -730,9 +850,12 @@ class LaminateOptimizer:
 
         return False  # Grouping azaltan swap bulunamadı
 
-    def _balance_aware_mutation(self, sequence: List[int]) -> None:
+    def _balance_aware_mutation(self, sequence: List[int], assume_clean: bool = False) -> None:
         """Balance'ı koruyarak mutasyon yap - +45 ile -45 swap et (simetrik).
-        İlk 2 pozisyon (±45°) korunur."""
+        İlk 2 pozisyon (±45°) korunur.
+
+        ±45 takası 0-90 komşuluğu oluşturamaz; assume_clean=True ise (sequence'ta ihlal
+        yok) geri alma kontrolü atlanır."""
         n = len(sequence)
         half = n // 2
         min_idx = self._locked_outer_ply_count()
@@ -742,8 +865,8 @@ class LaminateOptimizer:
         neg_45_left = [i for i in range(min_idx, half) if sequence[i] == -45]
 
         if pos_45_left and neg_45_left:
-            i1 = random.choice(pos_45_left)
-            i2 = random.choice(neg_45_left)
+            i1 = self._random.choice(pos_45_left)
+            i2 = self._random.choice(neg_45_left)
 
             # Sol yarıda swap
             sequence[i1], sequence[i2] = sequence[i2], sequence[i1]
@@ -753,21 +876,41 @@ class LaminateOptimizer:
             i2_mirror = n - 1 - i2
             sequence[i1_mirror], sequence[i2_mirror] = sequence[i2_mirror], sequence[i1_mirror]
 
-            # 0-90 yan yana oluştuysa geri al
-            if self._hard_rule_enabled("adjacent_0_90") and self._has_adjacent_0_90(sequence):
+            # 0-90 yan yana oluştuysa geri al (önceden var olan ihlal)
+            if (not assume_clean and self._hard_rule_enabled("adjacent_0_90")
+                    and self._has_adjacent_0_90(sequence)):
                 sequence[i1], sequence[i2] = sequence[i2], sequence[i1]
                 sequence[i1_mirror], sequence[i2_mirror] = sequence[i2_mirror], sequence[i1_mirror]
 
-    def _build_smart_skeleton(self) -> List[int]:
+    def _skeleton_cache_key(self) -> Tuple[frozenset, frozenset, frozenset]:
+        return (
+            frozenset(self.ply_counts.items()),
+            frozenset(self.hard_rules.items()),
+            frozenset(self.WEIGHTS.items()),
+        )
+
+    def _build_smart_skeleton(self, use_cache: bool = False) -> List[int]:
         """Kuralları sırayla tatmin eden başlangıç sequence oluştur (simetrik).
-        Birden fazla aday oluşturur, en iyisini döndürür."""
+        Birden fazla aday oluşturur, en iyisini döndürür.
+
+        use_cache=True ise aynı ply_counts/hard_rules/weights için süreç içinde ilk üretilen
+        skeleton yeniden kullanılır (benchmark tekrarları için). Restart'lar çeşitlilik
+        için varsayılan olarak her seferinde yeni skeleton üretir."""
+        if use_cache:
+            key = self._skeleton_cache_key()
+            cached = LaminateOptimizer._skeleton_cache.get(key)
+            if cached is None:
+                cached = self._build_smart_skeleton(use_cache=False)
+                LaminateOptimizer._skeleton_cache[key] = cached
+            return cached[:]
+
         best_skeleton = None
         best_score = -1
         n_candidates = 15  # 15 aday üret, en iyisini seç
 
         for _ in range(n_candidates):
             candidate = self._create_symmetric_individual()
-            score, _ = self.calculate_fitness(candidate)
+            score = self.calculate_fitness_fast(candidate)[0]
             if score > best_score:
                 best_score = score
                 best_skeleton = candidate
@@ -787,11 +930,23 @@ class LaminateOptimizer:
         if (use_surrogate_if_available and self._surrogate is not None
                 and self._use_surrogate):
             self._surrogate_eval_count += 1
-            score = predict_fitness(self._surrogate, sequence, self.ply_counts)
+            cache = self._surrogate_cache
+            key = tuple(sequence)
+            score = cache.get(key)
+            if score is None:
+                score = self._predict_fitness(self._surrogate, sequence, self.ply_counts)
+                if len(cache) >= self.FITNESS_CACHE_LIMIT:
+                    cache.clear()
+                cache[key] = score
             return score, None
         else:
             self._real_eval_count += 1
-            return self.calculate_fitness(sequence)
+            return self.calculate_fitness_fast(sequence)[0], None
+
+    def _score_population(self, population: List[List[int]]) -> List[Tuple[float, List[int]]]:
+        """Popülasyonu calculate_fitness_batch ile skorla: [(fit, ind), ...]."""
+        fits = self.calculate_fitness_batch(np.asarray(population, dtype=self._seq_dtype))
+        return list(zip(fits.tolist(), population))
 
     def _run_single_ga(self, args: Tuple) -> Tuple[List[int], float, int]:
         """Single GA run for parallel processing.
@@ -801,16 +956,19 @@ class LaminateOptimizer:
         skeleton, run, population_size, generations, stagnation_limit = args
 
         # Initial population from mutated skeleton
+        # Swap'lar yalnızca ihlal oluşturmuyorsa kalır: skeleton temizse bireyler de temiz
+        # kalır ve mutasyonlar tam 0-90 taraması yerine dokunulan bağlara bakar
+        skeleton_clean = not self._has_adjacent_0_90(skeleton)
         population = []
         for i in range(population_size):
             mutated = skeleton[:]
             n_mutations = (run + 1) + (i // 15)
             for _ in range(n_mutations):
                 # %30 balance-aware, %70 symmetry-preserving
-                if random.random() < 0.3:
-                    self._balance_aware_mutation(mutated)
+                if self._random.random() < 0.3:
+                    self._balance_aware_mutation(mutated, assume_clean=skeleton_clean)
                 else:
-                    self._symmetry_preserving_swap(mutated)
+                    self._symmetry_preserving_swap(mutated, assume_clean=skeleton_clean)
             population.append(mutated)
 
         best_seq = None
@@ -825,16 +983,21 @@ class LaminateOptimizer:
             use_real = (_gen % calibration_interval == 0) or self._surrogate is None
             use_surr = not use_real
 
-            scored = []
-            for ind in population:
-                fit, _ = self._evaluate_fitness(ind, use_surrogate_if_available=use_surr)
-                scored.append((fit, ind))
+            if use_surr:
+                scored = []
+                for ind in population:
+                    fit, _ = self._evaluate_fitness(ind, use_surrogate_if_available=True)
+                    scored.append((fit, ind))
+            else:
+                # Gerçek fitness: tüm popülasyon tek vektörel geçişte
+                self._real_eval_count += len(population)
+                scored = self._score_population(population)
 
             scored.sort(reverse=True, key=lambda x: x[0])
 
             # En iyi bireyin gercek fitnesini hesapla (surrogate kullanildiysa bile)
             if use_surr and scored[0][0] > best_fit:
-                real_fit, _ = self.calculate_fitness(scored[0][1])
+                real_fit = self.calculate_fitness_fast(scored[0][1])[0]
                 real_fit = float(real_fit)
                 if real_fit > best_fit:
                     best_fit = real_fit
@@ -842,8 +1005,9 @@ class LaminateOptimizer:
                     generations_without_improvement = 0
                 else:
                     generations_without_improvement += 1
-            elif scored[0][0] > best_fit:
-                best_fit = scored[0][0]
+            elif scored[0][0] > best_fit and self.calculate_fitness_fast(scored[0][1])[0] > best_fit:
+                # Batch skoru sıralama içindir; en iyi skor kesin fitness ile kaydedilir
+                best_fit = self.calculate_fitness_fast(scored[0][1])[0]
                 best_seq = scored[0][1][:]
                 generations_without_improvement = 0
             else:
@@ -863,8 +1027,8 @@ class LaminateOptimizer:
             next_gen = elite[:]
 
             while len(next_gen) < population_size:
-                parent = random.choice(elite)[:]
-                r = random.random()
+                parent = self._random.choice(elite)[:]
+                r = self._random.random()
                 if r < 0.35:
                     if not self._grouping_aware_mutation(parent):
                         self._symmetry_preserving_swap(parent)
@@ -872,7 +1036,7 @@ class LaminateOptimizer:
                     self._balance_aware_mutation(parent)
                 else:
                     # Birden fazla swap (exploration)
-                    for _ in range(random.randint(1, 3)):
+                    for _ in range(self._random.randint(1, 3)):
                         self._symmetry_preserving_swap(parent)
                 next_gen.append(parent)
 
@@ -880,17 +1044,23 @@ class LaminateOptimizer:
 
         return (best_seq, best_fit, run)
 
-    def _multi_start_ga(self, skeleton: List[int], n_runs: int = 7, parallel: bool = True) -> Tuple[List[int], float]:
+    def _multi_start_ga(self, skeleton: List[int], n_runs: int = 7, parallel: bool = True,
+                        backend: Optional[str] = None) -> Tuple[List[int], float]:
         """Multi-start GA: Skeleton'dan başlayarak farklı local optima'lara bakar.
 
         Args:
             skeleton: Starting sequence
             n_runs: Number of independent GA runs
-            parallel: Use multiprocessing for parallel runs (default: True)
+            parallel: Run the GA starts concurrently (default: True)
+            backend: "thread" veya "process" (ProcessPoolExecutor, GIL'i aşar; yalnızca en üst
+                seviyede). None ise örneğin ga_backend ayarı kullanılır.
         """
         print("Phase 2: Multi-Start GA")
 
-        skeleton_score, _ = self.calculate_fitness(skeleton)
+        # Her multi-start GA çağrısı temiz önbellekle başlar (bellek sınırlı kalsın)
+        self.clear_fitness_cache()
+
+        skeleton_score = self.calculate_fitness_fast(skeleton)[0]
         print("  Skeleton score: {:.2f}/100".format(skeleton_score))
 
         # Optimized parameters: Balance speed and quality
@@ -905,11 +1075,13 @@ class LaminateOptimizer:
 
         best_global = skeleton[:]
         best_score = skeleton_score
+        if backend is None:
+            backend = self.ga_backend
 
         if parallel and n_runs > 1:
-            # Paralel işleme: ThreadPoolExecutor (Windows uyumlu)
-            n_threads = min(os.cpu_count() or 4, n_runs)
-            print(f"  Running {n_runs} GA runs in parallel (using {n_threads} threads)")
+            # Paralel işleme: her GA başlangıcı bağımsız, en sonda en iyisi seçilir.
+            # Süreç havuzu yalnızca backend="process" ile (en üst seviyede) açılır.
+            n_workers = min(os.cpu_count() or 4, n_runs)
 
             # Prepare arguments for each run
             run_args = [
@@ -917,17 +1089,42 @@ class LaminateOptimizer:
                 for run in range(n_runs)
             ]
 
-            # Execute runs in parallel
-            with ThreadPoolExecutor(max_workers=n_threads) as executor:
-                futures = {executor.submit(self._run_single_ga, args): args[1] for args in run_args}
-                results = []
-                for future in as_completed(futures):
-                    run_num = futures[future]
-                    try:
-                        result = future.result()
-                        results.append(result)
-                    except Exception as e:
-                        print(f"  Run {run_num + 1} failed: {e}")
+            results = []
+            if backend == "process":
+                print(f"  Running {n_runs} GA runs in parallel (using {n_workers} processes)")
+                # Her süreç farklı RNG tohumu alır, böylece koşular birbirinden ayrışır
+                seeds = self.rng.integers(2 ** 32, size=n_runs).tolist()
+                try:
+                    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                        futures = {
+                            executor.submit(_run_single_ga_in_process, self, args, seed): args[1]
+                            for args, seed in zip(run_args, seeds)
+                        }
+                        for future in as_completed(futures):
+                            run_num = futures[future]
+                            try:
+                                results.append(future.result())
+                            except BrokenProcessPool:
+                                raise
+                            except Exception as e:
+                                print(f"  Run {run_num + 1} failed: {e}")
+                except (BrokenProcessPool, OSError) as e:
+                    # Süreç başlatılamadıysa (kısıtlı ortam vb.) thread'lere düş
+                    print(f"  Process pool kullanilamadi ({e}), thread'lere geciliyor")
+                    results = []
+                    backend = "thread"
+
+            if backend != "process":
+                print(f"  Running {n_runs} GA runs in parallel (using {n_workers} threads)")
+                with ThreadPoolExecutor(max_workers=n_workers) as executor:
+                    futures = {executor.submit(self._run_single_ga, args): args[1] for args in run_args}
+                    for future in as_completed(futures):
+                        run_num = futures[future]
+                        try:
+                            result = future.result()
+                            results.append(result)
+                        except Exception as e:
+                            print(f"  Run {run_num + 1} failed: {e}")
 
             # Find best result
             for best_seq, best_fit, run in results:
@@ -946,7 +1143,7 @@ class LaminateOptimizer:
                     n_mutations = (run + 1) + (i // 15)
                     for _ in range(n_mutations):
                         # %30 balance-aware, %70 symmetry-preserving
-                        if random.random() < 0.3:
+                        if self._random.random() < 0.3:
                             self._balance_aware_mutation(mutated)
                         else:
                             self._symmetry_preserving_swap(mutated)
@@ -957,15 +1154,12 @@ class LaminateOptimizer:
                 generations_without_improvement = 0
 
                 for _gen in range(generations):
-                    scored = []
-                    for ind in population:
-                        fit, _ = self.calculate_fitness(ind)
-                        scored.append((fit, ind))
+                    scored = self._score_population(population)
 
                     scored.sort(reverse=True, key=lambda x: x[0])
 
-                    if scored[0][0] > best_fit:
-                        best_fit = scored[0][0]
+                    if scored[0][0] > best_fit and self.calculate_fitness_fast(scored[0][1])[0] > best_fit:
+                        best_fit = self.calculate_fitness_fast(scored[0][1])[0]
                         best_seq = scored[0][1][:]
                         generations_without_improvement = 0
                     else:
@@ -984,8 +1178,8 @@ class LaminateOptimizer:
                     next_gen = elite[:]
 
                     while len(next_gen) < population_size:
-                        parent = random.choice(elite)[:]
-                        r = random.random()
+                        parent = self._random.choice(elite)[:]
+                        r = self._random.random()
                         if r < 0.35:
                             if not self._grouping_aware_mutation(parent):
                                 self._symmetry_preserving_swap(parent)
@@ -993,7 +1187,7 @@ class LaminateOptimizer:
                             self._balance_aware_mutation(parent)
                         else:
                             # Birden fazla swap (exploration)
-                            for _ in range(random.randint(1, 3)):
+                            for _ in range(self._random.randint(1, 3)):
                                 self._symmetry_preserving_swap(parent)
                         next_gen.append(parent)
 
@@ -1014,9 +1208,12 @@ class LaminateOptimizer:
         print("Phase 3: Local Search")
 
         current = sequence[:]
-        current_score, _ = self.calculate_fitness(current)
-        current_groupings = self._count_groupings(current)
-        current_groups_of_3 = self._find_groups_of_size(current, 3)
+        current_score = self.calculate_fitness_fast(current)[0]
+        # Grouping sayıları fitness'ın (Rule 6) önbelleğe aldığı RLE profilinden okunur;
+        # aday başına ayrı Python taramaları yapılmaz
+        gstats = self._grouping_stats(current)
+        current_groupings = gstats["adjacent_pairs"]
+        current_groups_of_3 = gstats["groups_len_3"]
         print(
             "  Initial score: {:.2f}, Groupings: {}, Groups of 3: {}".format(
                 current_score, current_groupings, current_groups_of_3
@@ -1043,14 +1240,15 @@ class LaminateOptimizer:
                     mirror_j = n - 1 - j
                     candidate[mirror_i], candidate[mirror_j] = candidate[mirror_j], candidate[mirror_i]
 
-                    candidate_score, _ = self.calculate_fitness(candidate)
+                    candidate_score = self.calculate_fitness_fast(candidate)[0]
 
                     # Score 0 = hard constraint ihlali, atla
                     if candidate_score <= 0:
                         continue
 
-                    candidate_groupings = self._count_groupings(candidate)
-                    candidate_groups_of_3 = self._find_groups_of_size(candidate, 3)
+                    gstats = self._grouping_stats(candidate)
+                    candidate_groupings = gstats["adjacent_pairs"]
+                    candidate_groups_of_3 = gstats["groups_len_3"]
 
                     grouping_change = current_groupings - candidate_groupings
                     groups_of_3_change = current_groups_of_3 - candidate_groups_of_3
@@ -1072,8 +1270,9 @@ class LaminateOptimizer:
                 if candidate_score > current_score:
                     current = candidate
                     current_score = candidate_score
-                    current_groupings = self._count_groupings(candidate)
-                    current_groups_of_3 = self._find_groups_of_size(candidate, 3)
+                    gstats = self._grouping_stats(candidate)
+                    current_groupings = gstats["adjacent_pairs"]
+                    current_groups_of_3 = gstats["groups_len_3"]
                     improved = True
                     improvements += 1
                     print(
@@ -1094,21 +1293,135 @@ class LaminateOptimizer:
 
             iteration += 1
 
-        final_groups_of_3 = self._find_groups_of_size(current, 3)
+        gstats = self._grouping_stats(current)
+        final_groups_of_3 = gstats["groups_len_3"]
         print(
             "  Final score: {:.2f}/100, Final groupings: {}, Final groups of 3: {}".format(
-                current_score, self._count_groupings(current), final_groups_of_3
+                current_score, gstats["adjacent_pairs"], final_groups_of_3
             )
         )
         return current, current_score
 
+    SA_DEFAULT_ITERATIONS = 2000
+    SA_WARMUP_STEPS = 50
+    SA_ACCEPT_WINDOW = 100     # Kabul oranı penceresi (son N iterasyon)
+    SA_MIN_ITER_BEFORE_STOP = 200
+
+    def _sa_neighbor(self, current: List[int], min_idx: int, half: int,
+                     i: Optional[int] = None, j: Optional[int] = None) -> Optional[List[int]]:
+        """SA komşusu: sol yarıda (i, j) swap + sağ yarıda mirror. Değişiklik yoksa None.
+        i/j verilmezse rastgele seçilir."""
+        if i is None or j is None:
+            i = self._random.randint(min_idx, half - 1)
+            j = self._random.randint(min_idx, half - 1)
+        if i == j or current[i] == current[j]:
+            return None
+        n = len(current)
+        candidate = current[:]
+        candidate[i], candidate[j] = candidate[j], candidate[i]
+        mirror_i = n - 1 - i
+        mirror_j = n - 1 - j
+        candidate[mirror_i], candidate[mirror_j] = candidate[mirror_j], candidate[mirror_i]
+        return candidate
+
+    def _sa_auto_schedule(self, sequence: List[int], n_iter: int, min_idx: int, half: int) -> Tuple[float, float]:
+        """SA sıcaklık programını otomatik ayarla.
+
+        Kısa bir random-walk ısınmasında |dE| örneklenir: T0 = |dE|'nin 80. yüzdeliği,
+        T_final = tipik (medyan) kötüleşmenin ~%1 olasılıkla kabul edildiği sıcaklık,
+        alpha = (T_final / T0) ** (1 / n_iter).
+        """
+        deltas = []
+        walk = list(sequence)
+        walk_score = self.calculate_fitness_fast(walk)[0]
+        for _ in range(self.SA_WARMUP_STEPS):
+            candidate = self._sa_neighbor(walk, min_idx, half)
+            if candidate is None:
+                continue
+            candidate_score = self.calculate_fitness_fast(candidate)[0]
+            if candidate_score <= 0:
+                continue
+            deltas.append(abs(candidate_score - walk_score))
+            walk, walk_score = candidate, candidate_score
+
+        deltas = np.asarray([d for d in deltas if d > 0], dtype=np.float64)
+        if deltas.size == 0:
+            return 2.0, 0.995
+
+        T0 = float(np.percentile(deltas, 80))
+        T_final = float(np.median(deltas)) / np.log(100.0)
+        alpha = (T_final / T0) ** (1.0 / max(1, n_iter)) if T0 > 0 else 0.995
+        return T0, float(min(alpha, 1.0))
+
+    def _simulated_annealing(self, sequence: List[int], T0: Optional[float] = None, alpha: Optional[float] = None,
+                             n_iter: Optional[int] = None) -> Tuple[List[int], float]:
+        """Simulated annealing: simetri koruyan swap komşuluğu + Metropolis kabulü.
+        Kötüleştiren hamleler exp(dE/T) olasılıkla kabul edilir; T geometrik soğur (T_i = T0 * alpha^i).
+        İlk 2 pozisyon (±45°) korunur. En iyi görülen dizilim döner.
+        T0/alpha verilmezse _sa_auto_schedule ile ısınma turundan ayarlanır.
+
+        u < exp(dE/T) <=> dE > T*ln(u) olduğundan kabul eşikleri döngüden önce vektörel
+        hesaplanır; döngü içinde exp() çağrısı yapılmaz."""
+        print("Phase 3: Simulated Annealing")
+
+        current = list(sequence)
+        current_score = self.calculate_fitness_fast(current)[0]
+        best, best_score = current[:], current_score
+
+        n = len(current)
+        half = n // 2
+        min_idx = self._locked_outer_ply_count()
+        if half - min_idx < 2:
+            return best, best_score
+
+        if n_iter is None:
+            n_iter = self.SA_DEFAULT_ITERATIONS
+        if T0 is None or alpha is None:
+            auto_T0, auto_alpha = self._sa_auto_schedule(current, n_iter, min_idx, half)
+            T0 = auto_T0 if T0 is None else T0
+            alpha = auto_alpha if alpha is None else alpha
+        print("  Initial score: {:.2f}, T0: {:.3f}, alpha: {:.4f}".format(current_score, T0, alpha))
+
+        # Sıcaklık programı, Metropolis eşikleri ve swap indeksleri (tek seferde, NumPy ile)
+        T_schedule = T0 * alpha ** np.arange(n_iter)
+        accept_threshold = (T_schedule * np.log(1.0 - self.rng.random(n_iter))).tolist()
+        swap_indices = self.rng.integers(min_idx, half, size=(n_iter, 2)).tolist()
+
+        # Erken durdurma: düşük T'de SA ~ hill climbing; son pencerede hiç kabul yoksa dur
+        accept_window = deque(maxlen=self.SA_ACCEPT_WINDOW)
+
+        accepted = 0
+        last_it = -1
+        for it in range(n_iter):
+            last_it = it
+            is_accepted = False
+            candidate = self._sa_neighbor(current, min_idx, half, *swap_indices[it])
+            if candidate is not None:
+                candidate_score = self.calculate_fitness_fast(candidate)[0]
+                # Score 0 = hard constraint ihlali, asla kabul etme
+                if candidate_score > 0 and candidate_score - current_score >= accept_threshold[it]:
+                    current, current_score = candidate, candidate_score
+                    accepted += 1
+                    is_accepted = True
+                    if current_score > best_score:
+                        best, best_score = current[:], current_score
+
+            accept_window.append(1 if is_accepted else 0)
+            if it > self.SA_MIN_ITER_BEFORE_STOP and sum(accept_window) == 0:
+                print("  Early stop at iteration {} (no accepted moves in last {})".format(it, self.SA_ACCEPT_WINDOW))
+                break
+
+        T = float(T_schedule[last_it]) if last_it >= 0 else T0
+        print("  Final score: {:.2f}/100 ({} accepted moves, final T: {:.4f})".format(best_score, accepted, T))
+        return best, best_score
+
     def generate_hybrid_candidates(self, n_restarts: int = 3) -> Tuple[List[Dict[str, Any]], List[float]]:
         """Run multiple independent hybrid pipelines and keep all restart winners."""
         print("=" * 60)
         print("3-PHASE HYBRID OPTIMIZATION (MULTI-RESTART)")
         print("=" * 60)
 
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         candidates = []
         overall_best_score = -1.0
 
@@ -1117,17 +1430,17 @@ class LaminateOptimizer:
 
             print("\nPhase 1: Smart Skeleton Construction")
             skeleton = self._build_smart_skeleton()
-            phase1_score, _ = self.calculate_fitness(skeleton)
+            phase1_score = self.calculate_fitness_fast(skeleton)[0]
             print("  Score: {:.2f}/100".format(phase1_score))
 
-            phase2_start = time.time()
+            phase2_start = time.perf_counter_ns()
             n_runs = 5 if self.total_plies <= 40 else 7
             best_seq, _phase2_score = self._multi_start_ga(skeleton, n_runs=n_runs)
-            print("  Time: {:.2f}s".format(time.time() - phase2_start))
+            print("  Time: {:.2f}s".format((time.perf_counter_ns() - phase2_start) / 1e9))
 
-            phase3_start = time.time()
+            phase3_start = time.perf_counter_ns()
             final_seq, final_score = self._local_search(best_seq, max_iter=60)
-            print("  Time: {:.2f}s".format(time.time() - phase3_start))
+            print("  Time: {:.2f}s".format((time.perf_counter_ns() - phase3_start) / 1e9))
 
             print("  Restart {} result: {:.2f}/100".format(restart + 1, final_score))
 
@@ -1142,7 +1455,7 @@ class LaminateOptimizer:
             )
             overall_best_score = max(overall_best_score, float(final_score))
 
-        total_time = time.time() - start_time
+        total_time = (time.perf_counter_ns() - start_time) / 1e9
 
         print("\n" + "=" * 60)
         print("FINAL RESULT: {:.2f}/100 (in {:.2f}s, {} restarts)".format(
@@ -1164,45 +1477,294 @@ class LaminateOptimizer:
         """
         PDF kurallarına göre fitness hesapla.
         Max score = 100 (tüm rule weights toplamı)
+
+        Sonuçlar dizilim bazında önbelleğe alınır; dönen details dict'i paylaşımlıdır,
+        çağıran taraf değiştirmemelidir. ndarray dizilimler de kabul edilir.
         """
-        WEIGHTS = self.WEIGHTS
+        # Sıcak yol: yerel bağlama, isinstance yok (PyPy JIT dostu). ndarray girdi sınırda
+        # bir kez tolist() ile Python int'lerine çevrilir (NumPy skaler kutulama yok).
+        if type(sequence) is np.ndarray:
+            sequence = sequence.tolist()
+        cache = self._fitness_cache
+        key = tuple(sequence)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        if type(sequence) is not list:
+            sequence = [int(a) for a in sequence]
+        result = self._compute_fitness(sequence)
+        if len(cache) >= self.FITNESS_CACHE_LIMIT:
+            cache.clear()
+        cache[key] = result
+        return result
 
-        rules_result = {}
+    def evaluate_all(self, sequence: List[int]) -> Tuple[float, Dict[str, Any], Dict[str, int]]:
+        """Fitness + grouping istatistikleri tek seferde: (total, details, grouping).
+        Grouping, fitness (Rule 6) sırasında hesaplanan RLE geçişinden gelir."""
+        total, details = self.calculate_fitness(sequence)
+        return total, details, self._grouping_stats(sequence)
 
-        # ========== HARD CONSTRAINTS ==========
+    def calculate_fitness_fast(self, sequence: List[int]) -> Tuple[float, np.ndarray, np.ndarray]:
+        """Dict üretmeyen fitness: (total, scores[8], weights[8]); indeks 0..7 = R1..R8.
+
+        GA / local search / SA iç döngüleri için; details gerekmiyorsa bunu kullanın.
+        Hard constraint ihlalinde total=0 ve scores sıfırdır.
+        """
+        if type(sequence) is np.ndarray:
+            sequence = sequence.tolist()
+        cache = self._fast_fitness_cache
+        key = tuple(sequence)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        if type(sequence) is not list:
+            sequence = [int(a) for a in sequence]
+        hard, scores, _penalties, weights = self._compute_rule_arrays(sequence)
+        if hard is not None:
+            scores = np.zeros(len(self.RULE_KEYS), dtype=np.float64)
+        # Toplam, dict yolundaki gibi R1..R8 sırasıyla Python float olarak toplanır
+        total = float(sum(scores.tolist()))
+        result = (total, scores, weights)
+        if len(cache) >= self.FITNESS_CACHE_LIMIT:
+            cache.clear()
+        cache[key] = result
+        return result
+
+    def _position_profiles(self, n: int) -> Dict[str, np.ndarray]:
+        """Uzunluk n için pozisyona bağlı sabit ağırlıklar (R1/R7/R8), n başına önbellekli."""
+        cached = self._position_profile_cache.get(n)
+        if cached is not None:
+            return cached
+        mid = (n - 1) / 2
+        dist = np.abs(np.arange(n) - mid) / max(1, mid)
+        # Pozisyon terimleri skaler Python üs almasıyla (pow): _check_buckling /
+        # _check_lateral_bending toplamları önceki pozisyon döngüsüyle bit düzeyinde aynı
+        dists = dist.tolist()
+
+        # R7: en iç %15'lik bölgede ±45 cezası
+        center_zone = 0.15
+        r7 = np.array(
+            [((center_zone - d) / center_zone) ** 0.5 * 0.5 if d < center_zone else 0.0 for d in dists],
+            dtype=np.float64,
+        )
+
+        # R8: eşik içindeki 90° cezası + merkez isabetleri
+        threshold = self.LATERAL_BENDING_THRESHOLD
+        r8 = np.array(
+            [((threshold - d) / threshold) ** 0.4 * 1.5 if d < threshold else 0.0 for d in dists],
+            dtype=np.float64,
+        )
+        r8_center = (dist < threshold) & (dist < 0.20)
+
+        profiles = {
+            "r1": (self.WEIGHTS["R1"] * dist)[: n // 2],
+            "r7": r7,
+            "r8": r8,
+            "r8_center": r8_center,
+        }
+        self._position_profile_cache[n] = profiles
+        return profiles
 
+    def calculate_fitness_batch(self, pop: np.ndarray) -> np.ndarray:
+        """Aynı uzunluktaki dizilimlerden oluşan popülasyonun toplam skorları (m,).
+
+        pop: (m, n) açı matrisi. R1..R8 ve hard constraint'ler satır bazında NumPy
+        indirgemeleriyle hesaplanır; GA'da sıralama için kullanılır. Yuvarlama
+        np.round ile yapıldığından calculate_fitness ile ±0.01 farklılık olabilir.
+
+        Satır skorları bayt anahtarıyla önbelleğe alınır: GA'da elitler her nesilde
+        aynen taşındığından ve mutasyonlar sık sık aynı dizilimi ürettiğinden yalnızca
+        daha önce görülmemiş, tekil satırlar hesaplanır.
+        """
+        P = np.asarray(pop, dtype=self._seq_dtype)
+        if P.ndim != 2:
+            raise ValueError("pop (m, n) boyutlu olmalı")
+        m, n = P.shape
+        if m == 0:
+            return np.zeros(0, dtype=np.float64)
+        if n == 0:
+            return np.array([self.calculate_fitness_fast([])[0]] * m, dtype=np.float64)
+
+        cache = self._batch_fitness_cache
+        keys = [row.tobytes() for row in P]
+        # Bu çağrının skorları yerel dict'te toplanır: önbellek temizlense de sonuç eksiksiz
+        found = {}  # type: Dict[bytes, float]
+        missing = {}  # type: Dict[bytes, int]
+        for idx, key in enumerate(keys):
+            if key in found or key in missing:
+                continue
+            cached = cache.get(key)
+            if cached is None:
+                missing[key] = idx
+            else:
+                found[key] = cached
+
+        if missing:
+            hard, scores, _penalties, _groups = self.calculate_rules_batch(P[list(missing.values())])
+            totals = np.round(scores, 2).sum(axis=1)
+            totals[hard] = 0.0
+            new_scores = dict(zip(missing, totals.tolist()))
+            found.update(new_scores)
+            if len(cache) + len(new_scores) > self.FITNESS_CACHE_LIMIT:
+                cache.clear()
+            cache.update(new_scores)
+
+        return np.array([found[key] for key in keys], dtype=np.float64)
+
+    def calculate_rules_batch(
+        self, pop: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """calculate_fitness_batch'in kural bazlı çıktısı (m satır, n >= 1):
+
+        (hard (m,) bool, scores (m, 8), penalties (m, 8), groups (m, 2) = [3'lü grup, 4+ grup]).
+        scores/penalties yuvarlanmamıştır; hard satırlarda da soft kurallar hesaplanır.
+        """
+        P = np.asarray(pop, dtype=self._seq_dtype)
+        m, n = P.shape
+
+        W = self.WEIGHTS
+        prof = self._position_profiles(n)
+        is0 = P == 0
+        is90 = P == 90
+        is45 = P == 45
+        ism45 = P == -45
+
+        # ========== HARD CONSTRAINTS ==========
+        hard = np.zeros(m, dtype=bool)
+        if self._hard_rule_enabled("external_0"):
+            hard |= is0[:, 0] | is0[:, -1]
+        if self._hard_rule_enabled("adjacent_0_90") and n > 1:
+            hard |= ((is0[:, :-1] & is90[:, 1:]) | (is90[:, :-1] & is0[:, 1:])).any(axis=1)
+        if self._hard_rule_enabled("external_45") and n >= 4:
+            outer = np.abs(P[:, [0, 1, n - 2, n - 1]].astype(np.int16))
+            hard |= (outer != 45).any(axis=1)
+
+        penalties = np.zeros((m, 8), dtype=np.float64)
+
+        # R1: Symmetry (distance-weighted)
+        half = n // 2
+        mismatch = P[:, :half] != P[:, ::-1][:, :half]
+        penalties[:, 0] = np.minimum(mismatch @ prof["r1"], W["R1"])
+
+        # R2: ±45 balance
+        c45 = is45.sum(axis=1)
+        cm45 = ism45.sum(axis=1)
+        total_45 = c45 + cm45
+        norm = np.minimum(1.0, np.abs(c45 - cm45) / np.maximum(1, total_45 // 2))
+        penalties[:, 1] = np.where(total_45 > 0, W["R2"] * norm, 0.0)
+
+        # R3: Percentage (8-67%)
+        counts = np.stack([is0.sum(axis=1), c45, cm45, is90.sum(axis=1)], axis=1)
+        ratios = counts / n
+        violations = ((ratios < 0.08) | (ratios > 0.67)).sum(axis=1)
+        penalties[:, 2] = np.minimum(violations * (W["R3"] / 4), W["R3"])
+
+        # R4: External plies (skor)
+        score_r4 = np.full(m, W["R4"], dtype=np.float64)
+        if n >= 2:
+            r4_pen = (P[:, 0] == P[:, 1]) * (W["R4"] * 0.15) + (P[:, -1] == P[:, -2]) * (W["R4"] * 0.15)
+            score_r4 = np.maximum(0.0, W["R4"] - r4_pen)
+        penalties[:, 3] = W["R4"] - score_r4
+
+        # R5: Distribution (spacing std + bölge kümeleme), açı başına
+        idx = np.arange(n)
+        per_angle = W["R5"] / 4
+        r5 = np.zeros(m, dtype=np.float64)
+        for mask in (is0, is45, ism45, is90):
+            k = mask.sum(axis=1)
+            valid = k > 1
+            if not valid.any():
+                continue
+            pos = np.where(mask, idx, -1)
+            first = np.where(mask, idx, n).min(axis=1)
+            last = pos.max(axis=1)
+            # Her True pozisyon için bir önceki True pozisyonu (yoksa -1)
+            prev = np.maximum.accumulate(pos, axis=1)
+            prev = np.concatenate([np.full((m, 1), -1), prev[:, :-1]], axis=1)
+            has_prev = mask & (prev >= 0)
+            spacing = np.where(has_prev, idx - prev, 0).astype(np.float64)
+            k_sp = np.maximum(k - 1, 1)
+            mean_sp = spacing.sum(axis=1) / k_sp
+            var = (np.where(has_prev, spacing - mean_sp[:, None], 0.0) ** 2).sum(axis=1) / k_sp
+            ideal = n / np.maximum(k, 1)
+            norm_std = np.minimum(1.0, np.sqrt(var) / np.maximum(ideal, 1.0))
+            span_ratio = (last - first) / max(1, n - 1)
+            clustering = np.where(span_ratio < 0.6, (0.6 - span_ratio) / 0.6, 0.0)
+            r5 += np.where(valid, norm_std * per_angle * 0.6 + clustering * per_angle * 0.4, 0.0)
+        penalties[:, 4] = np.minimum(r5, W["R5"])
+
+        # R6: Grouping - run uzunlukları sütun sütun (popülasyon boyunca vektörel)
+        r6 = np.zeros(m, dtype=np.float64)
+        groups = np.zeros((m, 2), dtype=np.int32)
+        if n > 1:
+            eq = P[:, 1:] == P[:, :-1]
+            adjacent = eq.sum(axis=1)
+            adjacent_0_90 = (eq & (is0[:, 1:] | is90[:, 1:])).sum(axis=1)
+            curr = np.ones(m, dtype=np.int32)
+            max_run = np.ones(m, dtype=np.int32)
+            groups_of_3 = np.zeros(m, dtype=np.int32)
+            groups_ge4 = np.zeros(m, dtype=np.int32)
+            for j in range(n - 1):
+                same = eq[:, j]
+                groups_of_3 += (~same) & (curr == 3)
+                groups_ge4 += (~same) & (curr >= 4)
+                curr = np.where(same, curr + 1, 1)
+                np.maximum(max_run, curr, out=max_run)
+            groups_of_3 += curr == 3
+            groups_ge4 += curr >= 4
+            r6 = np.where(max_run > 3, (max_run - 3) * (W["R6"] * 0.35), 0.0)
+            r6 = r6 + groups_of_3 * 2.0 + adjacent_0_90 * 0.3 + adjacent / float(n - 1) * (W["R6"] * 0.50)
+            groups[:, 0] = groups_of_3
+            groups[:, 1] = groups_ge4
+        penalties[:, 5] = np.minimum(r6, W["R6"])
+
+        # R7: Buckling (±45 merkezde)
+        any45 = is45 | ism45
+        n45 = any45.sum(axis=1)
+        r7 = (any45 @ prof["r7"]) / np.maximum(n45, 1) * W["R7"]
+        penalties[:, 6] = np.where(n45 > 0, np.minimum(r7, W["R7"]), 0.0)
+
+        # R8: Lateral bending (90° merkezde)
+        n90 = is90.sum(axis=1)
+        r8 = (is90 @ prof["r8"]) / np.maximum(n90, 1) * W["R8"]
+        hits = (is90 & prof["r8_center"]).sum(axis=1)
+        r8 = np.where(hits >= 2, np.maximum(r8, W["R8"] * 0.95), r8)
+        r8 = np.where(hits == 1, np.maximum(r8, W["R8"] * 0.85), r8)
+        penalties[:, 7] = np.where(n90 > 0, np.minimum(r8, W["R8"]), 0.0)
+
+        weights = np.array([W[k] for k in self.RULE_KEYS], dtype=np.float64)
+        scores = np.maximum(0.0, weights - penalties)
+        scores[:, 3] = score_r4
+        return hard, scores, penalties, groups
+
+    def _first_adjacent_0_90(self, sequence: List[int]) -> Optional[int]:
+        """İlk 0°/90° komşu çiftinin sol indeksi (yoksa None).
+
+        Kısa dizilimlerde Python döngüsü, uzunlarda tek NumPy geçişi (ndarray
+        dönüşüm maliyeti ~HARD_SCAN_NUMPY_MIN ply'dan sonra amorti olur).
+        """
+        if len(sequence) < self.HARD_SCAN_NUMPY_MIN:
+            for i, (a, b) in enumerate(zip(sequence, sequence[1:])):
+                if (a == 0 and b == 90) or (a == 90 and b == 0):
+                    return i
+            return None
+        arr = self._as_array(sequence)
+        left = arr[:-1]
+        # a + b == 90 standart açılarda yalnızca (0, 90), (90, 0) ve (45, 45) çiftlerinde olur
+        hits = np.flatnonzero((left.astype(np.int16) + arr[1:] == 90) & (left != 45))
+        return int(hits[0]) if hits.size else None
+
+    def _check_hard_constraints(self, sequence: List[int]) -> Optional[Tuple[str, str]]:
+        """Hard constraint ihlali varsa (kural anahtarı, açıklama), yoksa None."""
         # HARD 1: 0° başlangıç/bitiş YASAK
         if self._hard_rule_enabled("external_0") and (sequence[0] == 0 or sequence[-1] == 0):
-            return 0.0, {
-                "total_score": 0.0,
-                "max_score": 100.0,
-                "rules": {
-                    "EXTERNAL_0": {
-                        "weight": 999.0,
-                        "score": 0,
-                        "penalty": 999.0,
-                        "reason": "0° başlangıç veya bitiş katmanı (YASAK)",
-                    }
-                },
-            }
+            return "EXTERNAL_0", "0° başlangıç veya bitiş katmanı (YASAK)"
 
         # HARD 2: 0° ve 90° yan yana YASAK
         if self._hard_rule_enabled("adjacent_0_90"):
-            for i in range(len(sequence) - 1):
-                a, b = sequence[i], sequence[i + 1]
-                if (a == 0 and b == 90) or (a == 90 and b == 0):
-                    return 0.0, {
-                        "total_score": 0.0,
-                        "max_score": 100.0,
-                        "rules": {
-                            "ADJ_0_90": {
-                                "weight": 999.0,
-                                "score": 0,
-                                "penalty": 999.0,
-                                "reason": "0° ve 90° yan yana (YASAK) - pozisyon {}/{}".format(i, i + 1),
-                            }
-                        },
-                    }
+            i = self._first_adjacent_0_90(sequence)
+            if i is not None:
+                return "ADJ_0_90", "0° ve 90° yan yana (YASAK) - pozisyon {}/{}".format(i, i + 1)
 
         # HARD 3: İlk 2 ve son 2 katman ±45° OLMALI
         if self._hard_rule_enabled("external_45") and len(sequence) >= 4:
@@ -1210,112 +1772,104 @@ class LaminateOptimizer:
             for idx, ply in enumerate(outer_plies):
                 if abs(ply) != 45:
                     pos_label = ["1.", "2.", "sondan 2.", "son"][idx]
-                    return 0.0, {
-                        "total_score": 0.0,
-                        "max_score": 100.0,
-                        "rules": {
-                            "EXTERNAL_45": {
-                                "weight": 999.0,
-                                "score": 0,
-                                "penalty": 999.0,
-                                "reason": "{} katman ±45° değil ({}° bulundu) (YASAK)".format(pos_label, ply),
-                            }
-                        },
-                    }
-
-        # ========== SOFT CONSTRAINTS ==========
-
-        # Rule 1: Symmetry (distance-weighted)
-        penalty_r1 = self._check_symmetry_distance_weighted(sequence)
-        score_r1 = max(0, WEIGHTS["R1"] - penalty_r1)
-        rules_result["R1"] = {
-            "weight": WEIGHTS["R1"],
-            "score": round(score_r1, 2),
-            "penalty": round(penalty_r1, 2),
-            "reason": "Asimetri var" if penalty_r1 > 0 else "",
-        }
+                    return "EXTERNAL_45", "{} katman ±45° değil ({}° bulundu) (YASAK)".format(pos_label, ply)
 
-        # Rule 2: Balance (sadece ±45 için)
-        penalty_r2 = self._check_balance_45(sequence)
-        score_r2 = max(0, WEIGHTS["R2"] - penalty_r2)
-        rules_result["R2"] = {
-            "weight": WEIGHTS["R2"],
-            "score": round(score_r2, 2),
-            "penalty": round(penalty_r2, 2),
-            "reason": "+45/-45 sayıları eşit değil" if penalty_r2 > 0 else "",
-        }
+        return None
 
-        # Rule 3: Percentage (8-67%)
-        penalty_r3 = self._check_percentage_rule(sequence)
-        score_r3 = max(0, WEIGHTS["R3"] - penalty_r3)
-        rules_result["R3"] = {
-            "weight": WEIGHTS["R3"],
-            "score": round(score_r3, 2),
-            "penalty": round(penalty_r3, 2),
-            "reason": "Bazı açılar %8-67 dışında" if penalty_r3 > 0 else "",
-        }
+    def _compute_rule_arrays(self, sequence: List[int]):
+        """Kural skorlarını dizi olarak hesapla.
 
-        # Rule 4: External plies (ilk/son 2 katman)
+        Returns: (hard, scores, penalties, weights) — hard: None veya (anahtar, açıklama);
+        scores/penalties 2 haneye yuvarlanmış, R1..R8 sıralı float64 dizileri.
+        Hard ihlalde soft kurallar hesaplanmaz (scores/penalties None).
+        """
+        WEIGHTS = self.WEIGHTS
+        weights = np.array([WEIGHTS[k] for k in self.RULE_KEYS], dtype=np.float64)
+
+        hard = self._check_hard_constraints(sequence)
+        if hard is not None:
+            return hard, None, None, weights
+
+        # Pozisyon taramalı kurallar (R5/R7/R8) dizilimin tek NumPy kopyasını paylaşır;
+        # sayım ve indeksleme yapan kurallar listeyle çalışır (list.count C düzeyinde)
+        arr = self._as_array(sequence)
+        penalties = np.empty(len(self.RULE_KEYS), dtype=np.float64)
+        penalties[0] = self._check_symmetry_distance_weighted(sequence)  # R1: Symmetry
+        penalties[1] = self._check_balance_45(sequence)                  # R2: Balance (±45)
+        penalties[2] = self._check_percentage_rule(sequence)             # R3: Percentage (8-67%)
+        # R4: External plies - kontrol fonksiyonu skor döndürür
         score_r4 = self._check_external_plies(sequence)
-        penalty_r4 = WEIGHTS["R4"] - score_r4
-        rules_result["R4"] = {
-            "weight": WEIGHTS["R4"],
-            "score": round(score_r4, 2),
-            "penalty": round(penalty_r4, 2),
-            "reason": "Dış katmanlar ideal değil" if penalty_r4 > 0 else "",
-        }
-
-        # Rule 5: Distribution (variance-based)
-        penalty_r5 = self._check_distribution_variance(sequence)
-        score_r5 = max(0, WEIGHTS["R5"] - penalty_r5)
-        rules_result["R5"] = {
-            "weight": WEIGHTS["R5"],
-            "score": round(score_r5, 2),
-            "penalty": round(penalty_r5, 2),
-            "reason": "Dağılım uniform değil" if penalty_r5 > 0 else "",
-        }
+        penalties[3] = WEIGHTS["R4"] - score_r4
+        penalties[4] = self._check_distribution_variance(arr)            # R5: Distribution
+        penalties[5] = self._check_grouping(sequence, max_group=3)       # R6: Grouping (max 3)
+        penalties[6] = self._check_buckling(arr)                         # R7: Buckling
+        penalties[7] = self._check_lateral_bending(arr)                  # R8: Lateral bending
+
+        scores = np.maximum(0.0, weights - penalties)
+        scores[3] = score_r4
+        # 2 haneye yuvarlama kural başına eski dict yolunun tipini izler: R5 (NumPy std) np.float64
+        # olarak np.round ile, diğerleri Python float olarak round ile (yarım değerlerde farklılar)
+        scores_list = [round(v, 2) for v in scores.tolist()]
+        penalties_list = [round(v, 2) for v in penalties.tolist()]
+        scores_list[4] = float(np.round(scores[4], 2))
+        penalties_list[4] = float(np.round(penalties[4], 2))
+        scores = np.array(scores_list, dtype=np.float64)
+        penalties = np.array(penalties_list, dtype=np.float64)
+        return hard, scores, penalties, weights
+
+    def _compute_fitness(self, sequence: List[int]):
+        """calculate_fitness'ın önbelleksiz gövdesi: dizi sonuçlarından details dict'i kurar."""
+        hard, scores, penalties, weights = self._compute_rule_arrays(sequence)
 
-        # Rule 6: Grouping (max 3)
-        penalty_r6 = self._check_grouping(sequence, max_group=3)
-        score_r6 = max(0, WEIGHTS["R6"] - penalty_r6)
-        gstats = self._grouping_stats(sequence)
-        if penalty_r6 > 0:
-            # Sadece istenen sayılar: 2'li / 3'lü / 4+ grup adedi
-            reason_r6 = "2'li grup: {}, 3'lü grup: {}, 4+ grup: {}".format(
-                gstats["groups_len_2"], gstats["groups_len_3"], gstats["groups_len_ge4"]
-            )
-        else:
-            reason_r6 = ""
-        rules_result["R6"] = {
-            "weight": WEIGHTS["R6"],
-            "score": round(score_r6, 2),
-            "penalty": round(penalty_r6, 2),
-            "reason": reason_r6,
-        }
+        # ========== HARD CONSTRAINTS ==========
+        if hard is not None:
+            rule_key, reason = hard
+            return 0.0, {
+                "total_score": 0.0,
+                "max_score": 100.0,
+                "rules": {
+                    rule_key: {
+                        "weight": 999.0,
+                        "score": 0,
+                        "penalty": 999.0,
+                        "reason": reason,
+                    }
+                },
+            }
 
-        # Rule 7: Buckling (±45 uzakta)
-        penalty_r7 = self._check_buckling(sequence)
-        score_r7 = max(0, WEIGHTS["R7"] - penalty_r7)
-        rules_result["R7"] = {
-            "weight": WEIGHTS["R7"],
-            "score": round(score_r7, 2),
-            "penalty": round(penalty_r7, 2),
-            "reason": "±45 middle plane'e yakın" if penalty_r7 > 0 else "",
-        }
+        # ========== SOFT CONSTRAINTS ==========
+        reasons = [
+            "Asimetri var",
+            "+45/-45 sayıları eşit değil",
+            "Bazı açılar %8-67 dışında",
+            "Dış katmanlar ideal değil",
+            "Dağılım uniform değil",
+            None,  # R6: grouping sayıları
+            "±45 middle plane'e yakın",
+            "90° middle plane'e yakın",
+        ]
 
-        # Rule 8: Lateral bending (90° uzakta)
-        penalty_r8 = self._check_lateral_bending(sequence)
-        score_r8 = max(0, WEIGHTS["R8"] - penalty_r8)
-        rules_result["R8"] = {
-            "weight": WEIGHTS["R8"],
-            "score": round(score_r8, 2),
-            "penalty": round(penalty_r8, 2),
-            "reason": "90° middle plane'e yakın" if penalty_r8 > 0 else "",
-        }
+        rules_result = {}
+        for idx, rule_key in enumerate(self.RULE_KEYS):
+            penalty = float(penalties[idx])
+            if penalty > 0 and rule_key == "R6":
+                # Sadece istenen sayılar: 2'li / 3'lü / 4+ grup adedi
+                gstats = self._grouping_stats(sequence)
+                reason = "2'li grup: {}, 3'lü grup: {}, 4+ grup: {}".format(
+                    gstats["groups_len_2"], gstats["groups_len_3"], gstats["groups_len_ge4"]
+                )
+            else:
+                reason = reasons[idx] if penalty > 0 else ""
+            rules_result[rule_key] = {
+                "weight": self.WEIGHTS[rule_key],
+                "score": float(scores[idx]),
+                "penalty": penalty,
+                "reason": reason,
+            }
 
         # FINAL SCORE
         # Ensure plain Python float (avoid numpy scalar propagation)
-        total_score = float(sum(r["score"] for r in rules_result.values()))
+        total_score = float(sum(scores.tolist()))
 
         return total_score, {"total_score": round(total_score, 2), "max_score": 100.0, "rules": rules_result}
 
@@ -1371,14 +1925,14 @@ class LaminateOptimizer:
                 mutation_rate = 0.2
 
             while len(next_gen) < population_size:
-                parent = max(random.sample(scored_pop, 3), key=lambda x: x[0])[1][:]
+                parent = max(self._random.sample(scored_pop, 3), key=lambda x: x[0])[1][:]
 
                 # Symmetry-preserving swap mutation
-                if random.random() < mutation_rate:
+                if self._random.random() < mutation_rate:
                     self._symmetry_preserving_swap(parent)
 
                 # Balance-aware mutation
-                if random.random() < 0.3:
+                if self._random.random() < 0.3:
                     self._balance_aware_mutation(parent)
 
                 next_gen.append(parent)
@@ -1454,6 +2008,15 @@ class LaminateOptimizer:
             "best_sequence": global_best_sequence or [],
             "best_fitness": round(global_best_fitness, 2),
             "penalties": global_best_penalties,
+            # run_genetic_algorithm'in döndürdüğü calculate_fitness detayları (ikinci değerlendirme gerekmez)
+            "best_details": global_best_penalties,
             "history": combined_history,
         }
 
+
+def _run_single_ga_in_process(optimizer: LaminateOptimizer, args: Tuple, seed: int) -> Tuple[List[int], float, int]:
+    """ProcessPoolExecutor için picklable GA çalıştırıcısı (bkz. LaminateOptimizer._run_single_ga)."""
+    # Pickle ile kopyalanan RNG durumu tüm süreçlerde aynıdır; koşuya özel tohumla yenile
+    optimizer.rng = np.random.default_rng(seed)
+    optimizer._random = random.Random(seed)
+    return optimizer._run_single_ga(args)
@@ -25,6 +25,99 @@ RAMP_RATE_MM_PER_PLY = 0.5       # Her ply düşüşü için gereken minimum ram
                                    # Endüstri standardı: ~0.3-0.6 mm/ply
 
 
+NEIGHBOR_THRESHOLD_PX = 40        # Komşuluk: kenarlar arası piksel yakınlık eşiği (grid hücre boyutu)
+
+
+def _rects_adjacent(r1, r2, threshold) -> bool:
+    """İki dikdörtgenin kenarları threshold mesafe içinde mi kontrol et."""
+    x1, y1, x1b, y1b = r1
+    x2, y2, x2b, y2b = r2
+
+    # Yatay örtüşme var mı?
+    h_overlap = max(0, min(x1b, x2b) - max(x1, x2))
+    # Dikey örtüşme var mı?
+    v_overlap = max(0, min(y1b, y2b) - max(y1, y2))
+
+    # Yatay komşuluk: dikey örtüşme var + yatay mesafe küçük
+    h_gap = max(x1, x2) - min(x1b, x2b)
+    if v_overlap > 0 and 0 <= h_gap <= threshold:
+        return True
+
+    # Dikey komşuluk: yatay örtüşme var + dikey mesafe küçük
+    v_gap = max(y1, y2) - min(y1b, y2b)
+    if h_overlap > 0 and 0 <= v_gap <= threshold:
+        return True
+
+    return False
+
+
+def build_neighbor_graph(bounds: List[Dict], threshold_px: float = NEIGHBOR_THRESHOLD_PX) -> List[List[int]]:
+    """Zone bounds'larından komşuluk listesi (piksel cinsinden; ölçekten bağımsız)."""
+    n = len(bounds)
+    neighbors = [[] for _ in range(n)]  # type: List[List[int]]
+    rects = [(b["x"], b["y"], b["x"] + b["w"], b["y"] + b["h"]) for b in bounds]
+    for i in range(n):
+        for j in range(i + 1, n):
+            if _rects_adjacent(rects[i], rects[j], threshold_px):
+                neighbors[i].append(j)
+                neighbors[j].append(i)
+    return neighbors
+
+
+def find_disconnected_zones(neighbors: List[List[int]], root_index: int) -> List[int]:
+    """BFS ile root zone'dan ulaşılamayan zone indeksleri (komşuluk yoksa boş)."""
+    if not neighbors:
+        return []
+    visited = {root_index}
+    queue = deque([root_index])
+    while queue:
+        current = queue.popleft()
+        for neighbor in neighbors[current]:
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(neighbor)
+    return [i for i in range(len(neighbors)) if i not in visited]
+
+
+def _disconnected_result(disconnected: List[int], root_index: int, neighbors: List[List[int]]) -> Dict[str, Any]:
+    disc_labels = [f"Zone {i+1}" for i in disconnected]
+    return {
+        "success": False,
+        "error": f"Baglantisiz zone'lar tespit edildi: {', '.join(disc_labels)}. "
+                 f"Tum zone'lar root zone'a (Zone {root_index+1}) komsu yol ile "
+                 f"baglanmalidir.",
+        "disconnected_zones": disconnected,
+        "zones": [],
+        "transitions": [],
+        "root_index": root_index,
+        "drop_off_tree": {},
+        "neighbor_graph": [list(nb) for nb in neighbors],
+    }
+
+
+def check_zone_connectivity(zones_config: List[Dict], bounds: Optional[List[Dict]]) -> Optional[Dict[str, Any]]:
+    """MultiZoneOptimizer kurmadan bağlantı ön kontrolü.
+
+    Bağlantısız zone varsa optimize_all'un döndüreceği hata sonucunu, yoksa None döndürür.
+    """
+    if not bounds or len(bounds) != len(zones_config):
+        return None
+    totals = [
+        sum(normalize_ply_counts_for_symmetry({int(k): int(v) for k, v in zone.items()})["adjusted_counts"].values())
+        for zone in zones_config
+    ]
+    root_index = totals.index(max(totals))
+    neighbors = build_neighbor_graph(bounds)
+    disconnected = find_disconnected_zones(neighbors, root_index)
+    if not disconnected:
+        return None
+    return _disconnected_result(disconnected, root_index, neighbors)
+
+
+class OptimizationCancelled(Exception):
+    """optimize_all, cancel_event set edildiği için yarıda bırakıldı (ör. SSE istemcisi ayrıldı)."""
+
+
 class MultiZoneOptimizer:
     """
     Çoklu zone optimizasyonu için ana sınıf.
@@ -109,43 +202,8 @@ class MultiZoneOptimizer:
             self.zone_areas_mm2.append(w_mm * h_mm)
             self.zone_dims_mm.append((w_mm, h_mm))
 
-        # Komşuluk: iki zone'un kenarları birbirine yakınsa (<=5mm) komşu
-        n = len(bounds)
-        self.zone_neighbors = [[] for _ in range(n)]
-        NEIGHBOR_THRESHOLD_PX = 40  # piksel cinsinden yakınlık eşiği (grid hücre boyutu)
-
-        for i in range(n):
-            bi = bounds[i]
-            ri = (bi["x"], bi["y"], bi["x"] + bi["w"], bi["y"] + bi["h"])
-            for j in range(i + 1, n):
-                bj = bounds[j]
-                rj = (bj["x"], bj["y"], bj["x"] + bj["w"], bj["y"] + bj["h"])
-                if self._rects_adjacent(ri, rj, NEIGHBOR_THRESHOLD_PX):
-                    self.zone_neighbors[i].append(j)
-                    self.zone_neighbors[j].append(i)
-
-    @staticmethod
-    def _rects_adjacent(r1, r2, threshold):
-        """İki dikdörtgenin kenarları threshold mesafe içinde mi kontrol et."""
-        x1, y1, x1b, y1b = r1
-        x2, y2, x2b, y2b = r2
-        
-        # Yatay örtüşme var mı?
-        h_overlap = max(0, min(x1b, x2b) - max(x1, x2))
-        # Dikey örtüşme var mı?
-        v_overlap = max(0, min(y1b, y2b) - max(y1, y2))
-        
-        # Yatay komşuluk: dikey örtüşme var + yatay mesafe küçük
-        h_gap = max(x1, x2) - min(x1b, x2b)
-        if v_overlap > 0 and 0 <= h_gap <= threshold:
-            return True
-        
-        # Dikey komşuluk: yatay örtüşme var + dikey mesafe küçük
-        v_gap = max(y1, y2) - min(y1b, y2b)
-        if h_overlap > 0 and 0 <= v_gap <= threshold:
-            return True
-        
-        return False
+        # Komşuluk: iki zone'un kenarları birbirine yakınsa komşu
+        self.zone_neighbors = build_neighbor_graph(bounds)
 
     # ===== Komşuluk Grafiği =====
     def _check_connectivity(self) -> Tuple[bool, List[int]]:
@@ -155,22 +213,7 @@ class MultiZoneOptimizer:
         Returns:
             (all_connected, disconnected_indices)
         """
-        if not self.zone_neighbors:
-            return True, []
-
-        n = len(self.zones_config)
-        visited = set()
-        queue = deque([self.root_index])
-        visited.add(self.root_index)
-
-        while queue:
-            current = queue.popleft()
-            for neighbor in self.zone_neighbors[current]:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(neighbor)
-
-        disconnected = [i for i in range(n) if i not in visited]
+        disconnected = find_disconnected_zones(self.zone_neighbors, self.root_index)
         return len(disconnected) == 0, disconnected
 
     def _build_bfs_drop_order(self) -> Tuple[List[int], Dict[int, int]]:
@@ -401,15 +444,20 @@ class MultiZoneOptimizer:
                         current_progress = 25 + ((i + 1) * percent_per_zone)
                         report_progress(int(current_progress), f"Zone {zone_idx + 1} tamamlandi ({fitness:.1f})")
 
+            except OptimizationCancelled:
+                raise
             except Exception as e:
                 print(f"Zone {zone_idx + 1} drop-off BAŞARISIZ: {e}")
                 return False, zone_results, transitions, str(e)
 
         return True, zone_results, transitions, None
 
-    def optimize_all(self, progress_callback=None) -> Dict[str, Any]:
+    def optimize_all(self, progress_callback=None, cancel_event=None) -> Dict[str, Any]:
         """
         Tüm zone'ları optimize et.
+
+        cancel_event (threading.Event benzeri, is_set()) verilirse her ilerleme
+        noktasında kontrol edilir; set edilmişse OptimizationCancelled fırlatılır.
         
         Returns:
             {
@@ -439,8 +487,13 @@ class MultiZoneOptimizer:
         parent_map = {}
         last_error = None
 
+        def check_cancelled():
+            if cancel_event is not None and cancel_event.is_set():
+                raise OptimizationCancelled("Optimizasyon iptal edildi")
+
         # Callback wrapper
         def report_progress(val, msg=""):
+            check_cancelled()
             if progress_callback:
                 progress_callback({"progress": val, "message": msg})
 
@@ -452,18 +505,7 @@ class MultiZoneOptimizer:
             if not connected:
                 disc_labels = [f"Zone {i+1}" for i in disconnected]
                 print(f"HATA: Baglantisiz zone'lar: {', '.join(disc_labels)}")
-                return {
-                    "success": False,
-                    "error": f"Baglantisiz zone'lar tespit edildi: {', '.join(disc_labels)}. "
-                             f"Tum zone'lar root zone'a (Zone {self.root_index+1}) komsu yol ile "
-                             f"baglanmalidir.",
-                    "disconnected_zones": disconnected,
-                    "zones": [],
-                    "transitions": [],
-                    "root_index": self.root_index,
-                    "drop_off_tree": {},
-                    "neighbor_graph": [list(nb) for nb in self.zone_neighbors],
-                }
+                return _disconnected_result(disconnected, self.root_index, self.zone_neighbors)
         
         if self.zone_neighbors:
             bfs_order, parent_map = self._build_bfs_drop_order()
@@ -517,11 +559,13 @@ class MultiZoneOptimizer:
             print(f"\nRoot Zone (Zone {self.root_index + 1}) adaylari uretiliyor...")
 
             report_progress(15, f"Root Zone (Zone {self.root_index + 1}) adaylari uretiliyor...")
+            # Multi-zone genelde süreç havuzu işçisinde çalışır (API): GA iç içe havuz açmasın
             root_optimizer = LaminateOptimizer(
                 root_config,
                 weights=self.rule_weights,
                 use_surrogate=self.use_surrogate,
                 hard_rules=self.hard_rules,
+                ga_backend="thread",
             )
             root_candidates, _ = root_optimizer.generate_hybrid_candidates(
                 n_restarts=self.ROOT_CANDIDATES_PER_BATCH
@@ -550,6 +594,7 @@ class MultiZoneOptimizer:
             transitions = []
 
             for candidate_idx, candidate in enumerate(unique_candidates):
+                check_cancelled()
                 root_seq = candidate["sequence"]
                 root_score = float(candidate["score"])
                 root_details = candidate["details"]
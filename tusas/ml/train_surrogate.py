@@ -6,6 +6,7 @@ taklit eden bir model egitir.
 """
 
 import os
+import threading
 import time
 import numpy as np
 import joblib
@@ -25,6 +26,10 @@ _MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_MODEL_PATH = os.path.join(_MODULE_DIR, "surrogate_model.pkl")
 DEFAULT_DATA_PATH = os.path.join(_MODULE_DIR, "training_data.npz")
 
+# load_surrogate_cached: model_path -> (mtime, model); süreç içinde paylaşılır
+_model_cache = {}  # type: Dict[str, Tuple[float, Optional[Pipeline]]]
+_model_cache_lock = threading.Lock()
+
 
 def train_surrogate(
     n_samples: int = 50000,
@@ -133,6 +138,29 @@ def load_surrogate(model_path: Optional[str] = None) -> Optional[Pipeline]:
     return joblib.load(model_path)
 
 
+def load_surrogate_cached(model_path: Optional[str] = None) -> Optional[Pipeline]:
+    """load_surrogate'in süreç içi önbellekli hali.
+
+    Model dosyası değişmedikçe (mtime) aynı nesne döndürülür; yeniden eğitim
+    sonrası ilk çağrıda dosya tekrar okunur.
+    """
+    if model_path is None:
+        model_path = DEFAULT_MODEL_PATH
+
+    try:
+        mtime = os.path.getmtime(model_path)
+    except OSError:
+        return None
+
+    with _model_cache_lock:
+        cached = _model_cache.get(model_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        model = joblib.load(model_path)
+        _model_cache[model_path] = (mtime, model)
+        return model
+
+
 def predict_fitness(
     model: Pipeline,
     sequence: list,
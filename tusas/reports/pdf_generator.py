@@ -6,7 +6,7 @@ reportlab kullanarak profesyonel muhendislik raporu uretir.
 
 import io
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import BinaryIO, Dict, List, Any, Optional
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
@@ -439,7 +439,8 @@ def generate_optimization_report(
     engineer_name: str = "",
     project_name: str = "TUSAS Laminat Optimizasyonu",
     revision: str = "Rev. 1",
-) -> bytes:
+    output: Optional[BinaryIO] = None,
+) -> Optional[bytes]:
     """PDF rapor olustur ve bytes olarak dondur.
 
     Args:
@@ -448,11 +449,13 @@ def generate_optimization_report(
         engineer_name: Muhendis adi
         project_name: Proje adi
         revision: Revizyon numarasi
+        output: Opsiyonel yazilabilir dosya nesnesi; verilirse PDF buraya yazilir
+                (bellekte tutulmaz) ve None doner. Dosya acik birakilir.
 
     Returns:
-        PDF icerik bytes
+        PDF icerik bytes (output verilmediyse)
     """
-    buffer = io.BytesIO()
+    buffer = output if output is not None else io.BytesIO()
 
     doc = SimpleDocTemplate(
         buffer,
@@ -486,6 +489,9 @@ def generate_optimization_report(
     # Footer ile build et
     doc.build(elements, onFirstPage=_footer, onLaterPages=_footer)
 
+    if output is not None:
+        return None
+
     pdf_bytes = buffer.getvalue()
     buffer.close()
 
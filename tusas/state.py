@@ -1,16 +1,27 @@
-from typing import Dict
+from threading import RLock
+from typing import Dict, List, Optional, Tuple
 
 from .zones.manager import ZoneManager
 
 
 # In-memory session store: session_id -> ZoneManager
-zone_managers = {}  # type: Dict[str, ZoneManager]
+# Oturumlar hash(session_id) ile 16 parçaya dağıtılır; her parçanın kendi kilidi vardır,
+# böylece farklı oturumlara gelen eşzamanlı /zones/* istekleri aynı kilidi beklemez.
+_N_SHARDS = 16
+_SHARDS = [({}, RLock()) for _ in range(_N_SHARDS)]  # type: List[Tuple[Dict[str, ZoneManager], RLock]]
 
 
-def get_zone_manager(session_id: str) -> ZoneManager:
-    return zone_managers.get(session_id)
+def _shard(session_id: str) -> Tuple[Dict[str, ZoneManager], RLock]:
+    return _SHARDS[hash(session_id) % _N_SHARDS]
 
 
-def set_zone_manager(session_id: str, manager: ZoneManager) -> None:
-    zone_managers[session_id] = manager
+def get_zone_manager(session_id: str) -> Optional[ZoneManager]:
+    store, lock = _shard(session_id)
+    with lock:
+        return store.get(session_id)
+
 
+def set_zone_manager(session_id: str, manager: ZoneManager) -> None:
+    store, lock = _shard(session_id)
+    with lock:
+        store[session_id] = manager
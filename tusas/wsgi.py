@@ -0,0 +1,7 @@
+"""
+WSGI giriş noktası: gunicorn -c gunicorn_conf.py tusas.wsgi:application
+"""
+from . import create_app
+
+
+application = create_app()
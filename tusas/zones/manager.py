@@ -12,6 +12,9 @@ class ZoneManager:
         self.zones = {}  # type: Dict[int, Zone]
         self.transitions = []  # type: List[Dict[str, Any]]
         self.next_zone_id = 1
+        # get_all_zones_cached: serileştirilmiş zone listesi; zone eklenince geçersiz olur
+        self._dirty = True
+        self._cached = None  # type: Optional[List[Dict[str, Any]]]
 
     def create_zone_from_dropoff(
         self,
@@ -36,6 +39,7 @@ class ZoneManager:
         new_zone.transition_type = "drop_off"
 
         self.zones[zone_id] = new_zone
+        self._dirty = True
 
         self.transitions.append(
             {
@@ -84,6 +88,7 @@ class ZoneManager:
         new_zone.transition_type = "merge"
 
         self.zones[zone_id] = new_zone
+        self._dirty = True
 
         self.transitions.append({"from": source_zone_ids, "to": zone_id, "type": "merge", "target_ply": target_ply})
 
@@ -112,6 +117,7 @@ class ZoneManager:
         new_zone.transition_type = "angle_drop_off"
 
         self.zones[zone_id] = new_zone
+        self._dirty = True
 
         self.transitions.append(
             {
@@ -131,6 +137,19 @@ class ZoneManager:
     def get_all_zones(self) -> List[Dict[str, Any]]:
         return [zone.to_dict() for zone in self.zones.values()]
 
+    def get_all_zones_cached(self) -> List[Dict[str, Any]]:
+        """get_all_zones ile aynı; zone eklenmedikçe önceki liste döner (çağıran değiştirmemeli)."""
+        if self._dirty or self._cached is None:
+            self._cached = self.get_all_zones()
+            self._dirty = False
+        return self._cached
+
+    def add_zone(self, zone: Zone, transition: Dict[str, Any]) -> None:
+        """Dışarıda oluşturulmuş zone'u ve geçişini kaydet."""
+        self.zones[zone.zone_id] = zone
+        self.transitions.append(transition)
+        self._dirty = True
+
     def get_transitions(self) -> List[Dict[str, Any]]:
         return self.transitions
 
@@ -140,4 +159,5 @@ class ZoneManager:
         root_zone = Zone(zone_id=0, name="Root", sequence=sequence, ply_count=len(sequence))
         root_zone.fitness_score = score
         self.zones[0] = root_zone
+        self._dirty = True
 
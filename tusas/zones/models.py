@@ -1,4 +1,5 @@
-from typing import List, Dict, Any
+from collections import Counter
+from typing import List, Dict, Any, Optional
 
 
 class Zone:
@@ -7,12 +8,29 @@ class Zone:
     def __init__(self, zone_id: int, name: str, sequence: List[int], ply_count: int):
         self.zone_id = zone_id
         self.name = name
+        self._ply_counts_cache = None  # type: Optional[Dict[int, int]]
         self.sequence = sequence
         self.ply_count = ply_count
         self.fitness_score = 0.0
         self.source_zones = []  # type: List[int]
         self.transition_type = "drop_off"  # "drop_off" | "merge" | "angle_drop_off"
 
+    @property
+    def sequence(self) -> List[int]:
+        return self._sequence
+
+    @sequence.setter
+    def sequence(self, value: List[int]) -> None:
+        # Yeni dizilim atanınca açı sayıları önbelleği geçersiz olur
+        self._sequence = value
+        self._ply_counts_cache = None
+
+    def ply_counts(self) -> Dict[int, int]:
+        """Açı sayıları {açı: adet} (lazy, önbellekli). Listeyi yerinde değiştirmek yerine sequence'i yeniden atayın."""
+        if self._ply_counts_cache is None:
+            self._ply_counts_cache = dict(Counter(self._sequence))
+        return dict(self._ply_counts_cache)
+
     def to_dict(self) -> Dict[str, Any]:
         return {
             "zone_id": self.zone_id,